@@ -0,0 +1,158 @@
+# coding: utf-8
+"""Check the tree, download and tarball methods against the mock server.
+
+Mirrors the mock repository and downloads its archive with RepositoryApi
+and AsyncRepositoryApi, comparing the files with the ones served, and
+exits with status 1 on any difference:
+
+    python benchmarks/check_downloads.py
+"""
+
+import asyncio
+import os
+import sys
+import tarfile
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from githon import RepositoryApi  # noqa: E402
+from githon.exceptions import TruncatedTreeError  # noqa: E402
+from mock_server import (  # noqa: E402
+    MockGithubServer, blob_content, repository_files)
+
+
+def expected_files():
+    """Return the relative paths of the regular files of the mock tree."""
+    return sorted(path for path, _ in repository_files())
+
+
+def check_mirror(directory, downloaded):
+    """Return the problems of a mirrored directory, as strings."""
+    problems = []
+
+    if sorted(downloaded) != expected_files():
+        problems.append('downloaded {} files, expected {}'.format(
+            len(downloaded), len(expected_files())))
+
+    for path, mode in repository_files():
+        file_path = os.path.join(directory, path)
+
+        if not os.path.isfile(file_path):
+            problems.append('{} is missing'.format(path))
+            continue
+
+        with open(file_path, 'rb') as input_file:
+            if input_file.read() != blob_content(path):
+                problems.append('{} differs'.format(path))
+
+        if mode == '100755' and not os.access(file_path, os.X_OK):
+            problems.append('{} is not executable'.format(path))
+
+    return problems
+
+
+def check_archive(path):
+    """Return the problems of a downloaded tarball, as strings."""
+    with tarfile.open(path) as tar:
+        names = sorted(name.split('/', 1)[1] for name in tar.getnames())
+
+    if names != expected_files():
+        return ['the archive has {} files, expected {}'.format(
+            len(names), len(expected_files()))]
+
+    return []
+
+
+def check_sync(api, directory):
+    """Run the blocking methods and return their problems."""
+    problems = []
+    tree = api.tree_by_name('marcosvbras', 'githon')
+
+    if tree['truncated'] or not tree['tree']:
+        problems.append('unexpected tree')
+
+    mirror = os.path.join(directory, 'mirror')
+    problems += check_mirror(mirror, api.download_by_id(1, mirror))
+
+    # A second download skips the files already up to date
+    if api.download_by_id(1, mirror):
+        problems.append('up to date files were downloaded again')
+
+    try:
+        api.download_by_name('marcosvbras', 'huge', mirror)
+    except TruncatedTreeError:
+        pass
+    else:
+        problems.append('a truncated tree was downloaded')
+
+    archive = os.path.join(directory, 'githon.tar.gz')
+    api.tarball_by_name('marcosvbras', 'githon', archive)
+
+    return problems + check_archive(archive)
+
+
+async def check_async(api, directory):
+    """Run the asynchronous methods and return their problems."""
+    from githon.aio import close_shared_clients
+
+    problems = []
+    tree = await api.tree_by_name('marcosvbras', 'githon')
+
+    if tree['truncated'] or not tree['tree']:
+        problems.append('unexpected tree')
+
+    mirror = os.path.join(directory, 'mirror')
+    problems += check_mirror(mirror, await api.download_by_id(1, mirror))
+
+    if await api.download_by_id(1, mirror):
+        problems.append('up to date files were downloaded again')
+
+    try:
+        await api.download_by_name('marcosvbras', 'huge', mirror)
+    except TruncatedTreeError:
+        pass
+    else:
+        problems.append('a truncated tree was downloaded')
+
+    archive = os.path.join(directory, 'githon.tar.gz')
+    await api.tarball_by_name('marcosvbras', 'githon', archive)
+    await close_shared_clients()
+
+    return problems + check_archive(archive)
+
+
+def main():
+    server = MockGithubServer().start()
+    problems = []
+
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            api = RepositoryApi('token')
+            api.ROOT_API_URL = server.url
+            problems += ['sync: ' + problem for problem in check_sync(
+                api, os.path.join(directory, 'sync'))]
+
+            try:
+                from githon.aio import AsyncRepositoryApi
+                api = AsyncRepositoryApi('token')
+            except ImportError as error:
+                print('Skipping the asynchronous checks: {}'.format(error))
+            else:
+                api.ROOT_API_URL = server.url
+                problems += ['async: ' + problem for problem in asyncio.run(
+                    check_async(api, os.path.join(directory, 'async')))]
+    finally:
+        server.stop()
+
+    for problem in problems:
+        print(problem)
+
+    if problems:
+        sys.exit(1)
+
+    print('OK')
+
+
+if __name__ == '__main__':
+    main()
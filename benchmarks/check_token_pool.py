@@ -0,0 +1,105 @@
+# coding: utf-8
+"""Check the token pool of GithubApi and AsyncGithubApi against the mock server.
+
+The mock server sends no X-RateLimit-Resource header, so the pool has to
+take the resource of each request from its URL. Exits with status 1 on
+any problem:
+
+    python benchmarks/check_token_pool.py
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from githon import GithubApi  # noqa: E402
+from githon.tokens import DEFAULT_RATE_LIMIT, TokenPool  # noqa: E402
+from mock_server import MockGithubServer  # noqa: E402
+
+TOKENS = ['token1', 'token2']
+
+
+def remaining(pool):
+    """Return the sum of the remaining requests of the tokens of a pool."""
+    return sum(state['remaining'] for state in pool.states())
+
+
+def check_states(pool, before_search, after_search):
+    """Return the problems of the token states, as strings."""
+    problems = []
+
+    if any(state['remaining'] >= DEFAULT_RATE_LIMIT
+           for state in pool.states()):
+        problems.append('the core budget was not updated: {}'.format(
+            pool.states()))
+
+    # Only the reservation of the search request counts
+    if after_search != before_search - 1:
+        problems.append('the search budget changed the core one')
+
+    return problems
+
+
+def check_sync(server):
+    """Run the blocking client and return its problems."""
+    pool = TokenPool(TOKENS)
+    api = GithubApi(token_pool=pool)
+    api.ROOT_API_URL = server.url
+
+    for index in range(4):
+        api.user_by_username('user{}'.format(index + 1))
+
+    before_search = remaining(pool)
+    api.search_users('q=followers:>10')
+
+    return check_states(pool, before_search, remaining(pool))
+
+
+async def check_async(server):
+    """Run the asynchronous client and return its problems."""
+    from githon.aio import AsyncGithubApi, close_shared_clients
+
+    pool = TokenPool(TOKENS)
+    api = AsyncGithubApi(token_pool=pool)
+    api.ROOT_API_URL = server.url
+
+    try:
+        await asyncio.gather(*[api.user_by_username('user{}'.format(index + 1))
+                               for index in range(4)])
+        before_search = remaining(pool)
+        await api.search_users('q=followers:>10')
+    finally:
+        await close_shared_clients()
+
+    return check_states(pool, before_search, remaining(pool))
+
+
+def main():
+    server = MockGithubServer().start()
+    problems = []
+
+    try:
+        problems += ['sync: ' + problem for problem in check_sync(server)]
+
+        try:
+            async_problems = asyncio.run(check_async(server))
+        except ImportError as error:
+            print('Skipping the asynchronous checks: {}'.format(error))
+        else:
+            problems += ['async: ' + problem for problem in async_problems]
+    finally:
+        server.stop()
+
+    for problem in problems:
+        print(problem)
+
+    if problems:
+        sys.exit(1)
+
+    print('OK')
+
+
+if __name__ == '__main__':
+    main()
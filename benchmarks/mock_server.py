@@ -0,0 +1,733 @@
+# coding: utf-8
+"""Local HTTP server that imitates the GitHub REST API v3 endpoints used
+by githon, with realistic payloads, Link pagination, rate limit headers,
+ETags and a configurable latency, plus the aliased user and repository
+queries of the GraphQL API v4. MockGithubH2Server serves the same
+endpoints with cleartext HTTP/2.
+
+It can also be started alone:
+
+    python benchmarks/mock_server.py --port 8000 --latency 0.05
+"""
+
+import argparse
+import base64
+import datetime
+import hashlib
+import io
+import json
+import re
+import tarfile
+import threading
+import time
+from email.message import Message
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs, urlencode
+
+RATE_LIMIT = 5000
+API_URL = 'https://api.github.com'
+LAST_COMMIT_DATE = datetime.datetime(2017, 10, 13, 3, 3, 57)
+
+
+def user_summary(user_id):
+    """Return the summary of an user, as listed by followers endpoints."""
+    login = 'user{}'.format(user_id)
+    url = '{0}/users/{1}'.format(API_URL, login)
+
+    return {
+        'login': login,
+        'id': user_id,
+        'avatar_url': 'https://avatars.githubusercontent.com/u/{}?v=4'.format(user_id),
+        'gravatar_id': '',
+        'url': url,
+        'html_url': 'https://github.com/{}'.format(login),
+        'followers_url': url + '/followers',
+        'following_url': url + '/following{/other_user}',
+        'gists_url': url + '/gists{/gist_id}',
+        'starred_url': url + '/starred{/owner}{/repo}',
+        'subscriptions_url': url + '/subscriptions',
+        'organizations_url': url + '/orgs',
+        'repos_url': url + '/repos',
+        'events_url': url + '/events{/privacy}',
+        'received_events_url': url + '/received_events',
+        'type': 'User',
+        'site_admin': False,
+    }
+
+
+def user(user_id):
+    """Return the full profile of an user."""
+    data = user_summary(user_id)
+    data.update({
+        'name': 'User {}'.format(user_id),
+        'company': None,
+        'blog': 'https://example.com/{}'.format(user_id),
+        'location': 'Earth',
+        'email': None,
+        'hireable': None,
+        'bio': 'Bio of user {}'.format(user_id),
+        'public_repos': user_id % 97,
+        'public_gists': user_id % 13,
+        'followers': user_id % 1000,
+        'following': user_id % 300,
+        'created_at': '2012-03-10T12:00:00Z',
+        'updated_at': '2017-10-13T03:03:57Z',
+    })
+
+    return data
+
+
+def repository(repository_id):
+    """Return the full data of a repository."""
+    owner = user_summary(repository_id % 1000 + 1)
+    name = 'repo{}'.format(repository_id)
+    url = '{0}/repos/{1}/{2}'.format(API_URL, owner['login'], name)
+
+    return {
+        'id': repository_id, 'name': name,
+        'full_name': '{0}/{1}'.format(owner['login'], name),
+        'owner': owner, 'private': False, 'html_url': url,
+        'description': 'Repository {}'.format(repository_id), 'fork': False,
+        'url': url, 'commits_url': url + '/commits{/sha}',
+        'issues_url': url + '/issues{/number}',
+        'created_at': '2014-01-01T00:00:00Z',
+        'updated_at': '2017-10-13T03:03:57Z',
+        'pushed_at': '2017-10-13T03:03:57Z', 'homepage': None,
+        'size': 1024, 'stargazers_count': 42, 'watchers_count': 42,
+        'language': 'Python', 'has_issues': True, 'has_projects': True,
+        'has_downloads': True, 'has_wiki': True, 'has_pages': False,
+        'forks_count': 7, 'mirror_url': None, 'archived': False,
+        'open_issues_count': 3, 'forks': 7, 'open_issues': 3, 'watchers': 42,
+        'default_branch': 'master', 'network_count': 7,
+        'subscribers_count': 5,
+    }
+
+
+def commit_date(index):
+    """Return the date of a commit, six hours before the previous one."""
+    return LAST_COMMIT_DATE - datetime.timedelta(hours=6 * index)
+
+
+def commit(index):
+    """Return a commit of a repository commits list."""
+    sha = hashlib.sha1(str(index).encode('ascii')).hexdigest()
+    author = user_summary(index % 50 + 1)
+    signature = {'name': author['login'], 'email': 'a@example.com',
+                 'date': commit_date(index).strftime('%Y-%m-%dT%H:%M:%SZ')}
+
+    return {
+        'sha': sha,
+        'commit': {'author': signature, 'committer': signature,
+                   'message': 'Commit number {}'.format(index),
+                   'tree': {'sha': sha, 'url': API_URL + '/tree/' + sha},
+                   'comment_count': 0},
+        'url': API_URL + '/commits/' + sha,
+        'html_url': 'https://github.com/commit/' + sha,
+        'author': author, 'committer': author,
+        'parents': [{'sha': sha, 'url': API_URL + '/commits/' + sha}],
+    }
+
+
+def graphql_user(user_id):
+    """Return an User node of the GraphQL API v4."""
+    data = user(user_id)
+
+    return {
+        '__typename': 'User', 'login': data['login'], 'databaseId': user_id,
+        'id': 'MDQ6VXNlcj{}'.format(user_id), 'avatarUrl': data['avatar_url'],
+        'url': data['html_url'], 'name': data['name'],
+        'company': data['company'], 'websiteUrl': data['blog'],
+        'location': data['location'], 'email': '', 'isHireable': False,
+        'bio': data['bio'], 'isSiteAdmin': False,
+        'createdAt': data['created_at'], 'updatedAt': data['updated_at'],
+        'publicRepositories': {'totalCount': data['public_repos']},
+        'publicGists': {'totalCount': data['public_gists']},
+        'followers': {'totalCount': data['followers']},
+        'following': {'totalCount': data['following']},
+    }
+
+
+def graphql_repository(repository_id):
+    """Return a Repository node of the GraphQL API v4."""
+    data = repository(repository_id)
+    owner = graphql_user(data['owner']['id'])
+
+    return {
+        'databaseId': repository_id, 'id': 'MDEwOlJlcG9{}'.format(repository_id),
+        'name': data['name'], 'nameWithOwner': data['full_name'],
+        'isPrivate': False, 'url': data['html_url'],
+        'description': data['description'], 'isFork': False,
+        'createdAt': data['created_at'], 'updatedAt': data['updated_at'],
+        'pushedAt': data['pushed_at'], 'homepageUrl': None,
+        'diskUsage': data['size'], 'forkCount': data['forks_count'],
+        'isArchived': False, 'hasIssuesEnabled': True, 'hasWikiEnabled': True,
+        'mirrorUrl': None, 'owner': owner,
+        'primaryLanguage': {'name': data['language']},
+        'defaultBranchRef': {'name': data['default_branch']},
+        'stargazers': {'totalCount': data['stargazers_count']},
+        'watchers': {'totalCount': data['subscribers_count']},
+        'openIssues': {'totalCount': data['open_issues_count']},
+    }
+
+
+def event(event_id):
+    """Return an event of an user or repository events list."""
+    actor = user_summary(event_id % 50 + 1)
+
+    return {
+        'id': str(event_id), 'type': 'PushEvent',
+        'actor': {key: actor[key] for key in ('id', 'login', 'url')},
+        'repo': {'id': 1, 'name': 'user2/repo1',
+                 'url': API_URL + '/repos/user2/repo1'},
+        'payload': {'size': 1}, 'public': True,
+        'created_at': '2017-10-13T03:03:57Z',
+    }
+
+
+def blob_content(path):
+    """Return the generated content of a repository file."""
+    line = '# {} generated by the mock server\n'.format(path)
+    return (line * (len(path) * 20)).encode('utf-8')
+
+
+def git_sha(content):
+    """Return the git blob SHA-1 of some bytes."""
+    header = 'blob {}\0'.format(len(content)).encode('ascii')
+    return hashlib.sha1(header + content).hexdigest()
+
+
+def repository_files(count=20):
+    """Return the (path, mode) of the files of the mock repository."""
+    files = [('src/module{}.py'.format(index), '100644')
+             for index in range(count)]
+    files += [('docs/page{}.md'.format(index), '100644')
+              for index in range(count // 2)]
+    files.append(('bin/run.sh', '100755'))
+
+    return files
+
+
+def tree(count=20):
+    """Return a recursive git tree, with a symbolic link and a submodule."""
+    entries = []
+    directories = set()
+
+    for path, mode in repository_files(count):
+        directories.add(path.split('/')[0])
+        content = blob_content(path)
+        entries.append({'path': path, 'mode': mode, 'type': 'blob',
+                        'sha': git_sha(content), 'size': len(content)})
+
+    for directory in sorted(directories):
+        entries.append({'path': directory, 'mode': '040000', 'type': 'tree',
+                        'sha': git_sha(directory.encode('utf-8'))})
+
+    entries.append({'path': 'latest', 'mode': '120000', 'type': 'blob',
+                    'sha': git_sha(b'src'), 'size': 3})
+    entries.append({'path': 'vendor', 'mode': '160000', 'type': 'commit',
+                    'sha': 'c' * 40})
+
+    return {'sha': 't' * 40, 'url': '{}/repos/marcosvbras/githon/git/trees'
+            .format(API_URL), 'truncated': False, 'tree': entries}
+
+
+def tarball(count=20):
+    """Return the tar.gz archive of the mock repository."""
+    archive = io.BytesIO()
+
+    with tarfile.open(fileobj=archive, mode='w:gz') as tar:
+        for path, mode in repository_files(count):
+            content = blob_content(path)
+            info = tarfile.TarInfo('githon-main/' + path)
+            info.size = len(content)
+            info.mode = 0o755 if mode == '100755' else 0o644
+            tar.addfile(info, io.BytesIO(content))
+
+    return archive.getvalue()
+
+
+BLOBS = {git_sha(blob_content(path)): blob_content(path)
+         for path, _ in repository_files()}
+
+
+def item(section, index):
+    """Return an item of a repository or user list endpoint."""
+    if section == 'commits':
+        return commit(index)
+
+    if section in ('followers', 'following', 'contributors', 'subscribers'):
+        return user_summary(index + 1)
+
+    if section == 'repos':
+        return repository(index + 1)
+
+    if section == 'events':
+        return event(index)
+
+    return {'id': index + 1, 'name': '{0}-{1}'.format(section, index),
+            'url': '{0}/{1}/{2}'.format(API_URL, section, index)}
+
+
+class MockGithubHandler(BaseHTTPRequestHandler):
+    """Answer the GitHub API requests made by githon."""
+
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately, avoid delayed ACK stalls
+    disable_nagle_algorithm = True
+
+    ROUTES = [
+        (re.compile(r'^/repos/[^/]+/([^/]+)/git/trees/(.+)$'), 'tree'),
+        (re.compile(r'^/repositories/(\d+)/git/trees/(.+)$'), 'tree'),
+        (re.compile(r'^/repos/[^/]+/([^/]+)/git/blobs/(\w+)$'), 'blob'),
+        (re.compile(r'^/repositories/(\d+)/git/blobs/(\w+)$'), 'blob'),
+        (re.compile(r'^/repos/[^/]+/([^/]+)/tarball(?:/(.+))?$'), 'tarball'),
+        (re.compile(r'^/repositories/(\d+)/tarball(?:/(.+))?$'), 'tarball'),
+        (re.compile(r'^/codeload/([^/]+)/tar\.gz/(.+)$'), 'codeload'),
+        (re.compile(r'^/rate_limit$'), 'rate_limit'),
+        (re.compile(r'^/search/users$'), 'search'),
+        (re.compile(r'^/users?/([^/]+)$'), 'user'),
+        (re.compile(r'^/users?/([^/]+)/([a-z]+)$'), 'user_list'),
+        (re.compile(r'^/repositories/(\d+)$'), 'repository'),
+        (re.compile(r'^/repos/[^/]+/([^/]+)$'), 'repository'),
+        (re.compile(r'^/repositories/(\d+)/([a-z]+)$'), 'repository_list'),
+        (re.compile(r'^/repos/[^/]+/([^/]+)/([a-z]+)$'), 'repository_list'),
+    ]
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        time.sleep(server.latency)
+
+        parts = urlsplit(self.path)
+        query = parse_qs(parts.query)
+
+        with server.lock:
+            server.requests += 1
+            server.remaining = max(server.remaining - 1, 0)
+            remaining = server.remaining
+
+        for pattern, route in self.ROUTES:
+            match = pattern.match(parts.path)
+
+            if match:
+                status, body, headers = getattr(self, 'route_' + route)(
+                    parts.path, query, *match.groups())
+                break
+        else:
+            status, body, headers = 404, {'message': 'Not Found'}, {}
+
+        # Raw routes set their own Content-Type
+        if isinstance(body, bytes):
+            data = body
+        else:
+            data = json.dumps(body).encode('utf-8')
+            headers.setdefault(
+                'Content-Type', 'application/json; charset=utf-8')
+
+        etag = '"{}"'.format(hashlib.md5(data).hexdigest())
+
+        if status == 200 and self.headers.get('If-None-Match') == etag:
+            status, data = 304, b''
+
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('ETag', etag)
+
+        # codeload.github.com is not part of the API
+        if not parts.path.startswith('/codeload/'):
+            self.send_header('X-RateLimit-Limit', str(RATE_LIMIT))
+            self.send_header('X-RateLimit-Remaining', str(remaining))
+            self.send_header('X-RateLimit-Reset', str(server.reset))
+
+        for key, value in headers.items():
+            self.send_header(key, value)
+
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        """Answer the aliased user and repository GraphQL queries."""
+        server = self.server
+        time.sleep(server.latency)
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        query, variables = body['query'], body.get('variables') or {}
+        data = {}
+        errors = []
+
+        with server.lock:
+            server.requests += 1
+            server.remaining = max(server.remaining - 1, 0)
+            remaining = server.remaining
+
+        for alias, login in re.findall(
+                r'(\w+): user\(login: \$(\w+)\)', query):
+            login = variables[login]
+
+            if login.startswith('missing'):
+                data[alias] = None
+                errors.append({'type': 'NOT_FOUND', 'path': [alias],
+                               'message': 'Could not resolve to a User'})
+                continue
+
+            node = data[alias] = graphql_user(
+                int(re.sub(r'\D', '', login) or 1))
+            size = min(self.server.list_size, 100)
+
+            if 'organizationList' in query:
+                node['organizationList'] = {'nodes': [
+                    {'login': 'org{}'.format(index), 'databaseId': index,
+                     'id': 'MDEyOk9y{}'.format(index), 'avatarUrl': None,
+                     'url': 'https://github.com/org{}'.format(index),
+                     'description': None} for index in range(3)]}
+
+            if 'repositoryList' in query:
+                node['repositoryList'] = {'nodes': [
+                    graphql_repository(index + 1) for index in range(size)]}
+
+            if 'followerList' in query:
+                node['followerList'] = {'nodes': [
+                    graphql_user(index + 1) for index in range(size)]}
+
+        for alias, owner, name in re.findall(
+                r'(\w+): repository\(owner: \$(\w+), name: \$(\w+)\)',
+                query):
+            name = variables[name]
+
+            if name.startswith('missing'):
+                data[alias] = None
+                errors.append({'type': 'NOT_FOUND', 'path': [alias],
+                               'message': 'Could not resolve to a Repository'})
+            else:
+                data[alias] = graphql_repository(
+                    int(re.sub(r'\D', '', name) or 1))
+
+        result = {'data': data}
+
+        if errors:
+            result['errors'] = errors
+
+        content = json.dumps(result).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(content)))
+        self.send_header('X-RateLimit-Limit', str(RATE_LIMIT))
+        self.send_header('X-RateLimit-Remaining', str(remaining))
+        self.send_header('X-RateLimit-Reset', str(server.reset))
+        self.send_header('X-RateLimit-Resource', 'graphql')
+        self.end_headers()
+        self.wfile.write(content)
+
+    def route_rate_limit(self, path, query):
+        core = {'limit': RATE_LIMIT, 'remaining': self.server.remaining,
+                'reset': self.server.reset}
+        return 200, {'resources': {'core': core}, 'rate': core}, {}
+
+    def route_search(self, path, query):
+        return self._page(path, query, 'followers', self.server.list_size)
+
+    def route_user(self, path, query, login):
+        if login.startswith('missing'):
+            return 404, {'message': 'Not Found'}, {}
+
+        user_id = int(login) if login.isdigit() else int(
+            re.sub(r'\D', '', login) or 1)
+        return 200, user(user_id), {}
+
+    def route_user_list(self, path, query, login, section):
+        return self._page(path, query, section, self.server.list_size)
+
+    def route_repository(self, path, query, name):
+        repository_id = int(re.sub(r'\D', '', name) or 1)
+        return 200, repository(repository_id), {}
+
+    def route_repository_list(self, path, query, name, section):
+        if section == 'languages':
+            return 200, {'Python': 123456, 'C': 7890}, {}
+
+        if section == 'commits' and ('since' in query or 'until' in query):
+            return self._page(path, query, section, self.server.list_size,
+                              self._commits_between(query))
+
+        return self._page(path, query, section, self.server.list_size)
+
+    def route_tree(self, path, query, name, ref):
+        if name.startswith('empty'):
+            return 409, {'message': 'Git Repository is empty.'}, {}
+
+        data = tree()
+
+        # Trees over the GitHub listing limits are cut
+        if name.startswith('huge'):
+            data['tree'] = data['tree'][:5]
+            data['truncated'] = True
+
+        return 200, data, {}
+
+    def route_blob(self, path, query, name, sha):
+        if sha not in BLOBS:
+            return 404, {'message': 'Not Found'}, {}
+
+        if self.headers.get('Accept') == 'application/vnd.github.v3.raw':
+            return 200, BLOBS[sha], {
+                'Content-Type': 'application/octet-stream'}
+
+        return 200, {'sha': sha, 'size': len(BLOBS[sha]), 'encoding': 'base64',
+                     'content': base64.b64encode(BLOBS[sha]).decode('ascii')}, {}
+
+    def route_tarball(self, path, query, name, ref):
+        # GitHub redirects archives to codeload.github.com
+        location = 'http://{0}/codeload/{1}/tar.gz/{2}'.format(
+            self.headers['Host'], name, ref or 'main')
+        return 302, {'message': 'Found'}, {'Location': location}
+
+    def route_codeload(self, path, query, name, ref):
+        return 200, tarball(), {'Content-Type': 'application/x-gzip'}
+
+    def _commits_between(self, query):
+        """Return the indexes of the commits within the since/until dates."""
+        def parse(key):
+            value = query.get(key, [None])[0]
+            return value and datetime.datetime.strptime(
+                value, '%Y-%m-%dT%H:%M:%SZ')
+
+        since, until = parse('since'), parse('until')
+
+        return [index for index in range(self.server.list_size)
+                if (since is None or commit_date(index) >= since) and
+                (until is None or commit_date(index) <= until)]
+
+    def _page(self, path, query, section, total, indexes=None):
+        """Return a page of a list endpoint with its Link header.
+
+        indexes selects the items of a filtered list.
+        """
+        if indexes is not None:
+            total = len(indexes)
+
+        per_page = min(int(query.get('per_page', ['30'])[0]), 100)
+        page = int(query.get('page', ['1'])[0])
+        first = (page - 1) * per_page
+        headers = {}
+
+        if indexes is not None:
+            items = [item(section, index)
+                     for index in indexes[first:first + per_page]]
+        elif section == 'events':
+            # Newest first, the last created event has the greatest id
+            items = [item(section, total - index)
+                     for index in range(first, min(first + per_page, total))]
+            headers['X-Poll-Interval'] = str(self.server.poll_interval)
+        else:
+            items = [item(section, index)
+                     for index in range(first, min(first + per_page, total))]
+
+        if first + per_page < total:
+            # Keep the filters of the query, as GitHub does
+            next_query = {key: values[0] for key, values in query.items()}
+            next_query.update(per_page=per_page, page=page + 1)
+            link = '<http://{0}{1}?{2}>; rel="next"'
+            headers['Link'] = link.format(
+                self.headers['Host'], path, urlencode(next_query))
+
+        if path.startswith('/search/'):
+            return 200, {'total_count': total, 'incomplete_results': False,
+                         'items': items}, headers
+
+        return 200, items, headers
+
+
+class H2Exchange(MockGithubHandler):
+    """A request of an HTTP/2 stream, answered by the MockGithubHandler code.
+
+    The response is captured instead of written to a socket.
+    """
+
+    def __init__(self, server, method, path, headers, body):
+        """Constructor."""
+        self.server = server
+        self.command = method
+        self.path = path
+        self.headers = headers
+        self.rfile = io.BytesIO(body)
+        self.wfile = io.BytesIO()
+        self.status = 500
+        self.response_headers = []
+
+    def send_response(self, code, message=None):
+        self.status = code
+
+    def send_header(self, keyword, value):
+        self.response_headers.append((keyword.lower(), str(value)))
+
+    def end_headers(self):
+        pass
+
+
+class MockGithubServer(ThreadingHTTPServer):
+    """Threaded mock GitHub API server.
+
+    Args:
+        port: TCP port, 0 picks a free one.
+        latency: Seconds added to every response.
+        list_size: Number of items of every list endpoint.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, port=0, latency=0.0, list_size=250):
+        """Constructor."""
+        super().__init__(('127.0.0.1', port), MockGithubHandler)
+        self.latency = latency
+        self.list_size = list_size
+        self.poll_interval = 60
+        self.requests = 0
+        self.connections = 0
+        self.remaining = RATE_LIMIT
+        self.reset = int(time.time()) + 3600
+        self.lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        """Return the root URL of the server."""
+        return 'http://127.0.0.1:{}'.format(self.server_address[1])
+
+    def start(self):
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+
+        return self
+
+    def stop(self):
+        """Stop serving requests."""
+        self.shutdown()
+        self.server_close()
+
+    def process_request(self, request, client_address):
+        with self.lock:
+            self.connections += 1
+
+        super().process_request(request, client_address)
+
+
+class MockGithubH2Server(MockGithubServer):
+    """Mock GitHub API server speaking cleartext HTTP/2 (h2c).
+
+    Clients must use HTTP/2 with prior knowledge, e.g. an httpx client with
+    http1=False. The streams of a connection are answered concurrently, so
+    the latency of multiplexed requests overlaps. Requires h2.
+    """
+
+    def finish_request(self, request, client_address):
+        """Serve the streams of a connection until the client closes it."""
+        import h2.config
+        import h2.connection
+        import h2.events
+        import h2.exceptions
+
+        connection = h2.connection.H2Connection(h2.config.H2Configuration(
+            client_side=False, header_encoding='utf-8'))
+        condition = threading.Condition()
+        streams = {}
+
+        with condition:
+            connection.initiate_connection()
+            request.sendall(connection.data_to_send())
+
+        while True:
+            data = request.recv(65535)
+
+            if not data:
+                break
+
+            with condition:
+                for event in connection.receive_data(data):
+                    if isinstance(event, h2.events.RequestReceived):
+                        streams[event.stream_id] = (event.headers, [])
+                    elif isinstance(event, h2.events.DataReceived):
+                        streams[event.stream_id][1].append(event.data)
+                        connection.acknowledge_received_data(
+                            event.flow_controlled_length, event.stream_id)
+                    elif isinstance(event, h2.events.StreamEnded):
+                        headers, body = streams.pop(event.stream_id)
+                        threading.Thread(
+                            target=self._answer_stream, daemon=True,
+                            args=(request, connection, condition,
+                                  event.stream_id, headers, b''.join(body))
+                        ).start()
+
+                request.sendall(connection.data_to_send())
+                condition.notify_all()
+
+        with condition:
+            condition.notify_all()
+
+    def _answer_stream(self, sock, connection, condition, stream_id, headers, body):
+        """Answer a request stream, within the HTTP/2 flow control windows."""
+        import h2.exceptions
+
+        message = Message()
+        pseudo = {}
+
+        for key, value in headers:
+            if key.startswith(':'):
+                pseudo[key] = value
+            else:
+                message[key] = value
+
+        message['Host'] = pseudo.get(':authority', '')
+        exchange = H2Exchange(self, pseudo[':method'], pseudo[':path'],
+                              message, body)
+        getattr(exchange, 'do_' + exchange.command)()
+        data = exchange.wfile.getvalue()
+        response_headers = [(':status', str(exchange.status))] + [
+            (key, value) for key, value in exchange.response_headers
+            if key not in ('connection', 'keep-alive', 'transfer-encoding')]
+
+        try:
+            with condition:
+                connection.send_headers(
+                    stream_id, response_headers, end_stream=not data)
+                sock.sendall(connection.data_to_send())
+
+            while data:
+                with condition:
+                    window = connection.local_flow_control_window(stream_id)
+
+                    if window <= 0:
+                        condition.wait(1.0)
+                        continue
+
+                    size = min(window, len(data),
+                               connection.max_outbound_frame_size)
+                    connection.send_data(
+                        stream_id, data[:size], end_stream=size == len(data))
+                    sock.sendall(connection.data_to_send())
+
+                data = data[size:]
+        except (h2.exceptions.StreamClosedError, OSError):
+            # The client reset the stream or closed the connection
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--list-size', type=int, default=250)
+    parser.add_argument('--http2', action='store_true',
+                        help='speak cleartext HTTP/2 (h2c)')
+    args = parser.parse_args()
+
+    server_class = MockGithubH2Server if args.http2 else MockGithubServer
+    server = server_class(args.port, args.latency, args.list_size)
+    print('Serving on {}'.format(server.url))
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+# coding: utf-8
+"""Measure the client overhead of githon, apart from the network time.
+
+Requests are answered by an in-process requests adapter with canned
+responses, so the timings only hold githon and requests work. The same
+calls against the local mock server show the network share. Also
+measures the import time of the package:
+
+    python benchmarks/overhead.py
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import requests  # noqa: E402
+from requests.adapters import BaseAdapter  # noqa: E402
+from githon import GithubApi  # noqa: E402
+from githon.utils import create_session  # noqa: E402
+from mock_server import MockGithubServer, user, user_summary  # noqa: E402
+
+
+class CannedAdapter(BaseAdapter):
+    """Answer every request with the same canned JSON response."""
+
+    def __init__(self, body, headers=None):
+        """Constructor."""
+        super().__init__()
+        self.content = json.dumps(body).encode('utf-8')
+        self.headers = {
+            'Content-Type': 'application/json; charset=utf-8',
+            'X-RateLimit-Limit': '5000', 'X-RateLimit-Remaining': '4999',
+            'X-RateLimit-Reset': str(int(time.time()) + 3600)}
+        self.headers.update(headers or {})
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = self.content
+        response.headers = requests.structures.CaseInsensitiveDict(
+            self.headers)
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+
+        return response
+
+    def close(self):
+        pass
+
+
+def canned_api(body):
+    """Return a GithubApi whose session answers with a canned body."""
+    session = create_session()
+    session.mount('https://', CannedAdapter(body))
+
+    return GithubApi('token', session=session)
+
+
+def per_call(call, calls):
+    """Return the median microseconds per call of 5 rounds."""
+    rounds = []
+
+    for _ in range(5):
+        start = time.perf_counter()
+
+        for index in range(calls):
+            call(index)
+
+        rounds.append((time.perf_counter() - start) / calls * 1e6)
+
+    return statistics.median(rounds)
+
+
+def import_time(module, runs):
+    """Return the median milliseconds to import a module in a new process."""
+    def run(statement):
+        start = time.perf_counter()
+        subprocess.check_call(
+            [sys.executable, '-c', statement], cwd=ROOT)
+        return time.perf_counter() - start
+
+    baseline = statistics.median(run('pass') for _ in range(runs))
+    imported = statistics.median(
+        run('import {}'.format(module)) for _ in range(runs))
+
+    return (imported - baseline) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=2000)
+    parser.add_argument('--imports', type=int, default=10)
+    args = parser.parse_args()
+
+    profile = canned_api(user(1))
+    followers = canned_api([user_summary(index) for index in range(100)])
+    server = MockGithubServer().start()
+    remote = GithubApi('token')
+    remote.ROOT_API_URL = server.url
+
+    try:
+        results = [
+            ('import githon (ms)', import_time('githon', args.imports)),
+            ('import githon.github (ms)',
+             import_time('githon.github', args.imports)),
+            ('user_by_username, client only (us)', per_call(
+                lambda i: profile.user_by_username('user1'), args.calls)),
+            ('user_by_username, If-Modified-Since, client only (us)',
+             per_call(lambda i: profile.user_by_username(
+                 'user1', last_modified_date='2017-10-13T03:03:57Z'),
+                 args.calls)),
+            ('followers_by_id 100 items, client only (us)', per_call(
+                lambda i: followers.followers_by_id(1), args.calls)),
+            ('get_last_modified_header (us)', per_call(
+                lambda i: profile.get_last_modified_header(
+                    '2017-10-13T03:03:57Z'), args.calls)),
+            ('user_by_username, local server (us)', per_call(
+                lambda i: remote.user_by_username('user1'),
+                args.calls // 4 or 1)),
+        ]
+    finally:
+        server.stop()
+
+    for name, value in results:
+        print('{0:<55} {1:>10.1f}'.format(name, value))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+# coding: utf-8
+"""Benchmark githon against a local mock GitHub API server.
+
+Measures throughput, p50/p99 latency and peak memory of GithubApi,
+RepositoryApi and RepositoryApi.get_all_data, saving the results as JSON:
+
+    python benchmarks/run.py --output results.json
+    python benchmarks/run.py --compare results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from githon import GithubApi, GraphQLApi, RepositoryApi  # noqa: E402
+from mock_server import MockGithubServer  # noqa: E402
+
+
+def percentile(values, fraction):
+    """Return the value below which a fraction of the sorted values fall."""
+    index = min(int(len(values) * fraction), len(values) - 1)
+    return values[index]
+
+
+def measure(name, call, calls, workers):
+    """Run call a number of times and measure it.
+
+    Args:
+        name: The scenario name.
+        call: Callable receiving the call index.
+        calls: Number of calls.
+        workers: Number of concurrent threads.
+
+    Returns:
+        dict: The scenario results.
+
+    """
+    latencies = []
+
+    def timed(index):
+        start = time.perf_counter()
+        call(index)
+        latencies.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(timed, range(calls)))
+
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    latencies.sort()
+
+    return {
+        'name': name,
+        'calls': calls,
+        'workers': workers,
+        'seconds': round(elapsed, 4),
+        'calls_per_second': round(calls / elapsed, 2),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+        'peak_memory_kb': round(peak / 1024, 1),
+    }
+
+
+def scenarios(server, calls, workers):
+    """Return the benchmark scenarios as (name, call, calls, workers)."""
+    github = GithubApi('token')
+    repository = RepositoryApi('token')
+    graphql = GraphQLApi('token')
+    github.ROOT_API_URL = server.url
+    repository.ROOT_API_URL = server.url
+    graphql.ROOT_API_URL = server.url
+
+    def batch(index):
+        return ['user{}'.format(index * 50 + offset) for offset in range(50)]
+
+    return [
+        ('user_by_username', lambda i: github.user_by_username(
+            'user{}'.format(i)), calls, 1),
+        ('user_by_username_concurrent', lambda i: github.user_by_username(
+            'user{}'.format(i)), calls, workers),
+        ('followers_by_id', lambda i: github.followers_by_id(i), calls, 1),
+        ('iter_followers_by_id', lambda i: sum(
+            1 for _ in github.iter_followers_by_id(i)), calls // 10 or 1, 1),
+        ('users_by_usernames_50', lambda i: github.users_by_usernames(
+            batch(i)), calls // 10 or 1, 1),
+        ('graphql_users_by_usernames_50', lambda i: graphql.users_by_usernames(
+            batch(i)), calls // 10 or 1, 1),
+        ('search_users', lambda i: github.search_users(
+            'q=location:earth'), calls, 1),
+        ('commits_by_id', lambda i: repository.commits_by_id(i), calls, 1),
+        ('get_all_data', lambda i: repository.get_all_data(
+            repository_id=i + 1), calls // 10 or 1, 1),
+    ]
+
+
+def compare(results, baseline_path):
+    """Print the change of each scenario against a baseline results file."""
+    with open(baseline_path) as baseline_file:
+        baseline = {scenario['name']: scenario
+                    for scenario in json.load(baseline_file)['scenarios']}
+
+    print('\n{0:<30} {1:>12} {2:>10} {3:>10} {4:>10}'.format(
+        'scenario', 'calls/s', 'p50', 'p99', 'memory'))
+
+    for scenario in results['scenarios']:
+        old = baseline.get(scenario['name'])
+
+        if old is None:
+            continue
+
+        print('{0:<30} {1:>+11.1%} {2:>+9.1%} {3:>+9.1%} {4:>+9.1%}'.format(
+            scenario['name'],
+            scenario['calls_per_second'] / old['calls_per_second'] - 1,
+            scenario['p50_ms'] / old['p50_ms'] - 1,
+            scenario['p99_ms'] / old['p99_ms'] - 1,
+            scenario['peak_memory_kb'] / old['peak_memory_kb'] - 1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Seconds added by the server to each response')
+    parser.add_argument('--list-size', type=int, default=250)
+    parser.add_argument('--only', nargs='*', help='Scenarios to run')
+    parser.add_argument('--output', help='Write the results to a JSON file')
+    parser.add_argument('--compare', help='Baseline JSON results file')
+    args = parser.parse_args()
+
+    server = MockGithubServer(
+        latency=args.latency, list_size=args.list_size).start()
+    results = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'latency': args.latency,
+        'list_size': args.list_size,
+        'scenarios': [],
+    }
+
+    try:
+        for name, call, calls, workers in scenarios(
+                server, args.calls, args.workers):
+            if args.only and name not in args.only:
+                continue
+
+            scenario = measure(name, call, calls, workers)
+            results['scenarios'].append(scenario)
+            print('{name:<30} {calls_per_second:>10} calls/s  '
+                  'p50 {p50_ms:>8} ms  p99 {p99_ms:>8} ms  '
+                  'peak {peak_memory_kb:>9} KB'.format(**scenario))
+    finally:
+        server.stop()
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2)
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,36 @@
 # coding: utf-8
-from .github import GithubApi
-from .repository import RepositoryApi
+"""A simple Data Scraping library for GitHub REST API v3.
+
+The API classes are imported on first use, so importing githon does not
+load requests, httpx or any other dependency until they are needed.
+"""
+
+import importlib
+
+# Public name -> module that defines it
+_EXPORTS = {
+    'GithubApi': '.github',
+    'RepositoryApi': '.repository',
+    'GraphQLApi': '.graphql',
+    'AsyncGithubApi': '.aio',
+    'AsyncRepositoryApi': '.aio',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+
+    if module is None:
+        raise AttributeError(
+            "module 'githon' has no attribute '{}'".format(name))
+
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
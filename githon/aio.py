@@ -0,0 +1,667 @@
+# coding: utf-8
+"""Module with asyncio counterparts of GithubApi and RepositoryApi.
+
+Requests are made with httpx, which is an optional dependency:
+
+    pip install githon[async]
+"""
+
+import asyncio
+import os
+import time
+import weakref
+from .cache import SKIPPED_HEADERS, make_cache_key
+from .github import GithubApi
+from .records import project, project_list
+from .repository import (RepositoryApi, EXECUTABLE_MODE, filter_tree,
+                         plan_downloads)
+from .utils import remove_file
+
+try:
+    import httpx
+    from httpx import USE_CLIENT_DEFAULT
+except ImportError:
+    httpx = None
+    USE_CLIENT_DEFAULT = None
+
+
+def create_async_client(max_connections=100, max_keepalive_connections=20, http2=False, http1=True):
+    """Create a pooled non-blocking HTTP client to be shared by API objects.
+
+    Args:
+        max_connections: Maximum number of concurrent connections.
+        max_keepalive_connections: Maximum number of idle connections kept
+            alive in the pool.
+        http2: Multiplex concurrent requests over few HTTP/2 connections.
+            Requires h2, see githon[http2].
+        http1: Also allow HTTP/1.1. False speaks HTTP/2 without negotiation,
+            which cleartext (http://) servers require.
+
+    Returns:
+        httpx.AsyncClient: The configured client.
+
+    """
+    if httpx is None:
+        raise ImportError(
+            "The githon asyncio API requires httpx. "
+            "Install it with: pip install githon[async]")
+
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections)
+
+    return httpx.AsyncClient(limits=limits, http1=http1, http2=http2)
+
+
+async def close_shared_clients():
+    """Close the pooled client shared by the async API objects of the loop.
+
+    Call it once the running event loop makes no more requests, e.g. at the
+    end of the coroutine given to asyncio.run. A later request opens a new
+    client.
+    """
+    client = AsyncBaseRequest._shared_clients.pop(
+        asyncio.get_running_loop(), None)
+
+    if client is not None:
+        await client.aclose()
+
+
+class AsyncBaseRequest:
+    """Replaces the blocking transport of BaseRequest by an asyncio one."""
+
+    # One shared client per event loop, since connections are bound to it
+    _shared_clients = weakref.WeakKeyDictionary()
+
+    def __init__(self, default_access_token=None, client=None, **kwargs):
+        """Constructor.
+
+        Args:
+            default_access_token: The default GitHub access_token.
+            client: Optional httpx.AsyncClient used for every request. When
+                not provided, a pooled client shared by all async API objects
+                of the running event loop is used.
+            kwargs: Other transport options, such as cache. See
+                BaseRequest.__init__.
+        """
+        super().__init__(default_access_token, **kwargs)
+        self.client = client
+
+    def get_client(self):
+        """Return the HTTP client used by this object.
+
+        Returns:
+            httpx.AsyncClient: The injected client or the shared pooled one.
+
+        """
+        if self.client is not None:
+            return self.client
+
+        loop = asyncio.get_running_loop()
+        client = AsyncBaseRequest._shared_clients.get(loop)
+
+        if client is None:
+            client = create_async_client()
+            AsyncBaseRequest._shared_clients[loop] = client
+
+        return client
+
+    async def aclose(self):
+        """Close the injected HTTP client of this object, if any.
+
+        The shared client of the event loop is left open, as other API
+        objects may be using it. See close_shared_clients.
+        """
+        if self.client is not None:
+            await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.aclose()
+
+    async def _get(self, url, access_token='', headers=None, params=None):
+        """Perform a non-blocking GET request through the pooled client.
+
+        Args:
+            url: The full URL to be requested.
+            access_token: GitHub OAuth2 access token, if any.
+            headers: Optional dict of extra request headers.
+            params: Optional dict of query string parameters.
+
+        Returns:
+            httpx.Response: The HTTP response.
+
+        """
+        params = self._build_params(url, access_token, params)
+
+        if self.memo is None or headers:
+            return await self._send(url, access_token, headers, params)
+
+        return await self.memo.acall(
+            make_cache_key(url, params),
+            lambda: self._send(url, access_token, headers, params))
+
+    async def _send(self, url, access_token, headers, params):
+        """Send a non-blocking GET request through the cache and throttle.
+
+        Asynchronous version of BaseRequest._send.
+        """
+        start = time.perf_counter()
+        key, entry, headers = await self._run_cache(
+            self._prepare_conditional_request, url, params, headers)
+
+        if entry is not None and self.cache.is_fresh(key, entry):
+            response = self._cached_response(entry)
+            self._notify(url, start, response, 'fresh', 0)
+            return response
+
+        attempt = 0
+        timeout = self.timeout
+
+        if timeout is None:
+            # Keep the default timeout of the httpx client
+            timeout = USE_CLIENT_DEFAULT
+
+        while True:
+            attempt += 1
+            delay = await self._run_quota(
+                self._before_request, url, access_token)
+
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            try:
+                response = await self.get_client().get(
+                    url, headers=headers, params=params, timeout=timeout)
+            except httpx.TransportError as error:
+                delay = self._retry_delay(attempt, error=error)
+
+                if delay is None:
+                    self._notify(url, start, None, None, attempt - 1, error)
+                    raise
+
+                await asyncio.sleep(delay)
+                continue
+
+            await self._run_quota(
+                self._after_response, url, access_token, response)
+            delay = self._retry_delay(attempt, response=response)
+
+            if delay is None:
+                break
+
+            await asyncio.sleep(delay)
+
+        response = await self._run_cache(
+            self._handle_conditional_response, key, entry, response)
+        self._notify(
+            url, start, response, self._cache_result(key, response),
+            attempt - 1)
+
+        return response
+
+    async def _download(self, url, access_token, path, check_status, headers=None, chunk_size=65536):
+        """Stream a response body to a file, never holding it in memory.
+
+        Asynchronous version of BaseRequest._download. Redirects, such as
+        the codeload.github.com ones of archives, are followed.
+        """
+        start = time.perf_counter()
+        params = self._build_params(url, access_token, None)
+        attempt = 0
+        timeout = self.timeout
+
+        if timeout is None:
+            timeout = USE_CLIENT_DEFAULT
+
+        while True:
+            attempt += 1
+            delay = await self._run_quota(
+                self._before_request, url, access_token)
+
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            # Errors while the body is written are not retried
+            writing = False
+
+            try:
+                async with self.get_client().stream(
+                        'GET', url, headers=headers, params=params,
+                        timeout=timeout, follow_redirects=True) as response:
+                    await self._run_quota(
+                        self._after_response, url, access_token, response)
+                    delay = self._retry_delay(attempt, response=response)
+
+                    if delay is None:
+                        writing = True
+                        return await self._write_response(
+                            url, start, response, path, check_status,
+                            chunk_size, attempt - 1)
+            except httpx.TransportError as error:
+                if writing:
+                    raise
+
+                delay = self._retry_delay(attempt, error=error)
+
+                if delay is None:
+                    self._notify(url, start, None, None, attempt - 1, error)
+                    raise
+
+            await asyncio.sleep(delay)
+
+    async def _write_response(self, url, start, response, path, check_status, chunk_size, retries):
+        """Write a streamed response body to path through path + '.part'.
+
+        Returns:
+            int: The number of bytes written.
+
+        """
+        size = 0
+        temporary_path = path + '.part'
+
+        try:
+            check_status(response)
+
+            with open(temporary_path, 'wb') as output_file:
+                async for chunk in response.aiter_bytes(chunk_size):
+                    output_file.write(chunk)
+                    size += len(chunk)
+
+            os.replace(temporary_path, path)
+        except BaseException:
+            remove_file(temporary_path)
+            raise
+        finally:
+            self._notify(url, start, response, None, retries, size=size)
+
+        return size
+
+    async def _run_quota(self, function, *args):
+        """Call a method using the rate limit tracker without blocking.
+
+        Trackers that wait on I/O, such as SharedQuota with its SQLite
+        transactions, run in the default executor. The others are called
+        directly, as a thread switch costs more than their work.
+        """
+        return await self._run_blocking(
+            getattr(self.rate_limit, 'blocking', False), function, *args)
+
+    async def _run_cache(self, function, *args):
+        """Call a method using the response cache without blocking.
+
+        See _run_quota. SQLiteCache runs in the default executor.
+        """
+        return await self._run_blocking(
+            getattr(self.cache, 'blocking', False), function, *args)
+
+    async def _run_blocking(self, blocking, function, *args):
+        """Call function(*args), in the default executor if blocking."""
+        if not blocking:
+            return function(*args)
+
+        return await asyncio.get_running_loop().run_in_executor(
+            None, function, *args)
+
+    def _cached_response(self, entry, not_modified=None):
+        """Build a 200 OK response from a cached entry.
+
+        Asynchronous transport version of BaseRequest._cached_response.
+        """
+        headers = httpx.Headers(entry.headers)
+        request = None
+
+        if not_modified is not None:
+            headers.update(
+                (key, value) for key, value in not_modified.headers.items()
+                if key.lower() not in SKIPPED_HEADERS)
+            request = not_modified.request
+
+        response = httpx.Response(
+            200, headers=headers, content=entry.content, request=request)
+        response.from_cache = True
+
+        return response
+
+    async def _paginate(self, url, access_token, check_status, limit=None, per_page=100, fields=None, params=None):
+        """Lazily yield the items of a paginated endpoint.
+
+        Asynchronous version of BaseRequest._paginate.
+        """
+        params = dict(params or (), per_page=per_page)
+        count = 0
+
+        if fields is not None and not isinstance(fields, type):
+            fields = tuple(fields)
+
+        while url:
+            response = await self._get(url, access_token, params=params)
+            check_status(response)
+
+            for item in self._page_items(response):
+                if limit is not None and count >= limit:
+                    return
+
+                yield project(item, fields)
+                count += 1
+
+            if limit is not None and count >= limit:
+                return
+
+            url = response.links.get('next', {}).get('url')
+            params = None
+
+    async def get_request_limit(self, access_token):
+        """Request Github remaining requests without spend the amount remaining.
+
+        Args:
+            access_token: The target access_token.
+        Returns:
+            int: The amount of remaining requests for a given access_token.
+
+        """
+        url = "{0}/rate_limit"
+        response = await self._get(url.format(self.ROOT_API_URL), access_token)
+        data = self._json(response)
+        return data['resources']['core'].get("remaining")
+
+
+class AsyncGithubApi(AsyncBaseRequest, GithubApi):
+    """Class that controls all Github API v3 requests with asyncio.
+
+    It has the same methods of GithubApi, but they must be awaited and the
+    iter_* methods return asynchronous iterators.
+    """
+
+    async def users_by_ids(self, user_ids, access_token=None, max_workers=8):
+        """Get many users by User ID concurrently.
+
+        Asynchronous version of GithubApi.users_by_ids.
+        """
+        return self._collect_user_requests([
+            result async for result in self.iter_users_by_ids(
+                user_ids, access_token, max_workers)])
+
+    async def users_by_usernames(self, usernames, access_token=None, max_workers=8):
+        """Get many users by username concurrently.
+
+        Asynchronous version of GithubApi.users_by_usernames.
+        """
+        return self._collect_user_requests([
+            result async for result in self.iter_users_by_usernames(
+                usernames, access_token, max_workers)])
+
+    async def user_emails(self, access_token):
+        """Retrieve a list of emails from a given access_token.
+
+        Arguments:
+            access_token: OAuth2 access token authorized by account owner.
+
+        Returns:
+            dict: The profile emails data.
+
+        """
+        url = "{0}/user/emails"
+        response = await self._get(url.format(self.ROOT_API_URL), access_token)
+        self._check_common_status_code(response, access_token)
+
+        return self._json(response)
+
+    async def search_users(self, parameters, access_token=None):
+        """Retrieve users with a given query.
+
+        Args:
+            parameters: A Github query string.
+            access_token: GitHub OAuth2 access token.
+        Returns:
+            dict: A list of Github users that matches with query.
+
+        """
+        access_token = self.get_token(access_token)
+        url = "{0}/search/users?{1}"
+
+        response = await self._get(
+            url.format(self.ROOT_API_URL, self.encode_parameters(parameters)),
+            access_token
+        )
+
+        self._check_search_status_code(response, access_token)
+
+        return self._json(response)
+
+    async def _iterate_user_requests(self, kind, users, access_token, max_workers):
+        """Request many users with at most max_workers concurrent requests.
+
+        Asynchronous version of GithubApi._iterate_user_requests.
+        """
+        seen = set()
+        pending = {}
+
+        try:
+            for user in users:
+                if user in seen:
+                    continue
+
+                seen.add(user)
+                task = asyncio.ensure_future(self._complete_user_request(
+                    kind, user, access_token, None))
+                pending[task] = user
+
+                if len(pending) >= max_workers:
+                    done, _ = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED)
+
+                    for result in self._pop_user_results(pending, done):
+                        yield result
+
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED)
+
+                for result in self._pop_user_results(pending, done):
+                    yield result
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _complete_user_request(self, kind, user, access_token, last_modified_date):
+        """Complements an user data request from a given User.
+
+        Asynchronous version of GithubApi._complete_user_request.
+        """
+        url = "{0}/{1}/{2}"
+        headers = None
+        data = {}
+        access_token = self.get_token(access_token)
+
+        if last_modified_date:
+            headers = self.get_last_modified_header(last_modified_date)
+
+        response = await self._get(
+            url.format(self.ROOT_API_URL, kind, user), access_token,
+            headers=headers)
+
+        self._check_status_code(response, user, access_token)
+
+        if response.content:
+            data = self._json(response)
+
+        return data
+
+    async def _complete_resource_request(self, kind, user, complement, access_token, fields=None):
+        """Complements an user data request from a given User.
+
+        Asynchronous version of GithubApi._complete_resource_request.
+        """
+        url = "{0}/{1}/{2}/{3}"
+        access_token = self.get_token(access_token)
+
+        response = await self._get(url.format(
+            self.ROOT_API_URL, kind, user, complement), access_token)
+
+        self._check_status_code(response, user, access_token)
+
+        return project_list(self._json(response), fields)
+
+
+class AsyncRepositoryApi(AsyncBaseRequest, RepositoryApi):
+    """Class that has Repository Data Scraping actions with asyncio.
+
+    It has the same methods of RepositoryApi, but they must be awaited and
+    the iter_* methods return asynchronous iterators.
+    """
+
+    async def repository_by_id(self, repository_id, access_token=None):
+        """Return a repository with given repository ID."""
+        url = "{0}/repositories/{1}"
+        access_token = self.get_token(access_token)
+
+        response = await self._get(
+            url.format(self.ROOT_API_URL, repository_id), access_token)
+
+        self._check_status_by_id(response, repository_id, access_token)
+
+        return self._json(response)
+
+    async def repository_by_name(self, username, repository_name, access_token=None):
+        """Return a repository with given repository_name and username."""
+        url = "{0}/repos/{1}/{2}"
+        access_token = self.get_token(access_token)
+
+        response = await self._get(
+            url.format(self.ROOT_API_URL, username, repository_name),
+            access_token
+        )
+
+        self._check_status_by_name(
+            response, username, repository_name, access_token)
+
+        return self._json(response)
+
+    async def get_all_data(self, repository_id=None, repository_name=None, access_token=None, username=None, sections=None, max_workers=None):
+        """Request all repository data from a given repository ID or name.
+
+        Asynchronous version of RepositoryApi.get_all_data, where
+        max_workers bounds the number of concurrent requests.
+        """
+        data = {}
+
+        if repository_id:
+            args = (repository_id,)
+            root_request = self.repository_by_id
+            suffix = 'by_id'
+        elif repository_name and username:
+            args = (username, repository_name)
+            root_request = self.repository_by_name
+            suffix = 'by_name'
+        else:
+            return data
+
+        sections = self.ALL_DATA_SECTIONS if sections is None else tuple(sections)
+        semaphore = asyncio.Semaphore(max_workers or len(sections) + 1)
+
+        async def bounded(request):
+            async with semaphore:
+                return await request(*args, access_token)
+
+        results = await asyncio.gather(
+            bounded(root_request),
+            *[bounded(getattr(self, '{0}_{1}'.format(section, suffix)))
+              for section in sections])
+
+        data.update(project(results[0], self.REPOSITORY_FIELDS))
+
+        for section, result in zip(sections, results[1:]):
+            data[section] = result
+
+        return data
+
+    async def _complete_request_by_name(self, username, repository_name, complement, access_token, fields=None, params=None):
+        """Complements a repository data request by name.
+
+        Asynchronous version of RepositoryApi._complete_request_by_name.
+        """
+        url = "{0}/repos/{1}/{2}/{3}"
+        access_token = self.get_token(access_token)
+
+        response = await self._get(
+            url.format(
+                self.ROOT_API_URL, username, repository_name, complement),
+            access_token, params=params)
+
+        self._check_status_by_name(
+            response, username, repository_name, access_token)
+
+        return project_list(self._json(response), fields)
+
+    async def _complete_request_by_id(self, repository_id, complement, access_token, fields=None, params=None):
+        """Complements a repository data request by ID.
+
+        Asynchronous version of RepositoryApi._complete_request_by_id.
+        """
+        url = "{0}/repositories/{1}/{2}"
+        access_token = self.get_token(access_token)
+
+        response = await self._get(
+            url.format(self.ROOT_API_URL, repository_id, complement),
+            access_token, params=params)
+
+        self._check_status_by_id(response, repository_id, access_token)
+
+        return project_list(self._json(response), fields)
+
+    async def _tree(self, url, check_status, ref, access_token, patterns, min_size, max_size):
+        """Request the recursive tree of a repository and filter its files.
+
+        Asynchronous version of RepositoryApi._tree.
+        """
+        access_token = self.get_token(access_token)
+        response = await self._get(
+            "{0}/git/trees/{1}".format(url, ref or 'HEAD'), access_token,
+            params={'recursive': 1})
+
+        # An empty repository has no tree
+        if response.status_code == 409:
+            return {'sha': None, 'truncated': False, 'tree': []}
+
+        check_status(response, access_token)
+
+        return filter_tree(self._json(response), patterns, min_size, max_size)
+
+    async def _download_files(self, url, check_status, directory, ref, access_token, patterns, min_size, max_size, max_workers, chunk_size):
+        """Download the blobs of the files of a tree into a directory.
+
+        Asynchronous version of RepositoryApi._download_files, where
+        max_workers bounds the number of concurrent downloads.
+        """
+        tree = await self._tree(url, check_status, ref, access_token,
+                                patterns, min_size, max_size)
+        # Hashing the existing files blocks, keep it off the event loop
+        downloads = await asyncio.get_running_loop().run_in_executor(
+            None, plan_downloads, tree, directory)
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def bounded(entry, path):
+            async with semaphore:
+                await self._download_blob(
+                    url, check_status, entry, path, access_token, chunk_size)
+
+        await asyncio.gather(
+            *[bounded(entry, path) for entry, path in downloads])
+
+        return [entry['path'] for entry, _ in downloads]
+
+    async def _download_blob(self, url, check_status, entry, path, access_token, chunk_size):
+        """Stream the raw content of a blob to a file."""
+        access_token = self.get_token(access_token)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        await self._download(
+            "{0}/git/blobs/{1}".format(url, entry['sha']), access_token, path,
+            lambda response: check_status(response, access_token),
+            headers={'Accept': 'application/vnd.github.v3.raw'},
+            chunk_size=chunk_size)
+
+        if entry['mode'] == EXECUTABLE_MODE:
+            os.chmod(path, os.stat(path).st_mode | 0o111)
@@ -0,0 +1,528 @@
+# coding: utf-8
+"""Module with response caches used to make conditional requests."""
+
+import hashlib
+import json
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Future
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Headers that describe the encoded body on the wire, not the cached one
+SKIPPED_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding',
+                   'connection', 'keep-alive')
+
+# Endpoints of the authenticated user, also under the GitHub Enterprise
+# root, but not the /user/:id ones of any user
+TOKEN_SCOPED_PATH = re.compile(r'^(?:/api/v3)?/user(?:$|/(?!\d+(?:/|$)))')
+
+
+def make_cache_key(url, params=None):
+    """Return a normalized cache key for a request.
+
+    The query string parameters are sorted, so equivalent requests share
+    the same entry. The access_token is dropped, so the same resource
+    requested with the tokens of a pool shares an entry, except for the
+    endpoints of the authenticated user, such as /user/emails, where it is
+    replaced by a hash of it, so their responses are never served to
+    another token.
+
+    Args:
+        url: The requested URL.
+        params: Optional dict of query string parameters.
+
+    Returns:
+        str: The cache key.
+
+    """
+    scheme, netloc, path, query, _ = urlsplit(url)
+    query = parse_qsl(query, keep_blank_values=True)
+
+    if params:
+        query.extend((key, str(value)) for key, value in params.items())
+
+    if TOKEN_SCOPED_PATH.match(path):
+        query = [(key, value) if key != 'access_token' else (
+            key, hashlib.sha256(value.encode('utf-8')).hexdigest())
+            for key, value in query]
+    else:
+        query = [(key, value) for key, value in query
+                 if key != 'access_token']
+
+    return urlunsplit((scheme, netloc, path, urlencode(sorted(query)), ''))
+
+
+class CachedResponse:
+    """A response body stored with its validators.
+
+    Args:
+        content: The decoded response body.
+        headers: Dict of response headers.
+        etag: The ETag header value, if any.
+        last_modified: The Last-Modified header value, if any.
+        stored_at: Timestamp of when the response was (re)validated.
+    """
+
+    __slots__ = ('content', 'headers', 'etag', 'last_modified', 'stored_at')
+
+    def __init__(self, content, headers, etag=None, last_modified=None, stored_at=None):
+        """Constructor."""
+        self.content = content
+        self.headers = headers
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = time.time() if stored_at is None else stored_at
+
+    @classmethod
+    def from_response(cls, response):
+        """Build a cache entry from an HTTP response.
+
+        Args:
+            response: HTTP Response object.
+
+        Returns:
+            CachedResponse: The entry or None if the response has no
+                validators.
+
+        """
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+
+        if not etag and not last_modified:
+            return None
+
+        headers = {key: value for key, value in response.headers.items()
+                   if key.lower() not in SKIPPED_HEADERS}
+
+        return cls(response.content, headers, etag, last_modified)
+
+    def conditional_headers(self):
+        """Return the headers that revalidate this entry.
+
+        Returns:
+            dict: If-None-Match and/or If-Modified-Since headers.
+
+        """
+        headers = {}
+
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+
+        return headers
+
+
+class BaseCache:
+    """Freshness rules shared by all response caches.
+
+    A cached response younger than its TTL is served without any request.
+    An older one is revalidated with a conditional request.
+
+    Args:
+        ttl: Seconds a response stays fresh. Either a number for all
+            endpoints or a dict of seconds by URL path prefix, e.g.
+            {'/users': 3600, '/repos': 600}. The longest matching prefix
+            wins and unmatched endpoints are always revalidated.
+    """
+
+    # True when get and set wait on I/O, e.g. a database, so the async API
+    # runs them in the default executor
+    blocking = False
+
+    def __init__(self, ttl=0):
+        """Constructor."""
+        self.ttl = ttl
+
+    def ttl_for(self, key):
+        """Return the TTL in seconds of a cache key."""
+        if not isinstance(self.ttl, dict):
+            return self.ttl
+
+        path = urlsplit(key).path
+        prefixes = [prefix for prefix in self.ttl if path.startswith(prefix)]
+
+        if not prefixes:
+            return 0
+
+        return self.ttl[max(prefixes, key=len)]
+
+    def is_fresh(self, key, entry):
+        """Return True if entry can be served without revalidation."""
+        return time.time() - entry.stored_at < self.ttl_for(key)
+
+
+class MemoryCache(BaseCache):
+    """Thread-safe in-memory cache of responses, used to send conditional
+    requests automatically.
+
+    GitHub does not count 304 Not Modified responses against the rate limit.
+    See more in https://developer.github.com/v3/#conditional-requests.
+
+    Args:
+        max_entries: Maximum number of stored responses. The least recently
+            used ones are evicted first. None means unbounded.
+        ttl: Seconds a response is served without revalidation. See
+            BaseCache.
+    """
+
+    def __init__(self, max_entries=10000, ttl=0):
+        """Constructor."""
+        super().__init__(ttl)
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the CachedResponse stored for key or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+            return entry
+
+    def set(self, key, entry):
+        """Store a CachedResponse for key."""
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+
+            if self.max_entries is not None:
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+    def delete(self, key):
+        """Remove the entry stored for key, if any."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteCache(BaseCache):
+    """Persistent on-disk cache of responses, shared by processes and runs.
+
+    Response bodies and headers are stored compressed. When the stored
+    bodies exceed max_bytes, the least recently used responses are evicted.
+
+    Args:
+        path: The SQLite database file path.
+        max_bytes: Budget of compressed bytes. None means unbounded.
+        ttl: Seconds a response is served without revalidation. See
+            BaseCache.
+        compress_level: zlib compression level, from 0 to 9.
+    """
+
+    blocking = True
+
+    def __init__(self, path, max_bytes=256 * 1024 * 1024, ttl=0, compress_level=6):
+        """Constructor."""
+        super().__init__(ttl)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.compress_level = compress_level
+        self._lock = threading.Lock()
+        # Imported here, as most programs never use it
+        import sqlite3
+        self._connection = sqlite3.connect(
+            path, timeout=30, check_same_thread=False,
+            isolation_level=None)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, '
+            'headers BLOB, content BLOB, size INTEGER, stored_at REAL, '
+            'accessed_at REAL)')
+        self._connection.execute(
+            'CREATE INDEX IF NOT EXISTS responses_accessed_at '
+            'ON responses (accessed_at)')
+        # Running total of the stored bytes, so writes never sum the table.
+        # It is seeded once for databases created without it.
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, '
+            'value INTEGER)')
+        self._connection.execute(
+            "INSERT OR IGNORE INTO meta SELECT 'size', COALESCE(SUM(size), 0) "
+            'FROM responses')
+
+    def get(self, key):
+        """Return the CachedResponse stored for key or None."""
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT etag, last_modified, headers, content, stored_at '
+                'FROM responses WHERE key = ?', (key,)).fetchone()
+
+            if row is None:
+                return None
+
+            self._connection.execute(
+                'UPDATE responses SET accessed_at = ? WHERE key = ?',
+                (time.time(), key))
+
+        etag, last_modified, headers, content, stored_at = row
+
+        return CachedResponse(
+            zlib.decompress(content),
+            json.loads(zlib.decompress(headers).decode('utf-8')),
+            etag, last_modified, stored_at)
+
+    def set(self, key, entry):
+        """Store a CachedResponse for key and evict the exceeding bytes."""
+        headers = zlib.compress(
+            json.dumps(entry.headers).encode('utf-8'), self.compress_level)
+        content = zlib.compress(entry.content, self.compress_level)
+        size = len(headers) + len(content)
+
+        def store(connection):
+            delta = size - self._stored_size(connection, key)
+            connection.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, entry.etag, entry.last_modified, headers, content, size,
+                 entry.stored_at, time.time()))
+            total = self._add_size(connection, delta)
+
+            if self.max_bytes is not None and total > self.max_bytes:
+                self._evict(connection, total - self.max_bytes)
+
+        self._transaction(store)
+
+    def _transaction(self, operation):
+        """Run operation(connection) in a write transaction.
+
+        Args:
+            operation: Callable receiving the SQLite connection.
+
+        Returns:
+            The result of operation.
+
+        """
+        with self._lock:
+            self._connection.execute('BEGIN IMMEDIATE')
+
+            try:
+                result = operation(self._connection)
+            except BaseException:
+                self._connection.execute('ROLLBACK')
+                raise
+
+            self._connection.execute('COMMIT')
+
+        return result
+
+    def _stored_size(self, connection, key):
+        """Return the size of the entry stored for key, 0 if none."""
+        row = connection.execute(
+            'SELECT size FROM responses WHERE key = ?', (key,)).fetchone()
+
+        return 0 if row is None else row[0]
+
+    def _add_size(self, connection, delta):
+        """Add delta to the stored bytes total and return the new total."""
+        connection.execute(
+            "UPDATE meta SET value = value + ? WHERE key = 'size'", (delta,))
+
+        return connection.execute(
+            "SELECT value FROM meta WHERE key = 'size'").fetchone()[0]
+
+    def _evict(self, connection, excess):
+        """Delete the least recently used responses totaling excess bytes."""
+        keys = []
+        rows = connection.execute(
+            'SELECT key, size FROM responses ORDER BY accessed_at')
+        evicted = 0
+
+        for key, size in rows:
+            if evicted >= excess:
+                break
+
+            keys.append((key,))
+            evicted += size
+
+        connection.executemany('DELETE FROM responses WHERE key = ?', keys)
+        self._add_size(connection, -evicted)
+
+    def delete(self, key):
+        """Remove the entry stored for key, if any."""
+        def remove(connection):
+            size = self._stored_size(connection, key)
+            connection.execute('DELETE FROM responses WHERE key = ?', (key,))
+            self._add_size(connection, -size)
+
+        self._transaction(remove)
+
+    def clear(self):
+        """Remove all entries."""
+        def remove_all(connection):
+            connection.execute('DELETE FROM responses')
+            connection.execute("UPDATE meta SET value = 0 WHERE key = 'size'")
+
+        self._transaction(remove_all)
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute(
+                'SELECT COUNT(*) FROM responses').fetchone()[0]
+
+
+class RequestMemo:
+    """In-process LRU memoization of responses with request coalescing.
+
+    Successful responses are reused for ttl seconds. Identical requests
+    made while another one is in flight wait for it and share its response
+    (or its exception) instead of going to the network.
+
+    Args:
+        max_entries: Maximum number of memoized responses.
+        ttl: Seconds a response is reused.
+    """
+
+    def __init__(self, max_entries=1024, ttl=60):
+        """Constructor."""
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._entries = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def call(self, key, request):
+        """Return the memoized response of key or perform the request.
+
+        Args:
+            key: The request cache key. See make_cache_key.
+            request: Callable that performs the request.
+
+        Returns:
+            The HTTP response.
+
+        """
+        with self._lock:
+            response = self._lookup(key)
+
+            if response is not None:
+                return response
+
+            future = self._in_flight.get(key)
+            leader = future is None
+
+            if leader:
+                future = Future()
+                self._in_flight[key] = future
+
+        if not leader:
+            return future.result()
+
+        try:
+            response = request()
+        except BaseException as error:
+            self._finish(key)
+            future.set_exception(error)
+            raise
+
+        self._finish(key, response)
+        future.set_result(response)
+
+        return response
+
+    async def acall(self, key, request):
+        """Asynchronous version of call, where request returns a coroutine."""
+        import asyncio
+
+        with self._lock:
+            response = self._lookup(key)
+
+            if response is not None:
+                return response
+
+            future = self._in_flight.get(key)
+            leader = future is None
+
+            if leader:
+                future = asyncio.get_running_loop().create_future()
+                self._in_flight[key] = future
+
+        if not leader:
+            return await asyncio.shield(future)
+
+        try:
+            response = await request()
+        except BaseException as error:
+            self._finish(key)
+            future.set_exception(error)
+            # Mark the exception as retrieved, there may be no followers
+            future.exception()
+            raise
+
+        self._finish(key, response)
+        future.set_result(response)
+
+        return response
+
+    def _lookup(self, key):
+        """Return a fresh memoized response and count hits and misses.
+
+        Must be called holding the lock.
+        """
+        entry = self._entries.get(key)
+
+        if entry is not None and time.time() - entry[0] < self.ttl:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        if key in self._in_flight:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+
+        return None
+
+    def _finish(self, key, response=None):
+        """Memoize a successful response and release the in-flight key."""
+        with self._lock:
+            self._in_flight.pop(key, None)
+
+            if response is None or response.status_code != 200:
+                return
+
+            self._entries[key] = (time.time(), response)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        """Return the hit, miss and coalesced request counters.
+
+        Returns:
+            dict: The counters and the number of memoized responses.
+
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'coalesced': self.coalesced,
+                    'entries': len(self._entries)}
+
+    def clear(self):
+        """Forget all memoized responses."""
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,352 @@
+# coding: utf-8
+"""Module with an incremental poller of user, organization and repository events."""
+
+import heapq
+import threading
+import time
+import requests
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from .exceptions import (ApiError, ApiRateLimitError,
+                         RepositoryNameNotFoundError, UserNotFoundError)
+
+# Interval used until GitHub sends an X-Poll-Interval header
+DEFAULT_POLL_INTERVAL = 60
+
+# Longest delay before polling again an endpoint that keeps failing
+MAX_BACKOFF = 900
+
+# Errors after which an endpoint is polled again later
+TRANSIENT_ERRORS = (ApiError, ApiRateLimitError, requests.RequestException)
+
+
+class Cursor:
+    """Polling state of a watched events endpoint."""
+
+    __slots__ = ('path', 'etag', 'last_id', 'interval', 'due', 'failures')
+
+    def __init__(self, path, etag=None, last_id=None, interval=DEFAULT_POLL_INTERVAL):
+        """Constructor."""
+        self.path = path
+        self.etag = etag
+        self.last_id = last_id
+        self.interval = interval
+        self.due = 0.0
+        self.failures = 0
+
+
+class EventPoller:
+    """Watch the events of many users, organizations and repositories.
+
+    Each watched endpoint keeps a cursor with its last seen event ID and
+    ETag. Polls are conditional requests, so an endpoint without new events
+    is answered with 304 Not Modified, which does not count against the
+    rate limit, and only the events newer than the cursor are yielded. Each
+    endpoint is polled again after the X-Poll-Interval seconds sent by
+    GitHub, from a single scheduler loop:
+
+        poller = EventPoller(GithubApi('YOUR_ACCESS_TOKEN'))
+        poller.watch_user('marcosvbras')
+        poller.watch_repository('marcosvbras', 'githon')
+
+        for path, event in poller.run():
+            print(path, event['type'])
+
+    Args:
+        api: A GithubApi, RepositoryApi or other BaseRequest object, whose
+            session, token pool, rate limit, retry and hooks are used.
+        access_token: GitHub OAuth2 access token.
+        max_workers: Maximum number of concurrent polls.
+        backfill: Yield the events already listed at the first poll of an
+            endpoint. Otherwise only the events created after it are.
+        checkpoint: Optional dict returned by checkpoint(), to resume
+            polling where a previous poller stopped.
+    """
+
+    def __init__(self, api, access_token=None, max_workers=4, backfill=False, checkpoint=None):
+        """Constructor."""
+        self.api = api
+        self.access_token = access_token
+        self.max_workers = max_workers
+        self.backfill = backfill
+        self.failed = {}
+        self.errors = {}
+        self._cursors = {}
+        self._heap = []
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+        for path, state in (checkpoint or {}).items():
+            self.watch(path, state.get('etag'), state.get('last_id'))
+
+    def __len__(self):
+        return len(self._cursors)
+
+    def watch(self, path, etag=None, last_id=None):
+        """Start watching an events endpoint.
+
+        Args:
+            path: The API path of the events owner, such as
+                'users/marcosvbras', 'orgs/github' or
+                'repos/marcosvbras/githon'.
+            etag: ETag of the last poll, when resuming.
+            last_id: ID of the last seen event, when resuming.
+        """
+        with self._lock:
+            if path in self._cursors:
+                return
+
+            cursor = self._cursors[path] = Cursor(path, etag, last_id)
+            self._schedule(cursor, time.time())
+
+    def watch_user(self, username):
+        """Start watching the public events of an user."""
+        self.watch('users/{}'.format(username))
+
+    def watch_organization(self, organization):
+        """Start watching the public events of an organization."""
+        self.watch('orgs/{}'.format(organization))
+
+    def watch_repository(self, username, repository_name):
+        """Start watching the events of a repository."""
+        self.watch('repos/{0}/{1}'.format(username, repository_name))
+
+    def unwatch(self, path):
+        """Stop watching an events endpoint. See watch."""
+        with self._lock:
+            self._cursors.pop(path, None)
+
+    def checkpoint(self):
+        """Return the cursors of the watched endpoints.
+
+        Returns:
+            dict: The etag and last_id by path, which can be saved as JSON
+                and given to a new poller.
+
+        """
+        with self._lock:
+            return {path: {'etag': cursor.etag, 'last_id': cursor.last_id}
+                    for path, cursor in self._cursors.items()}
+
+    def poll(self, path):
+        """Request the new events of a watched endpoint once.
+
+        Args:
+            path: A watched path. See watch.
+
+        Returns:
+            list: The new events, oldest first.
+
+        Raises:
+            UserNotFoundError: The user or organization does not exist.
+            RepositoryNameNotFoundError: The repository does not exist.
+
+        """
+        cursor = self._cursors[path]
+        url = '{0}/{1}/events'.format(self.api.ROOT_API_URL, path)
+        access_token = self.api.get_token(self.access_token)
+        headers = {'If-None-Match': cursor.etag} if cursor.etag else {}
+        response = self.api._get(
+            url, access_token, headers=headers, params={'per_page': 100})
+        self._check_status_code(response, path, access_token)
+        interval = response.headers.get('X-Poll-Interval', '')
+
+        if interval.isdigit():
+            cursor.interval = int(interval)
+
+        if response.status_code == 304:
+            return []
+
+        first_poll = cursor.last_id is None
+        etag = response.headers.get('ETag')
+        events = []
+
+        while True:
+            page = self.api._json(response)
+            new = [event for event in page
+                   if first_poll or int(event['id']) > int(cursor.last_id)]
+            events.extend(new)
+            url = response.links.get('next', {}).get('url')
+
+            # Events are listed newest first, so older pages only matter
+            # while every event of the page is new
+            if not url or len(new) < len(page) or (
+                    first_poll and not self.backfill):
+                break
+
+            response = self.api._get(url, access_token)
+            self._check_status_code(response, path, access_token)
+
+        cursor.etag = etag
+
+        if events:
+            cursor.last_id = max(
+                events, key=lambda event: int(event['id']))['id']
+
+        if first_poll and not self.backfill:
+            return []
+
+        events.reverse()
+
+        return events
+
+    def run(self, duration=None):
+        """Poll the watched endpoints when they are due, until stopped.
+
+        Endpoints that no longer exist are unwatched and their exception
+        is kept in the failed dict. After server, rate limit and connection
+        errors, the endpoint is polled again with an exponential backoff,
+        or after X-RateLimit-Reset, and its last error is kept in the
+        errors dict until a poll succeeds.
+
+        Args:
+            duration: Seconds to poll for. None polls until stop() is called.
+
+        Yields:
+            tuple: The path and each new event, oldest first by endpoint.
+
+        """
+        self._stopped.clear()
+        deadline = None if duration is None else time.time() + duration
+        pending = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while not self._stopped.is_set():
+                now = time.time()
+
+                if deadline is not None and now >= deadline:
+                    break
+
+                for path in self._due(now, self.max_workers * 2 - len(pending)):
+                    pending[executor.submit(self.poll, path)] = path
+
+                if pending:
+                    timeout = self._next_due(deadline) if len(
+                        pending) < self.max_workers * 2 else None
+                    done, _ = wait(pending, timeout=timeout,
+                                   return_when=FIRST_COMPLETED)
+
+                    for future in done:
+                        path = pending.pop(future)
+                        yield from self._poll_result(path, future)
+                else:
+                    self._stopped.wait(self._next_due(deadline))
+
+            for future in pending:
+                future.cancel()
+
+    def stop(self):
+        """Make run() return after the polls in progress."""
+        self._stopped.set()
+
+    def _poll_result(self, path, future):
+        """Yield the events of a finished poll and schedule the next one."""
+        try:
+            events = future.result()
+        except (UserNotFoundError, RepositoryNameNotFoundError) as error:
+            self.unwatch(path)
+            self.failed[path] = error
+            return
+        except TRANSIENT_ERRORS as error:
+            self.errors[path] = error
+            events = None
+        else:
+            self.errors.pop(path, None)
+
+        with self._lock:
+            cursor = self._cursors.get(path)
+
+            if cursor is not None:
+                self._schedule(cursor, time.time() + self._delay(
+                    cursor, self.errors.get(path)))
+
+        if events is None:
+            return
+
+        for event in events:
+            yield path, event
+
+    def _delay(self, cursor, error):
+        """Return the seconds until the next poll of a cursor.
+
+        Args:
+            cursor: The polled Cursor.
+            error: The transient error of the poll, or None if it succeeded.
+
+        Returns:
+            float: The poll interval, a backoff after errors or the time
+                until the rate limit reset.
+
+        """
+        if error is None:
+            cursor.failures = 0
+            return cursor.interval
+
+        cursor.failures += 1
+        reset = getattr(error, 'kwargs', {}).get('X-RateLimit-Reset')
+
+        if isinstance(error, ApiRateLimitError) and reset:
+            return max(int(reset) - time.time() + 1, cursor.interval)
+
+        return min(cursor.interval * 2 ** (cursor.failures - 1), MAX_BACKOFF)
+
+    def _schedule(self, cursor, due):
+        """Push the next poll of a cursor into the scheduler heap."""
+        cursor.due = due
+        heapq.heappush(self._heap, (due, cursor.path))
+
+    def _due(self, now, count):
+        """Pop up to count paths whose poll is due.
+
+        Args:
+            now: The current time.
+            count: Maximum number of paths.
+
+        Returns:
+            list: The due paths.
+
+        """
+        paths = []
+
+        with self._lock:
+            while self._heap and len(paths) < count and self._heap[0][0] <= now:
+                due, path = heapq.heappop(self._heap)
+                cursor = self._cursors.get(path)
+
+                # Skip unwatched paths and entries superseded by a reschedule
+                if cursor is not None and cursor.due == due:
+                    cursor.due = None
+                    paths.append(path)
+
+        return paths
+
+    def _next_due(self, deadline):
+        """Return the seconds until the next due poll or the deadline."""
+        with self._lock:
+            due = self._heap[0][0] if self._heap else None
+
+        if deadline is not None:
+            due = deadline if due is None else min(due, deadline)
+
+        if due is None:
+            return 1.0
+
+        return max(due - time.time(), 0.0)
+
+    def _check_status_code(self, response, path, access_token):
+        """Check status codes and raise Exceptions.
+
+        Args:
+            response: HTTP Response object.
+            path: The polled path.
+            access_token: GitHub OAuth2 access token.
+        """
+        if response.status_code == 404:
+            parts = path.split('/')
+
+            if parts[0] == 'repos':
+                raise RepositoryNameNotFoundError(
+                    {'repository_id': parts[2], 'username': parts[1]})
+
+            raise UserNotFoundError({'user': parts[1]})
+
+        self.api._check_common_status_code(response, access_token)
@@ -79,3 +79,21 @@ class InvalidDateTimeFormat(BaseError):
         """Return error description."""
         return "The datetime '{}' doesn't have a valid format to convertion.".format(
             self.kwargs.get('datetime', None))
+
+
+class GraphQLError(BaseError):
+    """Exception raised by GraphQL queries answered with errors only."""
+
+    def __str__(self):
+        """Return error description."""
+        return "GitHub GraphQL query failed: {}".format('; '.join(
+            error.get('message', '') for error in self.kwargs.get('errors', ())))
+
+
+class TruncatedTreeError(BaseError):
+    """Exception raised by downloads of trees that GitHub did not fully list."""
+
+    def __str__(self):
+        """Return error description."""
+        return "The tree '{}' is truncated, GitHub did not list all of its files. Download the tarball of the repository instead.".format(
+            self.kwargs.get('sha', None))
@@ -0,0 +1,155 @@
+# coding: utf-8
+"""Module that streams scraped records to NDJSON files."""
+
+import gzip
+import io
+import json
+from .records import Record
+
+
+def encode_record(value):
+    """Return a JSON serializable form of githon.records objects.
+
+    Args:
+        value: An object that json cannot serialize.
+
+    Returns:
+        dict: The record attributes.
+
+    Raises:
+        TypeError: The object is not a Record.
+
+    """
+    if isinstance(value, Record):
+        return value.to_dict()
+
+    raise TypeError('Object of type {} is not JSON serializable'.format(
+        type(value).__name__))
+
+
+class NDJSONWriter:
+    """Write records as newline-delimited JSON in fixed-size batches.
+
+    Only one batch of encoded records is kept in memory, so iterators of
+    any size (e.g. GithubApi.iter_followers_by_id) can be exported with
+    constant memory.
+
+    Args:
+        sink: A file path or a file-like object opened for writing.
+        compress: gzip the output. Defaults to True for paths ending with
+            '.gz' and False otherwise. Compressed file-like sinks must be
+            opened in binary mode.
+        batch_size: Number of records written at once.
+    """
+
+    def __init__(self, sink, compress=None, batch_size=1000):
+        """Constructor."""
+        self.batch_size = batch_size
+        self.count = 0
+        self._batch = []
+        self._owned = isinstance(sink, str)
+
+        if compress is None:
+            compress = self._owned and sink.endswith('.gz')
+
+        if self._owned:
+            sink = open(sink, 'wb')
+
+        self._sink = sink
+        self._file = sink
+        self._gzip = None
+
+        if compress:
+            self._gzip = gzip.GzipFile(fileobj=sink, mode='wb')
+            self._file = self._gzip
+
+        self._text = isinstance(self._file, io.TextIOBase)
+
+    def write(self, record):
+        """Add a record to the current batch, writing it when full.
+
+        Args:
+            record: A JSON serializable object or a githon.records Record.
+        """
+        self._batch.append(json.dumps(
+            record, ensure_ascii=False, separators=(',', ':'),
+            default=encode_record))
+
+        if len(self._batch) >= self.batch_size:
+            self.flush()
+
+    def write_many(self, records):
+        """Write all records of an iterable.
+
+        Args:
+            records: Iterable of JSON serializable objects.
+
+        Returns:
+            int: The number of written records.
+
+        """
+        count = self.count + len(self._batch)
+
+        for record in records:
+            self.write(record)
+
+        return self.count + len(self._batch) - count
+
+    def flush(self):
+        """Write the current batch to the sink."""
+        if not self._batch:
+            return
+
+        data = '\n'.join(self._batch) + '\n'
+        self._file.write(data if self._text else data.encode('utf-8'))
+        self.count += len(self._batch)
+        self._batch = []
+
+    def close(self):
+        """Flush the last batch and close the compressor and owned files."""
+        self.flush()
+
+        if self._gzip is not None:
+            self._gzip.close()
+
+        if self._owned:
+            self._sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def export_ndjson(records, sink, compress=None, batch_size=1000):
+    """Stream records to a NDJSON sink.
+
+    Args:
+        records: Iterable of JSON serializable objects, such as the
+            iter_* methods of GithubApi and RepositoryApi.
+        sink: A file path or a file-like object opened for writing.
+        compress: gzip the output. See NDJSONWriter.
+        batch_size: Number of records written at once.
+
+    Returns:
+        int: The number of exported records.
+
+    """
+    with NDJSONWriter(sink, compress, batch_size) as writer:
+        writer.write_many(records)
+
+    return writer.count
+
+
+async def aexport_ndjson(records, sink, compress=None, batch_size=1000):
+    """Stream the records of an asynchronous iterator to a NDJSON sink.
+
+    Asynchronous version of export_ndjson, for the iter_* methods of
+    AsyncGithubApi and AsyncRepositoryApi.
+    """
+    with NDJSONWriter(sink, compress, batch_size) as writer:
+        async for record in records:
+            writer.write(record)
+
+    return writer.count
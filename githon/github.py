@@ -1,24 +1,27 @@
 # coding: utf-8
 """Module that contains all GitHub data scraping logic."""
 import requests
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from .utils import BaseRequest
-from .exceptions import (InvalidTokenError, UserNotFoundError, ApiError,
-                         InvalidQueryError, ApiRateLimitError)
+from .records import project_list
+from .exceptions import UserNotFoundError, InvalidQueryError
 
 
 class GithubApi(BaseRequest):
     """Class that controls all Github API v3 requests."""
 
-    def __init__(self, default_access_token=None):
+    def __init__(self, default_access_token=None, **kwargs):
         """Constructor.
 
         Args:
             access_token: The default GitHub access_token.
+            kwargs: Transport options, such as session or cache. See
+                BaseRequest.__init__.
 
         If you don't provide an access_token, your number of requests will be limited to 60 requests per hour, acording with GitHub REST API v3.
         See more in https://developer.github.com/v3/#rate-limiting
         """
-        self.default_access_token = default_access_token
+        super().__init__(default_access_token, **kwargs)
 
     def user_by_id(self, user_id, access_token=None, last_modified_date=None):
         """Get user by User ID.
@@ -56,6 +59,74 @@ class GithubApi(BaseRequest):
         return self._complete_user_request(
             "users", username, access_token, last_modified_date)
 
+    def users_by_ids(self, user_ids, access_token=None, max_workers=8):
+        """Get many users by User ID concurrently.
+
+        Args:
+            user_ids: Iterable of Github profile IDs. Duplicates are
+                requested only once.
+            access_token: GitHub OAuth2 access token.
+            max_workers: Maximum number of concurrent requests.
+
+        Returns:
+            tuple: A dict of profile data by User ID and a dict of
+                UserNotFoundError by User ID.
+
+        """
+        return self._collect_user_requests(
+            self.iter_users_by_ids(user_ids, access_token, max_workers))
+
+    def users_by_usernames(self, usernames, access_token=None, max_workers=8):
+        """Get many users by username concurrently.
+
+        Args:
+            usernames: Iterable of Github profile usernames. Duplicates are
+                requested only once.
+            access_token: GitHub OAuth2 access token.
+            max_workers: Maximum number of concurrent requests.
+
+        Returns:
+            tuple: A dict of profile data by username and a dict of
+                UserNotFoundError by username.
+
+        """
+        return self._collect_user_requests(
+            self.iter_users_by_usernames(usernames, access_token, max_workers))
+
+    def iter_users_by_ids(self, user_ids, access_token=None, max_workers=8):
+        """Get many users by User ID concurrently, as they are completed.
+
+        Args:
+            user_ids: Iterable of Github profile IDs. Duplicates are
+                requested only once.
+            access_token: GitHub OAuth2 access token.
+            max_workers: Maximum number of concurrent requests.
+
+        Yields:
+            tuple: The User ID and its profile data, or the
+                UserNotFoundError if it does not exist.
+
+        """
+        return self._iterate_user_requests(
+            "user", user_ids, access_token, max_workers)
+
+    def iter_users_by_usernames(self, usernames, access_token=None, max_workers=8):
+        """Get many users by username concurrently, as they are completed.
+
+        Args:
+            usernames: Iterable of Github profile usernames. Duplicates are
+                requested only once.
+            access_token: GitHub OAuth2 access token.
+            max_workers: Maximum number of concurrent requests.
+
+        Yields:
+            tuple: The username and its profile data, or the
+                UserNotFoundError if it does not exist.
+
+        """
+        return self._iterate_user_requests(
+            "users", usernames, access_token, max_workers)
+
     def user_emails(self, access_token):
         """Retrieve a list of emails from a given access_token.
 
@@ -66,188 +137,407 @@ class GithubApi(BaseRequest):
             dict: The profile emails data.
 
         """
-        url = "{0}/user/emails?access_token={1}"
-        response = requests.get(url.format(self.ROOT_API_URL, access_token))
-        remaining = int(response.headers['X-RateLimit-Remaining'])
-
-        if response.status_code == requests.codes.forbidden and remaining == 0:
-            raise ApiRateLimitError(
-                {'X-RateLimit-Remaining': remaining,
-                 'X-RateLimit-Limit': response.headers['X-RateLimit-Limit']})
-        elif response.status_code == requests.codes.unauthorized:
-            raise InvalidTokenError({'access_token': access_token})
-        elif response.status_code >= 500 and response.status_code <= 509:
-            raise ApiError()
+        url = "{0}/user/emails"
+        response = self._get(url.format(self.ROOT_API_URL), access_token)
+        self._check_common_status_code(response, access_token)
 
-        return response.json()
+        return self._json(response)
 
-    def organizations_by_id(self, user_id, access_token=None):
+    def organizations_by_id(self, user_id, access_token=None, fields=None):
         """Return organizations from a given User ID.
 
         Args:
             user_id: Github User ID.
             access_token: GitHub OAuth2 access token.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
 
         Returns:
             dict: A dictionary with summary user's organizations data.
 
         """
         return self._complete_resource_request(
-            "user", user_id, "orgs", access_token)
+            "user", user_id, "orgs", access_token, fields)
 
-    def organizations_by_username(self, username, access_token=None):
+    def organizations_by_username(self, username, access_token=None, fields=None):
         """Return organizations from a given username.
 
         Args:
             username: Github username.
             access_token: GitHub OAuth2 access token.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
 
         Returns:
             dict: A dictionary with summary user's organizations data.
 
         """
         return self._complete_resource_request(
-            "users", username, "orgs", access_token)
+            "users", username, "orgs", access_token, fields)
 
-    def events_by_id(self, user_id, access_token=None):
+    def events_by_id(self, user_id, access_token=None, fields=None):
         """Return events from a given User ID.
 
         Args:
             user_id: Github User ID.
             access_token: GitHub OAuth2 access token.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
 
         Returns:
             dict: A dictionary with summary user's events data.
 
         """
         return self._complete_resource_request(
-            "user", user_id, "events", access_token)
+            "user", user_id, "events", access_token, fields)
 
-    def events_by_username(self, username, access_token=None):
+    def events_by_username(self, username, access_token=None, fields=None):
         """Return events from a given username.
 
         Args:
             username: Github username.
             access_token: GitHub OAuth2 access token.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
 
         Returns:
             dict: A dictionary with summary user's events data.
 
         """
         return self._complete_resource_request(
-            "users", username, "events", access_token)
+            "users", username, "events", access_token, fields)
 
-    def followers_by_id(self, user_id, access_token=None):
+    def followers_by_id(self, user_id, access_token=None, fields=None):
         """Return followers from a given User ID.
 
         Args:
             user_id: Github User ID.
             access_token: GitHub OAuth2 access token.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
 
         Returns:
             dict: A dictionary with summary user's followers data.
 
         """
         return self._complete_resource_request(
-            "user", user_id, "followers", access_token)
+            "user", user_id, "followers", access_token, fields)
 
-    def followers_by_username(self, username, access_token=None):
+    def followers_by_username(self, username, access_token=None, fields=None):
         """Return followers from a given username.
 
         Args:
             username: Github username.
             access_token: GitHub OAuth2 access token.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
 
         Returns:
             dict: A dictionary with summary user's followers data.
 
         """
         return self._complete_resource_request(
-            "users", username, "followers", access_token)
+            "users", username, "followers", access_token, fields)
 
-    def following_by_id(self, user_id, access_token=None):
+    def following_by_id(self, user_id, access_token=None, fields=None):
         """Return following list from a given User ID.
 
         Args:
             user_id: Github User ID.
             access_token: GitHub OAuth2 access token.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
 
         Returns:
             dict: A dictionary with summary user's following data.
 
         """
         return self._complete_resource_request(
-            "user", user_id, "following", access_token)
+            "user", user_id, "following", access_token, fields)
 
-    def following_by_username(self, username, access_token=None):
+    def following_by_username(self, username, access_token=None, fields=None):
         """Return following list from a given username.
 
         Args:
             user_id: Github username.
             access_token: GitHub OAuth2 access token.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
 
         Returns:
             dict: A dictionary with summary user's following data.
 
         """
         return self._complete_resource_request(
-            "users", username, "following", access_token)
+            "users", username, "following", access_token, fields)
 
-    def gists_by_id(self, user_id, access_token=None):
+    def gists_by_id(self, user_id, access_token=None, fields=None):
         """Return gists from a given User ID.
 
         Args:
             user_id: Github User ID.
             access_token: GitHub OAuth2 access token.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
 
         Returns:
             dict: A dictionary with summary user's gist data.
 
         """
         return self._complete_resource_request(
-            "user", user_id, "gists", access_token)
+            "user", user_id, "gists", access_token, fields)
 
-    def gists_by_username(self, username, access_token=None):
+    def gists_by_username(self, username, access_token=None, fields=None):
         """Return gists from a given username.
 
         Args:
             username: Github username.
             access_token: GitHub OAuth2 access token.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
 
         Returns:
             dict: A dictionary with summary user's gist data.
 
         """
         return self._complete_resource_request(
-            "users", username, "gists", access_token)
+            "users", username, "gists", access_token, fields)
 
-    def repositories_by_id(self, user_id, access_token=None):
+    def repositories_by_id(self, user_id, access_token=None, fields=None):
         """Return repositories from a given User ID.
 
         Args:
             user_id: Github User ID.
             access_token: GitHub OAuth2 access token.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
 
         Returns:
             dict: A dictionary with summary user's repositories data.
 
         """
         return self._complete_resource_request(
-            "user", user_id, "repos", access_token)
+            "user", user_id, "repos", access_token, fields)
 
-    def repositories_by_username(self, username, access_token=None):
+    def repositories_by_username(self, username, access_token=None, fields=None):
         """Return repositories from a given username.
 
         Args:
             username: Github username.
             access_token: GitHub OAuth2 access token.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
 
         Returns:
             dict: A dictionary with summary user's repositories data.
 
         """
         return self._complete_resource_request(
-            "users", username, "repos", access_token)
+            "users", username, "repos", access_token, fields)
+
+    def iter_organizations_by_id(self, user_id, access_token=None, limit=None, fields=None):
+        """Lazily iterate over all organizations from a given User ID.
+
+        Args:
+            user_id: Github User ID.
+            access_token: GitHub OAuth2 access token.
+            limit: Maximum number of items to be returned. None means all.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
+
+        Yields:
+            dict: A summary organization data.
+
+        """
+        return self._iterate_resource_request(
+            "user", user_id, "orgs", access_token, limit, fields)
+
+    def iter_organizations_by_username(self, username, access_token=None, limit=None, fields=None):
+        """Lazily iterate over all organizations from a given username.
+
+        Args:
+            username: Github username.
+            access_token: GitHub OAuth2 access token.
+            limit: Maximum number of items to be returned. None means all.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
+
+        Yields:
+            dict: A summary organization data.
+
+        """
+        return self._iterate_resource_request(
+            "users", username, "orgs", access_token, limit, fields)
+
+    def iter_events_by_id(self, user_id, access_token=None, limit=None, fields=None):
+        """Lazily iterate over all events from a given User ID.
+
+        Args:
+            user_id: Github User ID.
+            access_token: GitHub OAuth2 access token.
+            limit: Maximum number of items to be returned. None means all.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
+
+        Yields:
+            dict: A summary event data.
+
+        """
+        return self._iterate_resource_request(
+            "user", user_id, "events", access_token, limit, fields)
+
+    def iter_events_by_username(self, username, access_token=None, limit=None, fields=None):
+        """Lazily iterate over all events from a given username.
+
+        Args:
+            username: Github username.
+            access_token: GitHub OAuth2 access token.
+            limit: Maximum number of items to be returned. None means all.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
+
+        Yields:
+            dict: A summary event data.
+
+        """
+        return self._iterate_resource_request(
+            "users", username, "events", access_token, limit, fields)
+
+    def iter_followers_by_id(self, user_id, access_token=None, limit=None, fields=None):
+        """Lazily iterate over all followers from a given User ID.
+
+        Args:
+            user_id: Github User ID.
+            access_token: GitHub OAuth2 access token.
+            limit: Maximum number of items to be returned. None means all.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
+
+        Yields:
+            dict: A summary follower data.
+
+        """
+        return self._iterate_resource_request(
+            "user", user_id, "followers", access_token, limit, fields)
+
+    def iter_followers_by_username(self, username, access_token=None, limit=None, fields=None):
+        """Lazily iterate over all followers from a given username.
+
+        Args:
+            username: Github username.
+            access_token: GitHub OAuth2 access token.
+            limit: Maximum number of items to be returned. None means all.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
+
+        Yields:
+            dict: A summary follower data.
+
+        """
+        return self._iterate_resource_request(
+            "users", username, "followers", access_token, limit, fields)
+
+    def iter_following_by_id(self, user_id, access_token=None, limit=None, fields=None):
+        """Lazily iterate over all following list from a given User ID.
+
+        Args:
+            user_id: Github User ID.
+            access_token: GitHub OAuth2 access token.
+            limit: Maximum number of items to be returned. None means all.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
+
+        Yields:
+            dict: A summary followed user data.
+
+        """
+        return self._iterate_resource_request(
+            "user", user_id, "following", access_token, limit, fields)
+
+    def iter_following_by_username(self, username, access_token=None, limit=None, fields=None):
+        """Lazily iterate over all following list from a given username.
+
+        Args:
+            username: Github username.
+            access_token: GitHub OAuth2 access token.
+            limit: Maximum number of items to be returned. None means all.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
+
+        Yields:
+            dict: A summary followed user data.
+
+        """
+        return self._iterate_resource_request(
+            "users", username, "following", access_token, limit, fields)
+
+    def iter_gists_by_id(self, user_id, access_token=None, limit=None, fields=None):
+        """Lazily iterate over all gists from a given User ID.
+
+        Args:
+            user_id: Github User ID.
+            access_token: GitHub OAuth2 access token.
+            limit: Maximum number of items to be returned. None means all.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
+
+        Yields:
+            dict: A summary gist data.
+
+        """
+        return self._iterate_resource_request(
+            "user", user_id, "gists", access_token, limit, fields)
+
+    def iter_gists_by_username(self, username, access_token=None, limit=None, fields=None):
+        """Lazily iterate over all gists from a given username.
+
+        Args:
+            username: Github username.
+            access_token: GitHub OAuth2 access token.
+            limit: Maximum number of items to be returned. None means all.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
+
+        Yields:
+            dict: A summary gist data.
+
+        """
+        return self._iterate_resource_request(
+            "users", username, "gists", access_token, limit, fields)
+
+    def iter_repositories_by_id(self, user_id, access_token=None, limit=None, fields=None):
+        """Lazily iterate over all repositories from a given User ID.
+
+        Args:
+            user_id: Github User ID.
+            access_token: GitHub OAuth2 access token.
+            limit: Maximum number of items to be returned. None means all.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
+
+        Yields:
+            dict: A summary repository data.
+
+        """
+        return self._iterate_resource_request(
+            "user", user_id, "repos", access_token, limit, fields)
+
+    def iter_repositories_by_username(self, username, access_token=None, limit=None, fields=None):
+        """Lazily iterate over all repositories from a given username.
+
+        Args:
+            username: Github username.
+            access_token: GitHub OAuth2 access token.
+            limit: Maximum number of items to be returned. None means all.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
+
+        Yields:
+            dict: A summary repository data.
+
+        """
+        return self._iterate_resource_request(
+            "users", username, "repos", access_token, limit, fields)
 
     def _complete_user_request(self, kind, user, access_token, last_modified_date):
         """Complements an user data request from a given User.
@@ -265,30 +555,104 @@ class GithubApi(BaseRequest):
             dict: A dictionary with Github profile data.
 
         """
-        url = "{0}/{1}/{2}{3}"
+        url = "{0}/{1}/{2}"
         headers = None
         data = {}
         access_token = self.get_token(access_token)
-        token_arg = ''
-
-        if access_token != '':
-            token_arg = "?access_token={}".format(access_token)
 
         if last_modified_date:
             headers = self.get_last_modified_header(last_modified_date)
 
-        response = requests.get(
-            url.format(self.ROOT_API_URL, kind, user, token_arg),
+        response = self._get(
+            url.format(self.ROOT_API_URL, kind, user), access_token,
             headers=headers)
 
         self._check_status_code(response, user, access_token)
 
-        if response.text != '':
-            data = response.json()
+        if response.content:
+            data = self._json(response)
 
         return data
 
-    def _complete_resource_request(self, kind, user, complement, access_token):
+    def _iterate_user_requests(self, kind, users, access_token, max_workers):
+        """Request many users on a bounded pool of worker threads.
+
+        Only a few requests per worker are submitted at a time, so huge
+        inputs are consumed lazily.
+
+        Args:
+            kind: 'users' if usernames passed or 'user' if user ids passed.
+            users: Iterable of Github User IDs or Usernames.
+            access_token: GitHub OAuth2 access token.
+            max_workers: Maximum number of concurrent requests.
+
+        Yields:
+            tuple: The user and its profile data or UserNotFoundError.
+
+        """
+        seen = set()
+        pending = {}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for user in users:
+                if user in seen:
+                    continue
+
+                seen.add(user)
+                future = executor.submit(
+                    self._complete_user_request, kind, user, access_token,
+                    None)
+                pending[future] = user
+
+                if len(pending) >= max_workers * 2:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    yield from self._pop_user_results(pending, done)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                yield from self._pop_user_results(pending, done)
+
+    def _pop_user_results(self, pending, done):
+        """Yield the results of completed user requests.
+
+        Args:
+            pending: Dict of user by in-flight future.
+            done: The completed futures.
+
+        Yields:
+            tuple: The user and its profile data or UserNotFoundError.
+
+        """
+        for future in done:
+            user = pending.pop(future)
+
+            try:
+                yield user, future.result()
+            except UserNotFoundError as error:
+                yield user, error
+
+    def _collect_user_requests(self, results):
+        """Split bulk user results into found and not found users.
+
+        Args:
+            results: Iterable of (user, data or UserNotFoundError) tuples.
+
+        Returns:
+            tuple: A dict of profile data and a dict of UserNotFoundError.
+
+        """
+        users = {}
+        not_found = {}
+
+        for user, data in results:
+            if isinstance(data, UserNotFoundError):
+                not_found[user] = data
+            else:
+                users[user] = data
+
+        return users, not_found
+
+    def _complete_resource_request(self, kind, user, complement, access_token, fields=None):
         """Complements an user data request from a given User.
 
         Args:
@@ -296,24 +660,48 @@ class GithubApi(BaseRequest):
             user: Github User ID or Username
             complement: A resource to be requested.
             access_token: GitHub OAuth2 access token.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
 
         Returns:
             dict: A dictionary with requested data.
 
         """
-        url = "{0}/{1}/{2}/{3}{4}"
+        url = "{0}/{1}/{2}/{3}"
         access_token = self.get_token(access_token)
-        token_arg = ''
 
-        if access_token != '':
-            token_arg = "?access_token={}".format(access_token)
-
-        response = requests.get(url.format(
-            self.ROOT_API_URL, kind, user, complement, token_arg))
+        response = self._get(url.format(
+            self.ROOT_API_URL, kind, user, complement), access_token)
 
         self._check_status_code(response, user, access_token)
 
-        return response.json()
+        return project_list(self._json(response), fields)
+
+    def _iterate_resource_request(self, kind, user, complement, access_token, limit, fields=None):
+        """Lazily iterate over all pages of an user resource.
+
+        Args:
+            kind: 'users' if username passed or 'user' if user id passed.
+            user: Github User ID or Username
+            complement: A resource to be requested.
+            access_token: GitHub OAuth2 access token.
+            limit: Maximum number of items to be returned. None means all.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
+
+        Returns:
+            generator: Yields each item of the requested resource.
+
+        """
+        url = "{0}/{1}/{2}/{3}"
+        access_token = self.get_token(access_token)
+
+        return self._paginate(
+            url.format(self.ROOT_API_URL, kind, user, complement),
+            access_token,
+            lambda response: self._check_status_code(
+                response, user, access_token),
+            limit=limit, fields=fields)
 
     def _check_status_code(self, response, user, access_token):
         """Check status codes and raise Exceptions if necessary.
@@ -323,18 +711,10 @@ class GithubApi(BaseRequest):
             user: Github UID or Username.
             access_token: GitHub OAuth2 access token.
         """
-        remaining = int(response.headers['X-RateLimit-Remaining'])
-
         if response.status_code == requests.codes.not_found:
             raise UserNotFoundError({'user': user})
-        if response.status_code == requests.codes.forbidden and remaining == 0:
-            raise ApiRateLimitError(
-                {'X-RateLimit-Remaining': remaining,
-                 'X-RateLimit-Limit': response.headers['X-RateLimit-Limit']})
-        elif response.status_code == requests.codes.unauthorized:
-            raise InvalidTokenError({'access_token': access_token})
-        elif response.status_code >= 500 and response.status_code <= 509:
-            raise ApiError()
+
+        self._check_common_status_code(response, access_token)
 
     def search_users(self, parameters, access_token=None):
         """Retrieve users with a given query.
@@ -350,31 +730,25 @@ class GithubApi(BaseRequest):
         """
         # repos:>=1
         access_token = self.get_token(access_token)
-        token_arg = ''
+        url = "{0}/search/users?{1}"
 
-        if access_token != '':
-            token_arg = "&access_token={}".format(access_token)
+        response = self._get(
+            url.format(self.ROOT_API_URL, self.encode_parameters(parameters)),
+            access_token
+        )
 
-        url = "{0}/search/users?{1}{2}"
+        self._check_search_status_code(response, access_token)
 
-        response = requests.get(
-            url.format(
-                self.ROOT_API_URL, self.encode_parameters(parameters),
-                token_arg
-            )
-        )
+        return self._json(response)
 
-        remaining = int(response.headers['X-RateLimit-Remaining'])
+    def _check_search_status_code(self, response, access_token):
+        """Check status codes of a search request and raise Exceptions.
 
-        if response.status_code == requests.codes.forbidden and remaining == 0:
-            raise ApiRateLimitError(
-                {'X-RateLimit-Remaining': remaining,
-                 'X-RateLimit-Limit': response.headers['X-RateLimit-Limit']})
-        elif response.status_code == requests.codes.unauthorized:
-            raise InvalidTokenError({'access_token': access_token})
-        elif response.status_code == requests.codes.not_found:
-            raise InvalidQueryError()
-        elif response.status_code >= 500 and response.status_code <= 509:
-            raise ApiError()
+        Args:
+            response: HTTP Response object.
+            access_token: GitHub OAuth2 access token.
+        """
+        self._check_common_status_code(response, access_token)
 
-        return response.json()
+        if response.status_code == requests.codes.not_found:
+            raise InvalidQueryError()
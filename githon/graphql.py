@@ -0,0 +1,445 @@
+# coding: utf-8
+"""Module with a GraphQL API v4 backend that fetches many entities at once.
+
+Each request packs up to batch_size users or repositories as aliases of a
+single query:
+
+    query($l0: String!, $l1: String!) {
+      u0: user(login: $l0) { ...user }
+      u1: user(login: $l1) { ...user }
+    }
+
+and the results are mapped back into the dicts returned by the REST API
+methods, so 50 profiles cost a single request instead of 50 or more.
+"""
+
+from .exceptions import (GraphQLError, RepositoryNameNotFoundError,
+                         UserNotFoundError)
+from .utils import BaseRequest
+
+USER_FRAGMENT = '''
+fragment user on User {
+  login databaseId id avatarUrl url name company websiteUrl location email
+  isHireable bio isSiteAdmin createdAt updatedAt
+  publicRepositories: repositories(privacy: PUBLIC, ownerAffiliations: OWNER) {
+    totalCount
+  }
+  publicGists: gists(privacy: PUBLIC) { totalCount }
+  followers { totalCount }
+  following { totalCount }
+}
+'''
+
+REPOSITORY_FRAGMENT = '''
+fragment repository on Repository {
+  databaseId id name nameWithOwner isPrivate url description isFork
+  createdAt updatedAt pushedAt homepageUrl diskUsage forkCount isArchived
+  hasIssuesEnabled hasWikiEnabled mirrorUrl
+  owner {
+    __typename login avatarUrl url
+    ... on User { databaseId isSiteAdmin }
+    ... on Organization { databaseId }
+  }
+  primaryLanguage { name }
+  defaultBranchRef { name }
+  stargazers { totalCount }
+  watchers { totalCount }
+  openIssues: issues(states: OPEN) { totalCount }
+}
+'''
+
+# Optional connections requested with each user, by keyword argument
+USER_CONNECTIONS = {
+    'organizations': (
+        'organizationList: organizations(first: {first}) '
+        '{{ nodes {{ login databaseId id avatarUrl url description }} }}'),
+    'repositories': (
+        'repositoryList: repositories(first: {first}, privacy: PUBLIC, '
+        'ownerAffiliations: OWNER, orderBy: {{field: CREATED_AT, '
+        'direction: ASC}}) {{ nodes {{ ...repository }} }}'),
+    'followers': (
+        'followerList: followers(first: {first}) '
+        '{{ nodes {{ __typename login databaseId id avatarUrl url '
+        'isSiteAdmin }} }}'),
+}
+
+
+class GraphQLApi(BaseRequest):
+    """Fetch users and repositories in batches through GitHub GraphQL API v4.
+
+    The GraphQL API requires an access token. Every other BaseRequest
+    option (session, token_pool, rate_limit, retry, timeout, hooks) is
+    supported. Responses are never cached.
+
+    The dicts have the keys of the REST API dicts, except the *_url
+    hypermedia links of repositories other than url and html_url.
+
+    Args:
+        default_access_token: The default GitHub access_token.
+        batch_size: Number of entities per query. GitHub limits the cost
+            of each query, so keep it about 50.
+        kwargs: Other BaseRequest options.
+    """
+
+    def __init__(self, default_access_token=None, batch_size=50, **kwargs):
+        """Constructor."""
+        super().__init__(default_access_token, **kwargs)
+        self.batch_size = batch_size
+
+    def query(self, query, variables=None, access_token=None):
+        """Run a GraphQL query.
+
+        Args:
+            query: The GraphQL query document.
+            variables: Optional dict of query variables.
+            access_token: GitHub OAuth2 access token.
+
+        Returns:
+            dict: The query data.
+
+        Raises:
+            GraphQLError: The query has errors and no data.
+
+        """
+        data, _ = self._execute(query, variables, access_token)
+
+        return data
+
+    def users_by_usernames(self, usernames, access_token=None, organizations=False, repositories=False, followers=False, first=100):
+        """Get many users by username, batch_size users per request.
+
+        Args:
+            usernames: Iterable of Github profile usernames. Duplicates are
+                requested only once.
+            access_token: GitHub OAuth2 access token.
+            organizations: Add the 'organizations' list of each user, as
+                returned by GithubApi.organizations_by_username.
+            repositories: Add the 'repositories' list of each user, as
+                returned by GithubApi.repositories_by_username.
+            followers: Add the 'followers_list' list of each user, as
+                returned by GithubApi.followers_by_username ('followers'
+                is already the number of followers).
+            first: Maximum number of items of each added list (GitHub
+                max is 100).
+
+        Returns:
+            tuple: A dict of profile data by username and a dict of
+                UserNotFoundError by username.
+
+        """
+        return self._collect(self.iter_users_by_usernames(
+            usernames, access_token, organizations, repositories, followers,
+            first))
+
+    def iter_users_by_usernames(self, usernames, access_token=None, organizations=False, repositories=False, followers=False, first=100):
+        """Get many users by username, as each batch is completed.
+
+        See users_by_usernames.
+
+        Yields:
+            tuple: The username and its profile data, or the
+                UserNotFoundError if it does not exist.
+
+        """
+        connections = [
+            USER_CONNECTIONS[name].format(first=first)
+            for name, wanted in (('organizations', organizations),
+                                 ('repositories', repositories),
+                                 ('followers', followers))
+            if wanted]
+        fragments = USER_FRAGMENT
+
+        if repositories:
+            fragments += REPOSITORY_FRAGMENT
+
+        for batch in self._batches(usernames):
+            query = 'query({0}) {{\n{1}\n}}\n{2}'.format(
+                ', '.join('$l{}: String!'.format(index)
+                          for index in range(len(batch))),
+                '\n'.join(
+                    'u{0}: user(login: $l{0}) {{ ...user {1} }}'.format(
+                        index, ' '.join(connections))
+                    for index in range(len(batch))),
+                fragments)
+            variables = {'l{}'.format(index): username
+                         for index, username in enumerate(batch)}
+            data, errors = self._execute(query, variables, access_token)
+
+            for index, username in enumerate(batch):
+                alias = 'u{}'.format(index)
+                node = data.get(alias)
+
+                if node is None:
+                    yield username, self._missing(
+                        alias, errors, UserNotFoundError({'user': username}))
+                else:
+                    yield username, self._user(node)
+
+    def repositories_by_names(self, names, access_token=None):
+        """Get many repositories by full name, batch_size per request.
+
+        Args:
+            names: Iterable of 'owner/name' repository names. Duplicates
+                are requested only once.
+            access_token: GitHub OAuth2 access token.
+
+        Returns:
+            tuple: A dict of repository data by name and a dict of
+                RepositoryNameNotFoundError by name.
+
+        """
+        return self._collect(
+            self.iter_repositories_by_names(names, access_token))
+
+    def iter_repositories_by_names(self, names, access_token=None):
+        """Get many repositories by full name, as each batch is completed.
+
+        See repositories_by_names.
+
+        Yields:
+            tuple: The 'owner/name' repository name and its data, or the
+                RepositoryNameNotFoundError if it does not exist.
+
+        """
+        for batch in self._batches(names):
+            query = 'query({0}) {{\n{1}\n}}\n{2}'.format(
+                ', '.join('$o{0}: String!, $n{0}: String!'.format(index)
+                          for index in range(len(batch))),
+                '\n'.join(
+                    'r{0}: repository(owner: $o{0}, name: $n{0}) '
+                    '{{ ...repository }}'.format(index)
+                    for index in range(len(batch))),
+                REPOSITORY_FRAGMENT)
+            variables = {}
+
+            for index, name in enumerate(batch):
+                owner, _, repository_name = name.partition('/')
+                variables['o{}'.format(index)] = owner
+                variables['n{}'.format(index)] = repository_name
+
+            data, errors = self._execute(query, variables, access_token)
+
+            for index, name in enumerate(batch):
+                alias = 'r{}'.format(index)
+                node = data.get(alias)
+
+                if node is None:
+                    owner, _, repository_name = name.partition('/')
+                    yield name, self._missing(
+                        alias, errors, RepositoryNameNotFoundError(
+                            {'repository_id': repository_name,
+                             'username': owner}))
+                else:
+                    yield name, self._repository(node)
+
+    def _execute(self, query, variables, access_token):
+        """Send a GraphQL query and check its status code.
+
+        Args:
+            query: The GraphQL query document.
+            variables: Dict of query variables or None.
+            access_token: GitHub OAuth2 access token.
+
+        Returns:
+            tuple: The data dict and the list of errors.
+
+        Raises:
+            GraphQLError: The query has errors and no data.
+
+        """
+        url = "{0}/graphql".format(self.ROOT_API_URL)
+        access_token = self.get_token(access_token)
+        response = self._post(
+            url, access_token, {'query': query, 'variables': variables or {}})
+        self._check_common_status_code(response, access_token)
+        result = self._json(response)
+        data = result.get('data')
+        errors = result.get('errors') or []
+
+        if errors and not data:
+            raise GraphQLError({'errors': errors})
+
+        return data or {}, errors
+
+    def _batches(self, items):
+        """Split an iterable into lists of batch_size distinct items."""
+        seen = set()
+        batch = []
+
+        for item in items:
+            if item in seen:
+                continue
+
+            seen.add(item)
+            batch.append(item)
+
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+
+        if batch:
+            yield batch
+
+    def _missing(self, alias, errors, not_found):
+        """Return the exception of an alias answered with null.
+
+        Args:
+            alias: The alias of the entity in the query.
+            errors: The errors of the query.
+            not_found: The exception used when the entity does not exist.
+
+        Returns:
+            Exception: not_found, or a GraphQLError with the errors of the
+                alias when they are not NOT_FOUND errors.
+
+        """
+        alias_errors = [error for error in errors
+                        if (error.get('path') or [None])[0] == alias]
+
+        if all(error.get('type') == 'NOT_FOUND' for error in alias_errors):
+            return not_found
+
+        return GraphQLError({'errors': alias_errors})
+
+    def _collect(self, results):
+        """Split bulk results into found and failed entities.
+
+        Args:
+            results: Iterable of (key, data or exception) tuples.
+
+        Returns:
+            tuple: A dict of data and a dict of exceptions.
+
+        """
+        found = {}
+        failed = {}
+
+        for key, data in results:
+            if isinstance(data, Exception):
+                failed[key] = data
+            else:
+                found[key] = data
+
+        return found, failed
+
+    def _user(self, node):
+        """Map a GraphQL User node into a REST API profile dict."""
+        data = self._user_summary(node)
+        data.update({
+            'name': node.get('name'),
+            'company': node.get('company'),
+            'blog': node.get('websiteUrl') or '',
+            'location': node.get('location'),
+            'email': node.get('email') or None,
+            'hireable': node.get('isHireable') or None,
+            'bio': node.get('bio'),
+            'public_repos': _total(node, 'publicRepositories'),
+            'public_gists': _total(node, 'publicGists'),
+            'followers': _total(node, 'followers'),
+            'following': _total(node, 'following'),
+            'created_at': node.get('createdAt'),
+            'updated_at': node.get('updatedAt'),
+        })
+
+        if 'organizationList' in node:
+            data['organizations'] = [
+                self._organization(organization)
+                for organization in _nodes(node, 'organizationList')]
+
+        if 'repositoryList' in node:
+            data['repositories'] = [
+                self._repository(repository)
+                for repository in _nodes(node, 'repositoryList')]
+
+        if 'followerList' in node:
+            data['followers_list'] = [
+                self._user_summary(follower)
+                for follower in _nodes(node, 'followerList')]
+
+        return data
+
+    def _user_summary(self, node):
+        """Map a GraphQL User node into a REST API user summary dict."""
+        url = '{0}/users/{1}'.format(self.ROOT_API_URL, node.get('login'))
+
+        return {
+            'login': node.get('login'),
+            'id': node.get('databaseId'),
+            'node_id': node.get('id'),
+            'avatar_url': node.get('avatarUrl'),
+            'gravatar_id': '',
+            'url': url,
+            'html_url': node.get('url'),
+            'followers_url': url + '/followers',
+            'following_url': url + '/following{/other_user}',
+            'gists_url': url + '/gists{/gist_id}',
+            'starred_url': url + '/starred{/owner}{/repo}',
+            'subscriptions_url': url + '/subscriptions',
+            'organizations_url': url + '/orgs',
+            'repos_url': url + '/repos',
+            'events_url': url + '/events{/privacy}',
+            'received_events_url': url + '/received_events',
+            'type': node.get('__typename') or 'User',
+            'site_admin': bool(node.get('isSiteAdmin')),
+        }
+
+    def _organization(self, node):
+        """Map a GraphQL Organization node into a REST API dict."""
+        return {
+            'login': node.get('login'),
+            'id': node.get('databaseId'),
+            'node_id': node.get('id'),
+            'url': '{0}/orgs/{1}'.format(self.ROOT_API_URL, node.get('login')),
+            'avatar_url': node.get('avatarUrl'),
+            'description': node.get('description'),
+        }
+
+    def _repository(self, node):
+        """Map a GraphQL Repository node into a REST API repository dict."""
+        stargazers = _total(node, 'stargazers')
+        # Unlike the REST API, open pull requests are not counted
+        open_issues = _total(node, 'openIssues')
+        forks = node.get('forkCount')
+
+        return {
+            'id': node.get('databaseId'),
+            'node_id': node.get('id'),
+            'name': node.get('name'),
+            'full_name': node.get('nameWithOwner'),
+            'owner': self._user_summary(node.get('owner') or {}),
+            'private': node.get('isPrivate'),
+            'html_url': node.get('url'),
+            'description': node.get('description'),
+            'fork': node.get('isFork'),
+            'url': '{0}/repos/{1}'.format(
+                self.ROOT_API_URL, node.get('nameWithOwner')),
+            'created_at': node.get('createdAt'),
+            'updated_at': node.get('updatedAt'),
+            'pushed_at': node.get('pushedAt'),
+            'homepage': node.get('homepageUrl'),
+            'size': node.get('diskUsage'),
+            'stargazers_count': stargazers,
+            'watchers_count': stargazers,
+            'language': (node.get('primaryLanguage') or {}).get('name'),
+            'has_issues': node.get('hasIssuesEnabled'),
+            'has_wiki': node.get('hasWikiEnabled'),
+            'forks_count': forks,
+            'mirror_url': node.get('mirrorUrl'),
+            'archived': node.get('isArchived'),
+            'open_issues_count': open_issues,
+            'forks': forks,
+            'open_issues': open_issues,
+            'watchers': stargazers,
+            'default_branch': (node.get('defaultBranchRef') or {}).get('name'),
+            'subscribers_count': _total(node, 'watchers'),
+        }
+
+
+def _total(node, field):
+    """Return the totalCount of a connection of a node."""
+    return (node.get(field) or {}).get('totalCount')
+
+
+def _nodes(node, field):
+    """Return the nodes of a connection of a node."""
+    return (node.get(field) or {}).get('nodes') or []
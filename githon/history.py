@@ -0,0 +1,241 @@
+# coding: utf-8
+"""Module with a parallel downloader of repository commit histories."""
+
+import collections
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+from .records import project
+from .utils import format_iso8601, to_datetime
+
+
+class CommitHistory:
+    """Download the commit history of repositories by date windows.
+
+    The history between since and until is split into consecutive windows
+    of commit dates, which are paginated concurrently, each one with the
+    since/until filters of the commits endpoint. Commits are yielded newest
+    first, window by window, so the order is the same as a sequential
+    pagination, and commits at the boundary of two windows are yielded
+    once:
+
+        history = CommitHistory(RepositoryApi('YOUR_ACCESS_TOKEN'))
+
+        for commit in history.fetch_by_name('marcosvbras', 'githon'):
+            save(commit)
+
+        mark = history.high_water_mark
+
+    Without since, the windows start at the repository creation and a last
+    window holds the older commits, e.g. imported from another host. Save
+    high_water_mark, the newest commit date seen, and give it as since to
+    resync only the newer commits. It only moves once every window was
+    yielded, so a fetch stopped early, e.g. by an error, keeps the previous
+    mark. since is inclusive, so the commits dated exactly at the mark are
+    yielded again. Commits merged later with older dates are only seen by a
+    full fetch.
+
+    Args:
+        api: A RepositoryApi object.
+        access_token: GitHub OAuth2 access token.
+        window: datetime.timedelta of commit dates covered by each window.
+        max_workers: Maximum number of windows requested concurrently.
+    """
+
+    def __init__(self, api, access_token=None, window=datetime.timedelta(days=90), max_workers=4):
+        """Constructor."""
+        if window <= datetime.timedelta(0):
+            raise ValueError("window must be positive")
+
+        self.api = api
+        self.access_token = access_token
+        self.window = window
+        self.max_workers = max_workers
+        self.high_water_mark = None
+
+    def fetch_by_name(self, username, repository_name, since=None, until=None, sha=None, path=None, fields=None):
+        """Lazily yield the commits of a repository by name.
+
+        Args:
+            username: Github username.
+            repository_name: An existent user's repository name.
+            since: Optional datetime or ISO 8601 string of the oldest commit
+                date, usually a saved high_water_mark.
+            until: Optional datetime or ISO 8601 string of the newest commit
+                date. Defaults to now.
+            sha: Optional branch name or commit SHA to start listing from.
+            path: Optional file path. Only commits changing it are listed.
+            fields: Keys or a githon.records class to keep of each commit.
+                None keeps everything.
+
+        Yields:
+            dict: Each commit, newest first.
+
+        Raises:
+            RepositoryNameNotFoundError: The repository does not exist.
+
+        """
+        def commits(low, high):
+            return self.api.iter_commits_by_name(
+                username, repository_name, self.access_token, sha=sha,
+                since=low, until=high, path=path)
+
+        def created_at():
+            return self.api.repository_by_name(
+                username, repository_name, self.access_token)['created_at']
+
+        return self._fetch(commits, created_at, since, until, fields)
+
+    def fetch_by_id(self, repository_id, since=None, until=None, sha=None, path=None, fields=None):
+        """Lazily yield the commits of a repository by ID.
+
+        See fetch_by_name.
+
+        Raises:
+            RepositoryIdNotFoundError: The repository does not exist.
+
+        """
+        def commits(low, high):
+            return self.api.iter_commits_by_id(
+                repository_id, self.access_token, sha=sha, since=low,
+                until=high, path=path)
+
+        def created_at():
+            return self.api.repository_by_id(
+                repository_id, self.access_token)['created_at']
+
+        return self._fetch(commits, created_at, since, until, fields)
+
+    def windows(self, start, end, open_ended=False):
+        """Return the date windows between two datetimes, newest first.
+
+        Args:
+            start: The oldest datetime.
+            end: The newest datetime.
+            open_ended: Add a last window with every commit before start.
+
+        Returns:
+            list: (since, until) tuples of naive UTC datetimes. Adjacent
+                windows share their boundary.
+
+        """
+        windows = []
+        high = end
+
+        while high > start:
+            low = max(high - self.window, start)
+            windows.append((low, high))
+            high = low
+
+        if not windows:
+            windows.append((start, end))
+
+        if open_ended:
+            windows.append((None, start))
+
+        return windows
+
+    def _fetch(self, commits, created_at, since, until, fields):
+        """Request the windows concurrently and yield them in order.
+
+        Args:
+            commits: Callable(since, until) returning an iterator over the
+                commits of a window.
+            created_at: Callable returning the repository creation date.
+            since: The oldest commit date or None.
+            until: The newest commit date or None for now.
+            fields: Keys or a githon.records class to keep of each commit.
+
+        Yields:
+            dict: Each commit, newest first.
+
+        """
+        if fields is not None and not isinstance(fields, type):
+            fields = tuple(fields)
+
+        if until is None:
+            end = datetime.datetime.now(datetime.timezone.utc).replace(
+                tzinfo=None, microsecond=0)
+        else:
+            end = to_datetime(format_iso8601(until))
+
+        start = to_datetime(format_iso8601(
+            created_at() if since is None else since))
+        self.high_water_mark = None if since is None else format_iso8601(
+            since)
+        mark = self.high_water_mark
+        windows = iter(self.windows(start, end, open_ended=since is None))
+        pending = collections.deque()
+        previous = set()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            def submit():
+                window = next(windows, None)
+
+                if window is not None:
+                    pending.append(executor.submit(
+                        self._collect, commits, window, fields))
+
+            for _ in range(self.max_workers * 2):
+                submit()
+
+            try:
+                while pending:
+                    page = pending.popleft().result()
+                    submit()
+                    current = set()
+
+                    for sha, date, commit in page:
+                        current.add(sha)
+
+                        # Windows share their boundary date
+                        if sha in previous:
+                            continue
+
+                        mark = newest(mark, date)
+                        yield commit
+
+                    previous = current
+
+                # An interrupted fetch must not skip the windows it missed
+                self.high_water_mark = mark
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _collect(self, commits, window, fields):
+        """Request the commits of a window, keeping only the given fields.
+
+        Runs on the worker threads, so the windows waiting their turn only
+        hold the projected commits, not the full API payloads.
+
+        Returns:
+            list: (sha, committer date, projected commit) tuples.
+
+        """
+        return [(commit['sha'], commit_date(commit), project(commit, fields))
+                for commit in commits(*window)]
+
+
+def newest(mark, date):
+    """Return the newest of a high water mark and a commit date.
+
+    Args:
+        mark: ISO 8601 string or None.
+        date: ISO 8601 commit date or None.
+
+    Returns:
+        str: The newest date, None if both are None.
+
+    """
+    if date is not None:
+        date = format_iso8601(date)
+
+        if mark is None or date > mark:
+            return date
+
+    return mark
+
+
+def commit_date(commit):
+    """Return the committer date of a commit of the API, or None."""
+    return ((commit.get('commit') or {}).get('committer') or {}).get('date')
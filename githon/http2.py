@@ -0,0 +1,223 @@
+# coding: utf-8
+"""Module with an HTTP/2 transport for requests sessions.
+
+Requests are multiplexed over a few HTTP/2 connections by httpx, which is
+an optional dependency:
+
+    pip install githon[http2]
+"""
+
+import asyncio
+import ssl
+import threading
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# Connection-specific headers are forbidden in HTTP/2
+HOP_BY_HOP_HEADERS = frozenset((
+    'connection', 'keep-alive', 'proxy-connection', 'transfer-encoding',
+    'upgrade', 'host'))
+
+
+class HTTPXStream:
+    """File-like raw body of a requests response read from httpx."""
+
+    def __init__(self, adapter, response):
+        """Constructor."""
+        self._adapter = adapter
+        self._response = response
+        self._chunks = None
+
+    def read(self, amt=None, **kwargs):
+        """Return the next chunk of the decoded body, b'' at the end."""
+        if self._chunks is None:
+            self._chunks = self._response.aiter_bytes(amt)
+
+        return self._adapter._run(self._next_chunk())
+
+    def close(self):
+        """Release the HTTP/2 stream."""
+        self._adapter._run(self._response.aclose())
+
+    async def _next_chunk(self):
+        """Return the next chunk of the body on the event loop thread."""
+        try:
+            return await self._chunks.__anext__()
+        except StopAsyncIteration:
+            return b''
+
+
+class HTTP2Adapter(BaseAdapter):
+    """Transport adapter that sends the requests of a session with HTTP/2.
+
+    Concurrent requests of every thread share the connections of a single
+    httpx client, as streams of the same HTTP/2 connection, so hundreds of
+    requests in flight take a few sockets and TLS sessions. Servers without
+    HTTP/2 are spoken to with HTTP/1.1.
+
+    The client is asynchronous and runs on an event loop thread of the
+    adapter, as the blocking httpx client can open the streams of a
+    connection out of order when many threads share it. Mount it on a
+    session, or use create_session(http2=True):
+
+        session = requests.Session()
+        session.mount('https://', HTTP2Adapter())
+        gh = GithubApi('YOUR_ACCESS_TOKEN', session=session)
+
+    Proxies and cookies of the session are not supported.
+
+    Args:
+        max_connections: Maximum number of concurrent connections.
+        max_keepalive_connections: Maximum number of idle connections kept
+            alive.
+        http1: Also allow HTTP/1.1. False speaks HTTP/2 without negotiation,
+            which cleartext (http://) servers, such as local test servers,
+            require.
+    """
+
+    def __init__(self, max_connections=20, max_keepalive_connections=10, http1=True):
+        """Constructor."""
+        if httpx is None:
+            raise ImportError(
+                "The githon HTTP/2 transport requires httpx and h2. "
+                "Install them with: pip install githon[http2]")
+
+        super().__init__()
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections)
+        self.http1 = http1
+        self._clients = {}
+        self._lock = threading.Lock()
+        self._loop = None
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        """Send a prepared request.
+
+        Args:
+            request: The requests.PreparedRequest being sent.
+            stream: Do not read the response body up front.
+            timeout: Seconds to wait for the server, as a number or a
+                (connect, read) tuple. None waits forever.
+            verify: Verify the server certificate, or the CA bundle path.
+            cert: Optional client certificate path or (cert, key) tuple.
+            proxies: Ignored.
+
+        Returns:
+            requests.Response: The response.
+
+        Raises:
+            requests.ConnectionError: The connection failed.
+            requests.Timeout: The server did not answer in time.
+
+        """
+        client = self._client(verify, cert)
+        headers = [(key, value) for key, value in request.headers.items()
+                   if key.lower() not in HOP_BY_HOP_HEADERS]
+        http_request = client.build_request(
+            request.method, request.url, headers=headers,
+            content=request.body, timeout=self._timeout(timeout))
+
+        try:
+            response = self._run(self._send(client, http_request, stream))
+        except httpx.TimeoutException as error:
+            if isinstance(error, httpx.ConnectTimeout):
+                raise requests.exceptions.ConnectTimeout(error, request=request)
+
+            raise requests.exceptions.ReadTimeout(error, request=request)
+        except httpx.TransportError as error:
+            raise requests.ConnectionError(error, request=request)
+
+        return self._build_response(request, response, stream)
+
+    def close(self):
+        """Close the connections of every client and stop the event loop."""
+        with self._lock:
+            clients, self._clients = self._clients, {}
+            loop, self._loop = self._loop, None
+
+        if loop is None:
+            return
+
+        for client in clients.values():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop).result()
+
+        loop.call_soon_threadsafe(loop.stop)
+
+    def _run(self, coroutine):
+        """Run a coroutine on the event loop thread and wait for its result."""
+        loop = self._loop
+
+        if loop is None:
+            with self._lock:
+                if self._loop is None:
+                    self._loop = asyncio.new_event_loop()
+                    threading.Thread(
+                        target=self._loop.run_forever, name='githon-http2',
+                        daemon=True).start()
+
+                loop = self._loop
+
+        return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+    async def _send(self, client, request, stream):
+        """Send a request, reading its body unless streamed."""
+        response = await client.send(request, stream=True)
+
+        if not stream:
+            await response.aread()
+
+        return response
+
+    def _client(self, verify, cert):
+        """Return the httpx client of a TLS configuration."""
+        key = (verify, cert if not isinstance(cert, list) else tuple(cert))
+        client = self._clients.get(key)
+
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+
+                if client is None:
+                    if isinstance(verify, str):
+                        verify = ssl.create_default_context(cafile=verify)
+
+                    client = self._clients[key] = httpx.AsyncClient(
+                        http1=self.http1, http2=True, verify=verify,
+                        cert=cert, limits=self.limits, trust_env=False)
+
+        return client
+
+    def _timeout(self, timeout):
+        """Convert a requests timeout to an httpx one."""
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return httpx.Timeout(read, connect=connect)
+
+        return httpx.Timeout(timeout)
+
+    def _build_response(self, request, http_response, stream):
+        """Build a requests response from an httpx one."""
+        response = requests.Response()
+        response.status_code = http_response.status_code
+        response.headers = CaseInsensitiveDict(http_response.headers.items())
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.reason = http_response.reason_phrase
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.raw = HTTPXStream(self, http_response)
+
+        if not stream:
+            # The body was read and its stream released
+            response._content = http_response.content
+            response._content_consumed = True
+
+        return response
@@ -0,0 +1,258 @@
+# coding: utf-8
+"""Module with request instrumentation events and a metrics aggregator."""
+
+import re
+import threading
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+# Path segments that name a resource and never a user or repository
+RESOURCES = frozenset((
+    'branches', 'comments', 'commits', 'contents', 'contributors', 'emails',
+    'events', 'followers', 'following', 'gists', 'issues', 'labels',
+    'languages', 'orgs', 'pulls', 'repos', 'subscribers', 'tags', 'git',
+    'trees', 'blobs', 'tarball', 'graphql', 'rate_limit', 'search', 'users'))
+
+# Segments followed by an identifier, with the identifier placeholder
+IDENTIFIERS = {
+    'users': ('{username}',),
+    'user': ('{user_id}',),
+    'repos': ('{owner}', '{repo}'),
+    'repositories': ('{repository_id}',),
+    'trees': ('{sha}',),
+    'blobs': ('{sha}',),
+    'tarball': ('{ref}',),
+}
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+                   10.0)
+
+
+def endpoint_template(url):
+    """Return the endpoint template of a requested URL.
+
+    Example
+        Input: https://api.github.com/users/marcosvbras/followers?page=2
+        Output: /users/{username}/followers
+
+    Args:
+        url: The requested URL.
+
+    Returns:
+        str: The URL path with identifiers replaced by placeholders.
+
+    """
+    return _path_template(urlsplit(url).path)
+
+
+@lru_cache(maxsize=4096)
+def _path_template(path):
+    """Return the endpoint template of an URL path. See endpoint_template."""
+    segments = [segment for segment in path.split('/') if segment]
+    template = []
+    index = 0
+
+    while index < len(segments):
+        segment = segments[index]
+        template.append(segment)
+        index += 1
+
+        # The first segment after /user may be a resource, e.g. /user/emails
+        placeholders = IDENTIFIERS.get(segment, ())
+
+        for placeholder in placeholders:
+            if index >= len(segments) or (
+                    segment == 'user' and segments[index] in RESOURCES):
+                break
+
+            template.append(placeholder)
+            index += 1
+
+        if segment == 'contents' and index < len(segments):
+            template.append('{path}')
+            break
+
+    return '/' + '/'.join(template)
+
+
+class RequestEvent:
+    """Description of a finished request, sent to every hook.
+
+    Attributes:
+        endpoint: The endpoint template. See endpoint_template.
+        status: The HTTP status code, or None if the request failed.
+        latency: Seconds spent, including throttling and retries.
+        response_bytes: Size of the decoded response body.
+        cache: 'fresh' (served without request), 'revalidated' (304 Not
+            Modified), 'miss' or None when no cache is used.
+        retries: Number of retried attempts.
+        rate_limit_remaining: The X-RateLimit-Remaining header, if any.
+        error: The exception raised by the transport, if any.
+    """
+
+    __slots__ = ('endpoint', 'status', 'latency', 'response_bytes', 'cache',
+                 'retries', 'rate_limit_remaining', 'error')
+
+    def __init__(self, endpoint, status, latency, response_bytes, cache, retries, rate_limit_remaining, error=None):
+        """Constructor."""
+        self.endpoint = endpoint
+        self.status = status
+        self.latency = latency
+        self.response_bytes = response_bytes
+        self.cache = cache
+        self.retries = retries
+        self.rate_limit_remaining = rate_limit_remaining
+        self.error = error
+
+    def __repr__(self):
+        return 'RequestEvent({})'.format(', '.join(
+            '{0}={1!r}'.format(name, getattr(self, name))
+            for name in self.__slots__))
+
+
+class MetricsCollector:
+    """Hook that aggregates request events into counters and histograms.
+
+    Use it as an API hook and expose prometheus_text() on your metrics
+    endpoint:
+
+        metrics = MetricsCollector()
+        gh = GithubApi('YOUR_ACCESS_TOKEN', hooks=[metrics])
+
+    Args:
+        prefix: Prefix of every metric name.
+        buckets: Upper bounds in seconds of the latency histogram.
+    """
+
+    def __init__(self, prefix='githon', buckets=DEFAULT_BUCKETS):
+        """Constructor."""
+        self.prefix = prefix
+        self.buckets = tuple(sorted(buckets))
+        self._requests = {}
+        self._cache = {}
+        self._retries = {}
+        self._bytes = {}
+        self._latency = {}
+        self._remaining = None
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        """Aggregate a RequestEvent."""
+        status = 'error' if event.status is None else str(event.status)
+
+        with self._lock:
+            key = (event.endpoint, status)
+            self._requests[key] = self._requests.get(key, 0) + 1
+
+            if event.cache is not None:
+                key = (event.endpoint, event.cache)
+                self._cache[key] = self._cache.get(key, 0) + 1
+
+            self._retries[event.endpoint] = self._retries.get(
+                event.endpoint, 0) + event.retries
+            self._bytes[event.endpoint] = self._bytes.get(
+                event.endpoint, 0) + event.response_bytes
+
+            histogram = self._latency.get(event.endpoint)
+
+            if histogram is None:
+                histogram = self._latency[event.endpoint] = [
+                    [0] * len(self.buckets), 0, 0.0]
+
+            for index, bound in enumerate(self.buckets):
+                if event.latency <= bound:
+                    histogram[0][index] += 1
+
+            histogram[1] += 1
+            histogram[2] += event.latency
+
+            if event.rate_limit_remaining is not None:
+                self._remaining = event.rate_limit_remaining
+
+    def snapshot(self):
+        """Return the aggregated values as plain dicts.
+
+        Returns:
+            dict: Requests by (endpoint, status), cache results by
+                (endpoint, cache), retries, bytes, latency count and sum by
+                endpoint and the last rate limit remaining.
+
+        """
+        with self._lock:
+            return {
+                'requests': dict(self._requests),
+                'cache': dict(self._cache),
+                'retries': dict(self._retries),
+                'response_bytes': dict(self._bytes),
+                'latency': {endpoint: {'count': value[1], 'sum': value[2]}
+                            for endpoint, value in self._latency.items()},
+                'rate_limit_remaining': self._remaining,
+            }
+
+    def prometheus_text(self):
+        """Return the metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: The metrics document.
+
+        """
+        name = self.prefix + '_{}'
+        lines = []
+
+        with self._lock:
+            self._counter(
+                lines, name.format('requests_total'), 'HTTP requests.',
+                self._requests, ('endpoint', 'status'))
+            self._counter(
+                lines, name.format('cache_total'), 'Response cache results.',
+                self._cache, ('endpoint', 'cache'))
+            self._counter(
+                lines, name.format('retries_total'), 'Retried attempts.',
+                self._retries, ('endpoint',))
+            self._counter(
+                lines, name.format('response_bytes_total'),
+                'Decoded response body bytes.', self._bytes, ('endpoint',))
+
+            histogram = name.format('request_duration_seconds')
+            lines.append('# HELP {} Request latency.'.format(histogram))
+            lines.append('# TYPE {} histogram'.format(histogram))
+
+            for endpoint, (counts, count, total) in sorted(
+                    self._latency.items()):
+                label = 'endpoint="{}"'.format(_escape(endpoint))
+
+                for bound, value in zip(self.buckets, counts):
+                    lines.append('{0}_bucket{{{1},le="{2}"}} {3}'.format(
+                        histogram, label, bound, value))
+
+                lines.append('{0}_bucket{{{1},le="+Inf"}} {2}'.format(
+                    histogram, label, count))
+                lines.append('{0}_sum{{{1}}} {2}'.format(
+                    histogram, label, total))
+                lines.append('{0}_count{{{1}}} {2}'.format(
+                    histogram, label, count))
+
+            if self._remaining is not None:
+                gauge = name.format('rate_limit_remaining')
+                lines.append(
+                    '# HELP {} Last X-RateLimit-Remaining seen.'.format(gauge))
+                lines.append('# TYPE {} gauge'.format(gauge))
+                lines.append('{0} {1}'.format(gauge, self._remaining))
+
+        return '\n'.join(lines) + '\n'
+
+    def _counter(self, lines, name, description, values, labels):
+        """Append a counter family to the exposition lines."""
+        lines.append('# HELP {0} {1}'.format(name, description))
+        lines.append('# TYPE {} counter'.format(name))
+
+        for key, value in sorted(values.items()):
+            key = key if isinstance(key, tuple) else (key,)
+            label = ','.join('{0}="{1}"'.format(label, _escape(part))
+                             for label, part in zip(labels, key))
+            lines.append('{0}{{{1}}} {2}'.format(name, label, value))
+
+
+def _escape(value):
+    """Escape a Prometheus label value."""
+    return re.sub(r'(["\\])', r'\\\1', str(value)).replace('\n', '\\n')
@@ -0,0 +1,219 @@
+# coding: utf-8
+"""Module with a rate limit budget shared by many processes."""
+
+import hashlib
+import os
+import sqlite3
+import time
+from .ratelimit import RateLimitTracker
+
+
+def token_key(access_token):
+    """Return the key under which the quota of a token is stored.
+
+    Tokens are never written to the store, only a hash of them.
+
+    Args:
+        access_token: GitHub OAuth2 access token. Empty for anonymous
+            requests.
+
+    Returns:
+        str: The hexadecimal SHA-256 hash of the token.
+
+    """
+    return hashlib.sha256(access_token.encode('utf-8')).hexdigest()
+
+
+class SharedQuota(RateLimitTracker):
+    """Rate limit tracker whose budget is shared through a SQLite database.
+
+    Every process opening the same database file takes its requests from
+    the same per token budget, so many workers using the same tokens never
+    overshoot the rate limit together. Use it as the rate_limit of the API
+    objects of every process:
+
+        quota = SharedQuota('/tmp/githon-quota.db')
+        gh = GithubApi('YOUR_ACCESS_TOKEN', rate_limit=quota)
+
+    Each request takes a permit by decrementing the remaining count of its
+    token in a write transaction. The X-RateLimit-* headers of responses
+    start a new window when X-RateLimit-Reset is later than the stored one
+    and otherwise only lower the remaining count of the same window, as
+    the responses of other processes may be older than the permits taken
+    since.
+
+    SQLite locking covers the processes of a host. Hosts can share the
+    database only through a filesystem with reliable locks.
+
+    Args:
+        path: The SQLite database file path.
+        throttle: 'wait' or 'smooth'. See RateLimitTracker.
+        margin: Number of requests kept in reserve by the throttle.
+    """
+
+    blocking = True
+
+    def __init__(self, path, throttle='wait', margin=0):
+        """Constructor."""
+        if throttle is None:
+            raise ValueError("SharedQuota requires 'wait' or 'smooth'")
+
+        super().__init__(throttle, margin)
+        self.path = path
+        self._pid = None
+        self._connection = None
+        self._connect()
+
+    def _connect(self):
+        """Open the database, again after a fork."""
+        self._pid = os.getpid()
+        self._connection = sqlite3.connect(
+            self.path, timeout=30, check_same_thread=False,
+            isolation_level=None)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS quota ('
+            'token TEXT, resource TEXT, remaining INTEGER, "limit" INTEGER, '
+            'reset INTEGER, next_slot REAL, PRIMARY KEY (token, resource))')
+
+    def _execute(self, operation):
+        """Run operation(connection) in a write transaction.
+
+        Args:
+            operation: Callable receiving the sqlite3 connection.
+
+        Returns:
+            The operation result.
+
+        """
+        with self._lock:
+            if self._pid != os.getpid():
+                self._connect()
+
+            self._connection.execute('BEGIN IMMEDIATE')
+
+            try:
+                result = operation(self._connection)
+            except BaseException:
+                self._connection.execute('ROLLBACK')
+                raise
+
+            self._connection.execute('COMMIT')
+
+        return result
+
+    def update(self, access_token, headers, resource='core'):
+        """Record the rate limit headers of a response.
+
+        Args:
+            access_token: GitHub OAuth2 access token used by the request.
+            headers: The response headers.
+            resource: The resource the request was charged against. The
+                X-RateLimit-Resource header has priority over it.
+        """
+        if 'X-RateLimit-Remaining' not in headers:
+            return
+
+        key = token_key(access_token)
+        resource = headers.get('X-RateLimit-Resource', resource)
+        remaining = int(headers['X-RateLimit-Remaining'])
+        limit = int(headers.get('X-RateLimit-Limit', remaining))
+        reset = int(headers.get('X-RateLimit-Reset', 0))
+
+        def operation(connection):
+            row = connection.execute(
+                'SELECT remaining, reset FROM quota '
+                'WHERE token = ? AND resource = ?', (key, resource)).fetchone()
+
+            if row is None:
+                connection.execute(
+                    'INSERT INTO quota VALUES (?, ?, ?, ?, ?, 0)',
+                    (key, resource, remaining, limit, reset))
+            elif reset > row[1]:
+                connection.execute(
+                    'UPDATE quota SET remaining = ?, "limit" = ?, reset = ?, '
+                    'next_slot = 0 WHERE token = ? AND resource = ?',
+                    (remaining, limit, reset, key, resource))
+            elif reset == row[1] and remaining < row[0]:
+                connection.execute(
+                    'UPDATE quota SET remaining = ? '
+                    'WHERE token = ? AND resource = ?',
+                    (remaining, key, resource))
+
+        self._execute(operation)
+
+    def get(self, access_token='', resource='core'):
+        """Return the shared rate limit of a token.
+
+        Args:
+            access_token: GitHub OAuth2 access token. Empty for anonymous
+                requests.
+            resource: 'core', 'search' or 'graphql'.
+
+        Returns:
+            dict: The remaining, limit and reset (epoch seconds) values or
+                None if no response was seen yet.
+
+        """
+        with self._lock:
+            if self._pid != os.getpid():
+                self._connect()
+
+            row = self._connection.execute(
+                'SELECT remaining, "limit", reset FROM quota '
+                'WHERE token = ? AND resource = ?',
+                (token_key(access_token), resource)).fetchone()
+
+        if row is None:
+            return None
+
+        return {'remaining': row[0], 'limit': row[1], 'reset': row[2]}
+
+    def reserve(self, access_token='', resource='core'):
+        """Take a permit from the shared budget of a token.
+
+        Args:
+            access_token: GitHub OAuth2 access token.
+            resource: 'core', 'search' or 'graphql'.
+
+        Returns:
+            float: Seconds to sleep before sending the request.
+
+        """
+        key = token_key(access_token)
+
+        def operation(connection):
+            now = time.time()
+            row = connection.execute(
+                'SELECT remaining, reset, next_slot FROM quota '
+                'WHERE token = ? AND resource = ?', (key, resource)).fetchone()
+
+            # Nothing known about the current window yet
+            if row is None or row[1] <= now:
+                return 0.0
+
+            remaining, reset, next_slot = row
+            available = remaining - self.margin
+            delay = 0.0
+
+            if available <= 0:
+                delay = reset - now + 1
+            elif self.throttle == 'smooth':
+                slot = max(now, next_slot)
+                next_slot = slot + (reset - now) / available
+                delay = slot - now
+
+            connection.execute(
+                'UPDATE quota SET remaining = ?, next_slot = ? '
+                'WHERE token = ? AND resource = ?',
+                (remaining - 1, next_slot, key, resource))
+
+            return delay
+
+        return self._execute(operation)
+
+    def clear(self):
+        """Forget the rate limits of every token."""
+        self._execute(lambda connection: connection.execute(
+            'DELETE FROM quota'))
@@ -0,0 +1,159 @@
+# coding: utf-8
+"""Module that tracks the GitHub rate limit from the response headers."""
+
+import threading
+import time
+
+THROTTLE_MODES = (None, 'smooth', 'wait')
+
+
+def resource_of(url):
+    """Return the GitHub rate limit resource that a URL is charged against.
+
+    Args:
+        url: The requested URL.
+
+    Returns:
+        str: 'search' for the search API, 'graphql' for the GraphQL API or
+            'core' for the others.
+
+    """
+    if '/search/' in url:
+        return 'search'
+
+    if url.endswith('/graphql'):
+        return 'graphql'
+
+    return 'core'
+
+
+class RateLimit:
+    """Last known rate limit of a token for a resource."""
+
+    __slots__ = ('remaining', 'limit', 'reset', 'next_slot')
+
+    def __init__(self, remaining, limit, reset):
+        """Constructor."""
+        self.remaining = remaining
+        self.limit = limit
+        self.reset = reset
+        self.next_slot = 0.0
+
+
+class RateLimitTracker:
+    """Thread-safe record of the X-RateLimit-* headers of every response.
+
+    It can also throttle the requests, so a job never hits the rate limit:
+
+    - 'wait': requests sleep until X-RateLimit-Reset once the remaining
+      requests are over.
+    - 'smooth': requests are evenly spaced over the time left until
+      X-RateLimit-Reset, so the remaining requests last the whole window.
+
+    Args:
+        throttle: None (only track), 'wait' or 'smooth'.
+        margin: Number of requests kept in reserve by the throttle.
+    """
+
+    # True when reserve and update wait on I/O, e.g. a database, so the
+    # async API runs them in the default executor
+    blocking = False
+
+    def __init__(self, throttle=None, margin=0):
+        """Constructor."""
+        if throttle not in THROTTLE_MODES:
+            raise ValueError(
+                "throttle must be one of {}".format(THROTTLE_MODES))
+
+        self.throttle = throttle
+        self.margin = margin
+        self._limits = {}
+        self._lock = threading.Lock()
+
+    def update(self, access_token, headers, resource='core'):
+        """Record the rate limit headers of a response.
+
+        Args:
+            access_token: GitHub OAuth2 access token used by the request.
+            headers: The response headers.
+            resource: The resource the request was charged against. The
+                X-RateLimit-Resource header has priority over it.
+        """
+        if 'X-RateLimit-Remaining' not in headers:
+            return
+
+        resource = headers.get('X-RateLimit-Resource', resource)
+        remaining = int(headers['X-RateLimit-Remaining'])
+        limit = int(headers.get('X-RateLimit-Limit', remaining))
+        reset = int(headers.get('X-RateLimit-Reset', 0))
+
+        with self._lock:
+            state = self._limits.get((access_token, resource))
+
+            if state is None:
+                self._limits[(access_token, resource)] = RateLimit(
+                    remaining, limit, reset)
+            else:
+                state.remaining = remaining
+                state.limit = limit
+                state.reset = reset
+
+    def get(self, access_token='', resource='core'):
+        """Return the last known rate limit of a token.
+
+        Args:
+            access_token: GitHub OAuth2 access token. Empty for anonymous
+                requests.
+            resource: 'core', 'search' or 'graphql'.
+
+        Returns:
+            dict: The remaining, limit and reset (epoch seconds) values or
+                None if no response was seen yet.
+
+        """
+        with self._lock:
+            state = self._limits.get((access_token, resource))
+
+            if state is None:
+                return None
+
+            return {'remaining': state.remaining, 'limit': state.limit,
+                    'reset': state.reset}
+
+    def reserve(self, access_token='', resource='core'):
+        """Reserve a request and return how long it must wait to be sent.
+
+        Args:
+            access_token: GitHub OAuth2 access token.
+            resource: 'core', 'search' or 'graphql'.
+
+        Returns:
+            float: Seconds to sleep before sending the request.
+
+        """
+        if self.throttle is None:
+            return 0.0
+
+        now = time.time()
+
+        with self._lock:
+            state = self._limits.get((access_token, resource))
+
+            # Nothing known about the current window yet
+            if state is None or state.reset <= now:
+                return 0.0
+
+            available = state.remaining - self.margin
+            state.remaining -= 1
+
+            if available <= 0:
+                return state.reset - now + 1
+
+            if self.throttle == 'wait':
+                return 0.0
+
+            interval = (state.reset - now) / available
+            slot = max(now, state.next_slot)
+            state.next_slot = slot + interval
+
+            return slot - now
@@ -0,0 +1,143 @@
+# coding: utf-8
+"""Module with compact record types and field projection of API data.
+
+GitHub list endpoints return dozens of *_url strings per item. Keeping
+only the needed fields, in __slots__ records instead of dicts, reduces
+the memory of large crawls (e.g. follower graphs) several times.
+"""
+
+
+class Record:
+    """Base of the compact records, built from GitHub API dicts.
+
+    Subclasses list their attributes in __slots__. Missing keys are None.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, **kwargs):
+        """Constructor."""
+        for name in self.__slots__:
+            setattr(self, name, kwargs.get(name))
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a record from a GitHub API dict.
+
+        Args:
+            data: The dict returned by the API.
+
+        Returns:
+            Record: The record with the attributes found in data.
+
+        """
+        record = cls.__new__(cls)
+
+        for name in cls.__slots__:
+            setattr(record, name, data.get(name))
+
+        return record
+
+    def to_dict(self):
+        """Return the record attributes as a dict."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return '{0}({1})'.format(type(self).__name__, ', '.join(
+            '{0}={1!r}'.format(name, getattr(self, name))
+            for name in self.__slots__))
+
+
+class UserSummary(Record):
+    """An user as listed by followers, following and contributors."""
+
+    __slots__ = ('id', 'login', 'type', 'site_admin')
+
+
+class User(Record):
+    """A full Github profile, as returned by user_by_id."""
+
+    __slots__ = ('id', 'login', 'type', 'site_admin', 'name', 'company',
+                 'blog', 'location', 'email', 'hireable', 'bio',
+                 'public_repos', 'public_gists', 'followers', 'following',
+                 'created_at', 'updated_at')
+
+
+class Repository(Record):
+    """A repository, as returned by repository_by_id or listed by user."""
+
+    __slots__ = ('id', 'name', 'full_name', 'owner', 'private', 'description',
+                 'fork', 'created_at', 'updated_at', 'pushed_at', 'homepage',
+                 'size', 'stargazers_count', 'watchers_count', 'language',
+                 'forks_count', 'archived', 'open_issues_count',
+                 'default_branch')
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a record, keeping only the owner login."""
+        record = super().from_dict(data)
+
+        if isinstance(record.owner, dict):
+            record.owner = record.owner.get('login')
+
+        return record
+
+
+class Commit(Record):
+    """A commit, as listed by commits_by_name, flattened."""
+
+    __slots__ = ('sha', 'message', 'author_name', 'author_email',
+                 'author_login', 'committer_login', 'date', 'parents')
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a record from the nested commit data."""
+        commit = data.get('commit') or {}
+        author = commit.get('author') or {}
+        record = cls.__new__(cls)
+        record.sha = data.get('sha')
+        record.message = commit.get('message')
+        record.author_name = author.get('name')
+        record.author_email = author.get('email')
+        record.author_login = (data.get('author') or {}).get('login')
+        record.committer_login = (data.get('committer') or {}).get('login')
+        record.date = author.get('date')
+        record.parents = tuple(
+            parent['sha'] for parent in data.get('parents') or ())
+
+        return record
+
+
+def project(data, fields):
+    """Keep only some fields of an API dict.
+
+    Args:
+        data: The dict returned by the API.
+        fields: None to keep everything, an iterable of keys to be kept
+            or a Record subclass to build.
+
+    Returns:
+        The data itself, a dict with the kept keys or a Record.
+
+    """
+    if fields is None:
+        return data
+
+    if isinstance(fields, type) and issubclass(fields, Record):
+        return fields.from_dict(data)
+
+    return {field: data.get(field) for field in fields}
+
+
+def project_list(data, fields):
+    """Keep only some fields of each item of an API list. See project."""
+    if fields is None or not isinstance(data, list):
+        return data
+
+    if not isinstance(fields, type):
+        fields = tuple(fields)
+
+    return [project(item, fields) for item in data]
@@ -1,194 +1,459 @@
 # coding: utf-8
 """Module that contains all user repository Data Scraping logic."""
 
+import hashlib
+import os
 import requests
-from .utils import BaseRequest
-from .exceptions import (InvalidTokenError, RepositoryNameNotFoundError,
-                         ApiError, RepositoryIdNotFoundError, ApiRateLimitError)
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatchcase
+from .utils import BaseRequest, format_iso8601
+from .records import project, project_list
+from .exceptions import (RepositoryNameNotFoundError, RepositoryIdNotFoundError,
+                         TruncatedTreeError)
+
+
+# Git tree modes of regular and executable files
+FILE_MODES = ('100644', '100755', '100664')
+EXECUTABLE_MODE = '100755'
+
+
+def git_blob_sha(path):
+    """Return the git blob SHA-1 of a file, or None if it does not exist.
+
+    Args:
+        path: The file path.
+
+    Returns:
+        str: The SHA-1 git gives to the file content.
+
+    """
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return None
+
+    digest = hashlib.sha1('blob {}\0'.format(size).encode('ascii'))
+
+    with open(path, 'rb') as blob_file:
+        for chunk in iter(lambda: blob_file.read(65536), b''):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def commit_filters(sha=None, since=None, until=None, path=None):
+    """Return the query string filters of a commits list request.
+
+    Args:
+        sha: Branch name or commit SHA to start listing from.
+        since: Datetime or ISO 8601 string of the oldest commit date.
+        until: Datetime or ISO 8601 string of the newest commit date.
+        path: File path changed by the commits.
+
+    Returns:
+        dict: The filters that are not None, or None if there are none.
+
+    """
+    params = {}
+
+    if sha is not None:
+        params['sha'] = sha
+
+    if since is not None:
+        params['since'] = format_iso8601(since)
+
+    if until is not None:
+        params['until'] = format_iso8601(until)
+
+    if path is not None:
+        params['path'] = path
+
+    return params or None
+
+
+def filter_tree(data, patterns=None, min_size=None, max_size=None):
+    """Keep only the files of a tree that match the filters.
+
+    Args:
+        data: The recursive tree data.
+        patterns: Optional glob pattern or list of patterns.
+        min_size: Optional minimum file size in bytes.
+        max_size: Optional maximum file size in bytes.
+
+    Returns:
+        dict: The tree data, with only the matching files if any filter
+            is given.
+
+    """
+    if patterns is None and min_size is None and max_size is None:
+        return data
+
+    if isinstance(patterns, str):
+        patterns = (patterns,)
+
+    data['tree'] = [
+        entry for entry in data['tree']
+        if entry['type'] == 'blob' and
+        (min_size is None or entry['size'] >= min_size) and
+        (max_size is None or entry['size'] <= max_size) and
+        (patterns is None or any(
+            fnmatchcase(entry['path'], pattern) for pattern in patterns))]
+
+    return data
+
+
+def plan_downloads(tree, directory):
+    """Return the files of a tree that are missing or outdated in a directory.
+
+    Symbolic links, submodules and paths leading outside the directory are
+    left out.
+
+    Args:
+        tree: The recursive tree data.
+        directory: The directory the files are written into.
+
+    Returns:
+        list: (entry, absolute path) tuples of the files to be downloaded.
+
+    Raises:
+        TruncatedTreeError: GitHub did not list every file of the tree.
+
+    """
+    # A partial mirror would silently miss files
+    if tree['truncated']:
+        raise TruncatedTreeError({'sha': tree['sha']})
+
+    directory = os.path.abspath(directory)
+    downloads = []
+
+    for entry in tree['tree']:
+        if entry['type'] != 'blob' or entry['mode'] not in FILE_MODES:
+            continue
+
+        path = os.path.abspath(os.path.join(directory, entry['path']))
+
+        # Never write outside the directory
+        if not path.startswith(directory + os.sep):
+            continue
+
+        if git_blob_sha(path) != entry['sha']:
+            downloads.append((entry, path))
+
+    return downloads
 
 
 class RepositoryApi(BaseRequest):
     """Class that has Repository Data Scraping actions."""
 
-    def __init__(self, default_access_token=None):
+    REPOSITORY_FIELDS = (
+        'id', 'name', 'private', 'description', 'fork', 'created_at',
+        'updated_at', 'pushed_at', 'homepage', 'size', 'stargazers_count',
+        'watchers_count', 'language', 'has_issues', 'has_projects',
+        'has_downloads', 'has_wiki', 'has_pages', 'forks_count', 'mirror_url',
+        'archived', 'open_issues_count', 'forks', 'open_issues', 'watchers',
+        'default_branch', 'network_count', 'subscribers_count')
+
+    ALL_DATA_SECTIONS = (
+        'branches', 'comments', 'commits', 'contents', 'contributors',
+        'events', 'issues', 'labels', 'languages', 'pulls', 'subscribers',
+        'tags')
+
+    def __init__(self, default_access_token=None, **kwargs):
         """Constructor.
 
         Args:
             default_access_token: The default GitHub access_token
+            kwargs: Transport options, such as session or cache. See
+                BaseRequest.__init__.
 
         If you don't provide an access_token, your number of requests will be limited to 60 requests per hour, acording with GitHub REST API v3.
         """
-        self.default_access_token = default_access_token
+        super().__init__(default_access_token, **kwargs)
 
     def repository_by_id(self, repository_id, access_token=None):
         """Return a repository with given repository ID."""
-        url = "{0}/repositories/{1}{2}"
+        url = "{0}/repositories/{1}"
         access_token = self.get_token(access_token)
-        token_arg = ''
 
-        if access_token != '':
-            token_arg = "?access_token={}".format(access_token)
+        response = self._get(
+            url.format(self.ROOT_API_URL, repository_id), access_token)
 
-        response = requests.get(
-            url.format(self.ROOT_API_URL, repository_id, token_arg))
+        self._check_status_by_id(response, repository_id, access_token)
 
-        self._check_common_status_code(response, access_token)
-
-        if response.status_code == requests.codes.not_found:
-            raise RepositoryIdNotFoundError({'repository_id': repository_id})
-
-        return response.json()
+        return self._json(response)
 
     def repository_by_name(self, username, repository_name, access_token=None):
         """Return a repository with given repository_name and username."""
-        url = "{0}/repos/{1}/{2}{3}"
+        url = "{0}/repos/{1}/{2}"
         access_token = self.get_token(access_token)
-        token_arg = ''
-
-        if access_token != '':
-            token_arg = "?access_token={}".format(access_token)
 
-        response = requests.get(
-            url.format(
-                self.ROOT_API_URL, username, repository_name, token_arg)
+        response = self._get(
+            url.format(self.ROOT_API_URL, username, repository_name),
+            access_token
         )
 
-        self._check_common_status_code(response, access_token)
+        self._check_status_by_name(
+            response, username, repository_name, access_token)
 
-        if response.status_code == requests.codes.not_found:
-            raise RepositoryNameNotFoundError(
-                {'repository_name': repository_name, 'username': username})
+        return self._json(response)
+
+    def get_all_data(self, repository_id=None, repository_name=None, access_token=None, username=None, sections=None, max_workers=None):
+        """Request all repository data from a given repository ID or name.
 
-        return response.json()
+        The repository and each of its sections are requested concurrently
+        on a bounded pool of worker threads.
 
-    def get_all_data(self, repository_id=None, repository_name=None, access_token=None):
-        """Request all repository data from a given repository ID or name."""
+        Args:
+            repository_id: An existent repository ID.
+            repository_name: An existent user's repository name. Requires
+                username.
+            access_token: GitHub OAuth2 access token.
+            username: Github username owner of repository_name.
+            sections: Iterable of sections to be requested. Defaults to all
+                of ALL_DATA_SECTIONS.
+            max_workers: Maximum number of concurrent requests. Defaults to
+                one worker per request.
+
+        Returns:
+            dict: The repository summary data plus one key per section.
+
+        """
         data = {}
 
         if repository_id:
-            root_data = self.repository_by_id(repository_id, access_token)
-            data['id'] = root_data['id']
-            data['name'] = root_data['name']
-            data['private'] = root_data['private']
-            data['description'] = root_data['description']
-            data['fork'] = root_data['fork']
-            data['id'] = root_data['id']
-            data['created_at'] = root_data['created_at']
-            data['updated_at'] = root_data['updated_at']
-            data['pushed_at'] = root_data['pushed_at']
-            data['homepage'] = root_data['homepage']
-            data['size'] = root_data['size']
-            data['stargazers_count'] = root_data['stargazers_count']
-            data['watchers_count'] = root_data['watchers_count']
-            data['language'] = root_data['language']
-            data['has_issues'] = root_data['has_issues']
-            data['has_projects'] = root_data['has_projects']
-            data['has_downloads'] = root_data['has_downloads']
-            data['has_wiki'] = root_data['has_wiki']
-            data['has_pages'] = root_data['has_pages']
-            data['forks_count'] = root_data['forks_count']
-            data['mirror_url'] = root_data['mirror_url']
-            data['archived'] = root_data['archived']
-            data['open_issues_count'] = root_data['open_issues_count']
-            data['forks'] = root_data['forks']
-            data['open_issues'] = root_data['open_issues']
-            data['watchers'] = root_data['watchers']
-            data['default_branch'] = root_data['default_branch']
-            data['network_count'] = root_data['network_count']
-            data['subscribers_count'] = root_data['subscribers_count']
-
-            data['branches'] = self.get_branches_by_id(
-                repository_id, access_token)
-            data['comments'] = self.get_comments_by_id(
-                repository_id, access_token)
-            data['commits'] = self.get_commits_by_id(
-                repository_id, access_token)
-            data['contents'] = self.get_contents_by_id(
-                repository_id, access_token)
-            data['contributors'] = self.get_contributors_by_id(
-                repository_id, access_token)
-            data['events'] = self.get_events_by_id(
-                repository_id, access_token)
-            data['issues'] = self.get_issues_by_id(
-                repository_id, access_token)
-            data['labels'] = self.get_labels_by_id(
-                repository_id, access_token)
-            data['languages'] = self.get_languages_by_id(
-                repository_id, access_token)
-            data['pulls'] = self.get_pulls_by_id(
-                repository_id, access_token)
-            data['subscribers'] = self.get_subscribers_by_id(
-                repository_id, access_token)
-            data['tags'] = self.get_tags_by_id(
-                repository_id, access_token)
+            args = (repository_id,)
+            root_request = self.repository_by_id
+            suffix = 'by_id'
+        elif repository_name and username:
+            args = (username, repository_name)
+            root_request = self.repository_by_name
+            suffix = 'by_name'
+        else:
+            return data
+
+        sections = self.ALL_DATA_SECTIONS if sections is None else tuple(sections)
+        max_workers = max_workers or len(sections) + 1
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            root_future = executor.submit(root_request, *args, access_token)
+            futures = [
+                (section, executor.submit(
+                    getattr(self, '{0}_{1}'.format(section, suffix)),
+                    *args, access_token))
+                for section in sections
+            ]
+
+            data.update(project(root_future.result(), self.REPOSITORY_FIELDS))
+
+            for section, future in futures:
+                data[section] = future.result()
 
         return data
 
-    def commits_by_name(self, username, repository_name, access_token=None):
+    def tree_by_name(self, username, repository_name, ref=None, access_token=None, patterns=None, min_size=None, max_size=None):
+        """Return the whole file tree of a repository in a single request.
+
+        Args:
+            username: Github username.
+            repository_name: An existent user's repository name.
+            ref: A branch, tag or commit SHA. Defaults to HEAD.
+            access_token: GitHub OAuth2 access token.
+            patterns: Optional glob pattern or list of patterns matched
+                against the file paths, e.g. '*.py' or 'docs/*'.
+            min_size: Optional minimum file size in bytes.
+            max_size: Optional maximum file size in bytes.
+
+        Returns:
+            dict: The tree SHA, the truncated flag, True when GitHub could
+                not list every entry (over 100,000), and the tree list of
+                entries (path, mode, type, sha, size). With any filter,
+                only the matching files are listed.
+
+        """
+        return self._tree(
+            self._url_by_name(username, repository_name),
+            self._status_checker_by_name(username, repository_name),
+            ref, access_token, patterns, min_size, max_size)
+
+    def tree_by_id(self, repository_id, ref=None, access_token=None, patterns=None, min_size=None, max_size=None):
+        """Return the whole file tree of a repository in a single request.
+
+        See tree_by_name.
+        """
+        return self._tree(
+            self._url_by_id(repository_id),
+            self._status_checker_by_id(repository_id),
+            ref, access_token, patterns, min_size, max_size)
+
+    def download_by_name(self, username, repository_name, directory, ref=None, access_token=None, patterns=None, min_size=None, max_size=None, max_workers=8, chunk_size=65536):
+        """Download the files of a repository into a directory.
+
+        The files are listed by tree_by_name and their blobs are streamed
+        concurrently straight to disk. Files already in the directory with
+        the same content are skipped, so mirrors are updated incrementally.
+        Symbolic links and submodules are not downloaded.
+
+        Args:
+            username: Github username.
+            repository_name: An existent user's repository name.
+            directory: The directory the files are written into.
+            ref: A branch, tag or commit SHA. Defaults to HEAD.
+            access_token: GitHub OAuth2 access token.
+            patterns: Optional glob pattern or list of patterns. See
+                tree_by_name.
+            min_size: Optional minimum file size in bytes.
+            max_size: Optional maximum file size in bytes.
+            max_workers: Maximum number of concurrent downloads.
+            chunk_size: Number of bytes written at a time.
+
+        Returns:
+            list: The paths of the downloaded files, relative to directory.
+
+        Raises:
+            RepositoryNameNotFoundError: The repository does not exist.
+            TruncatedTreeError: The tree has too many files to be listed by
+                GitHub. Download the tarball instead.
+
+        """
+        return self._download_files(
+            self._url_by_name(username, repository_name),
+            self._status_checker_by_name(username, repository_name),
+            directory, ref, access_token, patterns, min_size, max_size,
+            max_workers, chunk_size)
+
+    def download_by_id(self, repository_id, directory, ref=None, access_token=None, patterns=None, min_size=None, max_size=None, max_workers=8, chunk_size=65536):
+        """Download the files of a repository into a directory.
+
+        See download_by_name.
+
+        Raises:
+            RepositoryIdNotFoundError: The repository does not exist.
+            TruncatedTreeError: The tree has too many files to be listed by
+                GitHub. Download the tarball instead.
+
+        """
+        return self._download_files(
+            self._url_by_id(repository_id),
+            self._status_checker_by_id(repository_id),
+            directory, ref, access_token, patterns, min_size, max_size,
+            max_workers, chunk_size)
+
+    def tarball_by_name(self, username, repository_name, path, ref=None, access_token=None, chunk_size=65536):
+        """Stream the tar.gz archive of a repository to a file.
+
+        Args:
+            username: Github username.
+            repository_name: An existent user's repository name.
+            path: The file path to be written.
+            ref: A branch, tag or commit SHA. Defaults to the default
+                branch.
+            access_token: GitHub OAuth2 access token.
+            chunk_size: Number of bytes written at a time.
+
+        Returns:
+            int: The size of the archive in bytes.
+
+        """
+        return self._tarball(
+            self._url_by_name(username, repository_name),
+            self._status_checker_by_name(username, repository_name),
+            path, ref, access_token, chunk_size)
+
+    def tarball_by_id(self, repository_id, path, ref=None, access_token=None, chunk_size=65536):
+        """Stream the tar.gz archive of a repository to a file.
+
+        See tarball_by_name.
+        """
+        return self._tarball(
+            self._url_by_id(repository_id),
+            self._status_checker_by_id(repository_id),
+            path, ref, access_token, chunk_size)
+
+    def commits_by_name(self, username, repository_name, access_token=None, fields=None, sha=None, since=None, until=None, path=None):
         """Return repository commits from a given username.
 
         Arguments:
             username: Github username.
             repository_name: An existent user's repository name.
             access_token: GitHub OAuth2 access token.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
+            sha: Optional branch name or commit SHA to start listing from.
+                Defaults to the default branch.
+            since: Optional datetime or ISO 8601 string. Only commits
+                committed at or after it are returned.
+            until: Optional datetime or ISO 8601 string. Only commits
+                committed at or before it are returned.
+            path: Optional file path. Only commits changing it are returned.
         """
         return self._complete_request_by_name(
-            username, repository_name, "commits", access_token)
+            username, repository_name, "commits", access_token, fields,
+            commit_filters(sha, since, until, path))
 
-    def contributors_by_name(self, username, repository_name, access_token=None):
+    def contributors_by_name(self, username, repository_name, access_token=None, fields=None):
         """Return repository contributors from a given username.
 
         Arguments:
             username: Github username.
             repository_name: An existent user's repository name.
             access_token: GitHub OAuth2 access token.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
         """
         return self._complete_request_by_name(
-            username, repository_name, "contributors", access_token)
+            username, repository_name, "contributors", access_token, fields)
 
-    def issues_by_name(self, username, repository_name, access_token=None):
+    def issues_by_name(self, username, repository_name, access_token=None, fields=None):
         """Return repository issues from a given username.
 
         Args:
             username: Github username.
             repository_name: An existent user's repository name
             access_token: GitHub OAuth2 access token.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
         """
         return self._complete_request_by_name(
-            username, repository_name, "issues", access_token)
+            username, repository_name, "issues", access_token, fields)
 
-    def events_by_name(self, username, repository_name, access_token=None):
+    def events_by_name(self, username, repository_name, access_token=None, fields=None):
         """Return repository events from a given username.
 
         Args:
             username: Github username.
             repository_name: An existent user's repository name.
             access_token: GitHub OAuth2 access token.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
         """
         return self._complete_request_by_name(
-            username, repository_name, "events", access_token)
+            username, repository_name, "events", access_token, fields)
 
-    def branches_by_name(self, username, repository_name, access_token=None):
+    def branches_by_name(self, username, repository_name, access_token=None, fields=None):
         """Return repository branches from a given username.
 
         Args:
             username: Github username.
             repository_name: An existent user's repository name.
             access_token: GitHub OAuth2 access token.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
         """
         return self._complete_request_by_name(
-            username, repository_name, "branches", access_token)
+            username, repository_name, "branches", access_token, fields)
 
-    def tags_by_name(self, username, repository_name, access_token=None):
+    def tags_by_name(self, username, repository_name, access_token=None, fields=None):
         """Return repository tags from a given username.
 
         Args:
             username: Github username.
             repository_name: An existent user's repository name.
             access_token: GitHub OAuth2 access token.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
         """
         return self._complete_request_by_name(
-            username, repository_name, "tags", access_token)
+            username, repository_name, "tags", access_token, fields)
 
     def languages_by_name(self, username, repository_name, access_token=None):
         """Return repository languages from a given username.
@@ -201,27 +466,31 @@ class RepositoryApi(BaseRequest):
         return self._complete_request_by_name(
             username, repository_name, "languages", access_token)
 
-    def subscribers_by_name(self, username, repository_name, access_token=None):
+    def subscribers_by_name(self, username, repository_name, access_token=None, fields=None):
         """Return repository subscribers from a given username.
 
         Args:
             username: Github username.
             repository_name: An existent user's repository name.
             access_token: GitHub OAuth2 access token.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
         """
         return self._complete_request_by_name(
-            username, repository_name, "subscribers", access_token)
+            username, repository_name, "subscribers", access_token, fields)
 
-    def comments_by_name(self, username, repository_name, access_token=None):
+    def comments_by_name(self, username, repository_name, access_token=None, fields=None):
         """Return repository comments from a given username.
 
         Args:
             username: Github username.
             repository_name: An existent user's repository name.
             access_token: GitHub OAuth2 access token.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
         """
         return self._complete_request_by_name(
-            username, repository_name, "comments", access_token)
+            username, repository_name, "comments", access_token, fields)
 
     def contents_by_name(self, username, repository_name, access_token=None):
         """Return repository contents from a given username.
@@ -234,86 +503,110 @@ class RepositoryApi(BaseRequest):
         return self._complete_request_by_name(
             username, repository_name, "contents", access_token)
 
-    def pulls_by_name(self, username, repository_name, access_token=None):
+    def pulls_by_name(self, username, repository_name, access_token=None, fields=None):
         """Return repository pulls from a given username.
 
         Args:
             username: Github username.
             repository_name: An existent user's repository name.
             access_token: GitHub OAuth2 access token.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
         """
         return self._complete_request_by_name(
-            username, repository_name, "pulls", access_token)
+            username, repository_name, "pulls", access_token, fields)
 
-    def labels_by_name(self, username, repository_name, access_token=None):
+    def labels_by_name(self, username, repository_name, access_token=None, fields=None):
         """Return repository labels from a given username.
 
         Args:
             username: Github username.
             repository_name: An existent user's repository name.
             access_token: GitHub OAuth2 access token.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
         """
         return self._complete_request_by_name(
-            username, repository_name, "labels", access_token)
+            username, repository_name, "labels", access_token, fields)
 
-    def commits_by_id(self, repository_id, access_token=None):
+    def commits_by_id(self, repository_id, access_token=None, fields=None, sha=None, since=None, until=None, path=None):
         """Return repository commits from a given username and repository ID.
 
         Args:
             repository_id: An existent user's repository ID.
             access_token: GitHub OAuth2 access token.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
+            sha: Optional branch name or commit SHA to start listing from.
+                Defaults to the default branch.
+            since: Optional datetime or ISO 8601 string. Only commits
+                committed at or after it are returned.
+            until: Optional datetime or ISO 8601 string. Only commits
+                committed at or before it are returned.
+            path: Optional file path. Only commits changing it are returned.
         """
         return self._complete_request_by_id(
-            repository_id, "commits", access_token)
+            repository_id, "commits", access_token, fields,
+            commit_filters(sha, since, until, path))
 
-    def contributors_by_id(self, repository_id, access_token=None):
+    def contributors_by_id(self, repository_id, access_token=None, fields=None):
         """Return repository contributors from a given username and repository ID.
 
         Args:
             repository_id: An existent user's repository ID.
             access_token: GitHub OAuth2 access token.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
         """
         return self._complete_request_by_id(
-            repository_id, "contributors", access_token)
+            repository_id, "contributors", access_token, fields)
 
-    def issues_by_id(self, repository_id, access_token=None):
+    def issues_by_id(self, repository_id, access_token=None, fields=None):
         """Return repository issues from a given username and repository ID.
 
         Args:
             repository_id: An existent user's repository ID.
             access_token: GitHub OAuth2 access token.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
         """
         return self._complete_request_by_id(
-            repository_id, "issues", access_token)
+            repository_id, "issues", access_token, fields)
 
-    def events_by_id(self, repository_id, access_token=None):
+    def events_by_id(self, repository_id, access_token=None, fields=None):
         """Return repository events from a given username and repository ID.
 
         Args:
             repository_id: An existent user's repository ID.
             access_token: GitHub OAuth2 access token.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
         """
         return self._complete_request_by_id(
-            repository_id, "events", access_token)
+            repository_id, "events", access_token, fields)
 
-    def branches_by_id(self, repository_id, access_token=None):
+    def branches_by_id(self, repository_id, access_token=None, fields=None):
         """Return repository branches from a given username and repository ID.
 
         Args:
             repository_id: An existent user's repository ID.
             access_token: GitHub OAuth2 access token.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
         """
         return self._complete_request_by_id(
-            repository_id, "branches", access_token)
+            repository_id, "branches", access_token, fields)
 
-    def tags_by_id(self, repository_id, access_token=None):
+    def tags_by_id(self, repository_id, access_token=None, fields=None):
         """Return repository tags from a given username and repository ID.
 
         Args:
             repository_id: An existent user's repository ID.
             access_token: GitHub OAuth2 access token.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
         """
-        return self._complete_request_by_id(repository_id, "tags", access_token)
+        return self._complete_request_by_id(repository_id, "tags", access_token, fields)
 
     def languages_by_id(self, repository_id, access_token=None):
         """Return languages tags from a given username and repository ID.
@@ -325,25 +618,29 @@ class RepositoryApi(BaseRequest):
         return self._complete_request_by_id(
             repository_id, "languages", access_token)
 
-    def subscribers_by_id(self, repository_id, access_token=None):
+    def subscribers_by_id(self, repository_id, access_token=None, fields=None):
         """Return subscribers tags from a given username and repository ID.
 
         Args:
             repository_id: An existent user's repository ID.
             access_token: GitHub OAuth2 access token.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
         """
         return self._complete_request_by_id(
-            repository_id, "subscribers", access_token)
+            repository_id, "subscribers", access_token, fields)
 
-    def comments_by_id(self, repository_id, access_token=None):
+    def comments_by_id(self, repository_id, access_token=None, fields=None):
         """Return comments tags from a given username and repository ID.
 
         Args:
             repository_id: An existent user's repository ID.
             access_token: GitHub OAuth2 access token.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
         """
         return self._complete_request_by_id(
-            repository_id, "comments", access_token)
+            repository_id, "comments", access_token, fields)
 
     def contents_by_id(self, repository_id, access_token=None):
         """Return contents tags from a given username and repository ID.
@@ -355,89 +652,520 @@ class RepositoryApi(BaseRequest):
         return self._complete_request_by_id(
             repository_id, "contents", access_token)
 
-    def pulls_by_id(self, repository_id, access_token=None):
+    def pulls_by_id(self, repository_id, access_token=None, fields=None):
         """Return pulls tags from a given username and repository ID.
 
         Args:
             repository_id: An existent user's repository ID.
             access_token: GitHub OAuth2 access token.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
         """
         return self._complete_request_by_id(
-            repository_id, "pulls", access_token)
+            repository_id, "pulls", access_token, fields)
 
-    def labels_by_id(self, repository_id, access_token=None):
+    def labels_by_id(self, repository_id, access_token=None, fields=None):
         """Return labels tags from a given username and repository ID.
 
         Args:
             repository_id: An existent user's repository ID.
             access_token: GitHub OAuth2 access token.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
         """
         return self._complete_request_by_id(
-            repository_id, "labels", access_token)
+            repository_id, "labels", access_token, fields)
+
+    def iter_commits_by_name(self, username, repository_name, access_token=None, limit=None, fields=None, sha=None, since=None, until=None, path=None):
+        """Lazily iterate over all repository commits from a given username.
+
+        Args:
+            username: Github username.
+            repository_name: An existent user's repository name.
+            access_token: GitHub OAuth2 access token.
+            limit: Maximum number of items to be returned. None means all.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
+            sha: Optional branch name or commit SHA to start listing from.
+                Defaults to the default branch.
+            since: Optional datetime or ISO 8601 string. Only commits
+                committed at or after it are returned.
+            until: Optional datetime or ISO 8601 string. Only commits
+                committed at or before it are returned.
+            path: Optional file path. Only commits changing it are returned.
+        """
+        return self._iterate_request_by_name(
+            username, repository_name, "commits", access_token, limit, fields,
+            commit_filters(sha, since, until, path))
+
+    def iter_contributors_by_name(self, username, repository_name, access_token=None, limit=None, fields=None):
+        """Lazily iterate over all repository contributors from a given username.
+
+        Args:
+            username: Github username.
+            repository_name: An existent user's repository name.
+            access_token: GitHub OAuth2 access token.
+            limit: Maximum number of items to be returned. None means all.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
+        """
+        return self._iterate_request_by_name(
+            username, repository_name, "contributors", access_token, limit, fields)
+
+    def iter_issues_by_name(self, username, repository_name, access_token=None, limit=None, fields=None):
+        """Lazily iterate over all repository issues from a given username.
+
+        Args:
+            username: Github username.
+            repository_name: An existent user's repository name.
+            access_token: GitHub OAuth2 access token.
+            limit: Maximum number of items to be returned. None means all.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
+        """
+        return self._iterate_request_by_name(
+            username, repository_name, "issues", access_token, limit, fields)
+
+    def iter_events_by_name(self, username, repository_name, access_token=None, limit=None, fields=None):
+        """Lazily iterate over all repository events from a given username.
+
+        Args:
+            username: Github username.
+            repository_name: An existent user's repository name.
+            access_token: GitHub OAuth2 access token.
+            limit: Maximum number of items to be returned. None means all.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
+        """
+        return self._iterate_request_by_name(
+            username, repository_name, "events", access_token, limit, fields)
+
+    def iter_branches_by_name(self, username, repository_name, access_token=None, limit=None, fields=None):
+        """Lazily iterate over all repository branches from a given username.
 
-    def _complete_request_by_name(self, username, repository_name, complement, access_token):
+        Args:
+            username: Github username.
+            repository_name: An existent user's repository name.
+            access_token: GitHub OAuth2 access token.
+            limit: Maximum number of items to be returned. None means all.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
+        """
+        return self._iterate_request_by_name(
+            username, repository_name, "branches", access_token, limit, fields)
+
+    def iter_tags_by_name(self, username, repository_name, access_token=None, limit=None, fields=None):
+        """Lazily iterate over all repository tags from a given username.
+
+        Args:
+            username: Github username.
+            repository_name: An existent user's repository name.
+            access_token: GitHub OAuth2 access token.
+            limit: Maximum number of items to be returned. None means all.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
+        """
+        return self._iterate_request_by_name(
+            username, repository_name, "tags", access_token, limit, fields)
+
+    def iter_subscribers_by_name(self, username, repository_name, access_token=None, limit=None, fields=None):
+        """Lazily iterate over all repository subscribers from a given username.
+
+        Args:
+            username: Github username.
+            repository_name: An existent user's repository name.
+            access_token: GitHub OAuth2 access token.
+            limit: Maximum number of items to be returned. None means all.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
+        """
+        return self._iterate_request_by_name(
+            username, repository_name, "subscribers", access_token, limit, fields)
+
+    def iter_comments_by_name(self, username, repository_name, access_token=None, limit=None, fields=None):
+        """Lazily iterate over all repository comments from a given username.
+
+        Args:
+            username: Github username.
+            repository_name: An existent user's repository name.
+            access_token: GitHub OAuth2 access token.
+            limit: Maximum number of items to be returned. None means all.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
+        """
+        return self._iterate_request_by_name(
+            username, repository_name, "comments", access_token, limit, fields)
+
+    def iter_pulls_by_name(self, username, repository_name, access_token=None, limit=None, fields=None):
+        """Lazily iterate over all repository pulls from a given username.
+
+        Args:
+            username: Github username.
+            repository_name: An existent user's repository name.
+            access_token: GitHub OAuth2 access token.
+            limit: Maximum number of items to be returned. None means all.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
+        """
+        return self._iterate_request_by_name(
+            username, repository_name, "pulls", access_token, limit, fields)
+
+    def iter_labels_by_name(self, username, repository_name, access_token=None, limit=None, fields=None):
+        """Lazily iterate over all repository labels from a given username.
+
+        Args:
+            username: Github username.
+            repository_name: An existent user's repository name.
+            access_token: GitHub OAuth2 access token.
+            limit: Maximum number of items to be returned. None means all.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
+        """
+        return self._iterate_request_by_name(
+            username, repository_name, "labels", access_token, limit, fields)
+
+    def iter_commits_by_id(self, repository_id, access_token=None, limit=None, fields=None, sha=None, since=None, until=None, path=None):
+        """Lazily iterate over all repository commits from a given repository ID.
+
+        Args:
+            repository_id: An existent user's repository ID.
+            access_token: GitHub OAuth2 access token.
+            limit: Maximum number of items to be returned. None means all.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
+            sha: Optional branch name or commit SHA to start listing from.
+                Defaults to the default branch.
+            since: Optional datetime or ISO 8601 string. Only commits
+                committed at or after it are returned.
+            until: Optional datetime or ISO 8601 string. Only commits
+                committed at or before it are returned.
+            path: Optional file path. Only commits changing it are returned.
+        """
+        return self._iterate_request_by_id(
+            repository_id, "commits", access_token, limit, fields,
+            commit_filters(sha, since, until, path))
+
+    def iter_contributors_by_id(self, repository_id, access_token=None, limit=None, fields=None):
+        """Lazily iterate over all repository contributors from a given repository ID.
+
+        Args:
+            repository_id: An existent user's repository ID.
+            access_token: GitHub OAuth2 access token.
+            limit: Maximum number of items to be returned. None means all.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
+        """
+        return self._iterate_request_by_id(
+            repository_id, "contributors", access_token, limit, fields)
+
+    def iter_issues_by_id(self, repository_id, access_token=None, limit=None, fields=None):
+        """Lazily iterate over all repository issues from a given repository ID.
+
+        Args:
+            repository_id: An existent user's repository ID.
+            access_token: GitHub OAuth2 access token.
+            limit: Maximum number of items to be returned. None means all.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
+        """
+        return self._iterate_request_by_id(
+            repository_id, "issues", access_token, limit, fields)
+
+    def iter_events_by_id(self, repository_id, access_token=None, limit=None, fields=None):
+        """Lazily iterate over all repository events from a given repository ID.
+
+        Args:
+            repository_id: An existent user's repository ID.
+            access_token: GitHub OAuth2 access token.
+            limit: Maximum number of items to be returned. None means all.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
+        """
+        return self._iterate_request_by_id(
+            repository_id, "events", access_token, limit, fields)
+
+    def iter_branches_by_id(self, repository_id, access_token=None, limit=None, fields=None):
+        """Lazily iterate over all repository branches from a given repository ID.
+
+        Args:
+            repository_id: An existent user's repository ID.
+            access_token: GitHub OAuth2 access token.
+            limit: Maximum number of items to be returned. None means all.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
+        """
+        return self._iterate_request_by_id(
+            repository_id, "branches", access_token, limit, fields)
+
+    def iter_tags_by_id(self, repository_id, access_token=None, limit=None, fields=None):
+        """Lazily iterate over all repository tags from a given repository ID.
+
+        Args:
+            repository_id: An existent user's repository ID.
+            access_token: GitHub OAuth2 access token.
+            limit: Maximum number of items to be returned. None means all.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
+        """
+        return self._iterate_request_by_id(
+            repository_id, "tags", access_token, limit, fields)
+
+    def iter_subscribers_by_id(self, repository_id, access_token=None, limit=None, fields=None):
+        """Lazily iterate over all repository subscribers from a given repository ID.
+
+        Args:
+            repository_id: An existent user's repository ID.
+            access_token: GitHub OAuth2 access token.
+            limit: Maximum number of items to be returned. None means all.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
+        """
+        return self._iterate_request_by_id(
+            repository_id, "subscribers", access_token, limit, fields)
+
+    def iter_comments_by_id(self, repository_id, access_token=None, limit=None, fields=None):
+        """Lazily iterate over all repository comments from a given repository ID.
+
+        Args:
+            repository_id: An existent user's repository ID.
+            access_token: GitHub OAuth2 access token.
+            limit: Maximum number of items to be returned. None means all.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
+        """
+        return self._iterate_request_by_id(
+            repository_id, "comments", access_token, limit, fields)
+
+    def iter_pulls_by_id(self, repository_id, access_token=None, limit=None, fields=None):
+        """Lazily iterate over all repository pulls from a given repository ID.
+
+        Args:
+            repository_id: An existent user's repository ID.
+            access_token: GitHub OAuth2 access token.
+            limit: Maximum number of items to be returned. None means all.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
+        """
+        return self._iterate_request_by_id(
+            repository_id, "pulls", access_token, limit, fields)
+
+    def iter_labels_by_id(self, repository_id, access_token=None, limit=None, fields=None):
+        """Lazily iterate over all repository labels from a given repository ID.
+
+        Args:
+            repository_id: An existent user's repository ID.
+            access_token: GitHub OAuth2 access token.
+            limit: Maximum number of items to be returned. None means all.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
+        """
+        return self._iterate_request_by_id(
+            repository_id, "labels", access_token, limit, fields)
+
+    def _complete_request_by_name(self, username, repository_name, complement, access_token, fields=None, params=None):
         """Complements a repository data request by name.
 
         Args:
             username: Github username.
             repository_name: An existent user's repository name.
+            complement: A resource to be requested.
             access_token: GitHub OAuth2 access token.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
+            params: Optional dict of query string filters.
         """
-        url = "{0}/repos/{1}/{2}/{3}{4}"
+        url = "{0}/repos/{1}/{2}/{3}"
         access_token = self.get_token(access_token)
-        token_arg = ''
 
-        if access_token != '':
-            token_arg = "?access_token={}".format(access_token)
-
-        response = requests.get(
+        response = self._get(
             url.format(
-                self.ROOT_API_URL, username, repository_name, complement,
-                token_arg
-            )
-        )
+                self.ROOT_API_URL, username, repository_name, complement),
+            access_token, params=params)
 
-        self._check_common_status_code(response, access_token)
+        self._check_status_by_name(
+            response, username, repository_name, access_token)
 
-        if response.status_code == requests.codes.not_found:
-            raise RepositoryNameNotFoundError(
-                {'repository_name': repository_name, 'username': username})
-
-        return response.json()
+        return project_list(self._json(response), fields)
 
-    def _complete_request_by_id(self, repository_id, complement, access_token):
+    def _complete_request_by_id(self, repository_id, complement, access_token, fields=None, params=None):
         """Complements a repository data request by ID.
 
         Args:
             repository_id: An existent user's repository ID.
             complement: A resource to be requested.
             access_token: GitHub OAuth2 access token.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
+            params: Optional dict of query string filters.
         """
-        url = "{0}/repositories/{1}/{2}{3}"
+        url = "{0}/repositories/{1}/{2}"
         access_token = self.get_token(access_token)
-        token_arg = ''
 
-        if access_token != '':
-            token_arg = "?access_token={}".format(access_token)
+        response = self._get(
+            url.format(self.ROOT_API_URL, repository_id, complement),
+            access_token, params=params)
+
+        self._check_status_by_id(response, repository_id, access_token)
+
+        return project_list(self._json(response), fields)
 
-        response = requests.get(
-            url.format(self.ROOT_API_URL, repository_id, complement, token_arg))
+    def _iterate_request_by_name(self, username, repository_name, complement, access_token, limit, fields=None, params=None):
+        """Lazily iterate over all pages of a repository resource by name.
+
+        Args:
+            username: Github username.
+            repository_name: An existent user's repository name.
+            complement: A resource to be requested.
+            access_token: GitHub OAuth2 access token.
+            limit: Maximum number of items to be returned. None means all.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
+            params: Optional dict of query string filters.
+        """
+        url = "{0}/repos/{1}/{2}/{3}"
+        access_token = self.get_token(access_token)
+
+        return self._paginate(
+            url.format(
+                self.ROOT_API_URL, username, repository_name, complement),
+            access_token,
+            lambda response: self._check_status_by_name(
+                response, username, repository_name, access_token),
+            limit=limit, fields=fields, params=params)
+
+    def _iterate_request_by_id(self, repository_id, complement, access_token, limit, fields=None, params=None):
+        """Lazily iterate over all pages of a repository resource by ID.
+
+        Args:
+            repository_id: An existent user's repository ID.
+            complement: A resource to be requested.
+            access_token: GitHub OAuth2 access token.
+            limit: Maximum number of items to be returned. None means all.
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
+            params: Optional dict of query string filters.
+        """
+        url = "{0}/repositories/{1}/{2}"
+        access_token = self.get_token(access_token)
 
+        return self._paginate(
+            url.format(self.ROOT_API_URL, repository_id, complement),
+            access_token,
+            lambda response: self._check_status_by_id(
+                response, repository_id, access_token),
+            limit=limit, fields=fields, params=params)
+
+    def _url_by_name(self, username, repository_name):
+        """Return the API URL of a repository by name."""
+        return "{0}/repos/{1}/{2}".format(
+            self.ROOT_API_URL, username, repository_name)
+
+    def _url_by_id(self, repository_id):
+        """Return the API URL of a repository by ID."""
+        return "{0}/repositories/{1}".format(self.ROOT_API_URL, repository_id)
+
+    def _status_checker_by_name(self, username, repository_name):
+        """Return a callable(response, access_token) for requests by name."""
+        return lambda response, access_token: self._check_status_by_name(
+            response, username, repository_name, access_token)
+
+    def _status_checker_by_id(self, repository_id):
+        """Return a callable(response, access_token) for requests by ID."""
+        return lambda response, access_token: self._check_status_by_id(
+            response, repository_id, access_token)
+
+    def _tree(self, url, check_status, ref, access_token, patterns, min_size, max_size):
+        """Request the recursive tree of a repository and filter its files.
+
+        Args:
+            url: The API URL of the repository.
+            check_status: Callable(response, access_token) that raises the
+                proper exception for error status codes.
+            ref: A branch, tag or commit SHA or None for HEAD.
+            access_token: GitHub OAuth2 access token.
+            patterns: Optional glob pattern or list of patterns.
+            min_size: Optional minimum file size in bytes.
+            max_size: Optional maximum file size in bytes.
+
+        Returns:
+            dict: The tree data. See tree_by_name.
+
+        """
+        access_token = self.get_token(access_token)
+        response = self._get(
+            "{0}/git/trees/{1}".format(url, ref or 'HEAD'), access_token,
+            params={'recursive': 1})
+
+        # An empty repository has no tree
+        if response.status_code == requests.codes.conflict:
+            return {'sha': None, 'truncated': False, 'tree': []}
+
+        check_status(response, access_token)
+
+        return filter_tree(self._json(response), patterns, min_size, max_size)
+
+    def _download_files(self, url, check_status, directory, ref, access_token, patterns, min_size, max_size, max_workers, chunk_size):
+        """Download the blobs of the files of a tree into a directory.
+
+        See download_by_name.
+
+        Returns:
+            list: The paths of the downloaded files, relative to directory.
+
+        """
+        tree = self._tree(url, check_status, ref, access_token, patterns,
+                          min_size, max_size)
+        downloads = plan_downloads(tree, directory)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    self._download_blob, url, check_status, entry, path,
+                    access_token, chunk_size)
+                for entry, path in downloads]
+
+            for future in futures:
+                future.result()
+
+        return [entry['path'] for entry, _ in downloads]
+
+    def _download_blob(self, url, check_status, entry, path, access_token, chunk_size):
+        """Stream the raw content of a blob to a file."""
+        access_token = self.get_token(access_token)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._download(
+            "{0}/git/blobs/{1}".format(url, entry['sha']), access_token, path,
+            lambda response: check_status(response, access_token),
+            headers={'Accept': 'application/vnd.github.v3.raw'},
+            chunk_size=chunk_size)
+
+        if entry['mode'] == EXECUTABLE_MODE:
+            os.chmod(path, os.stat(path).st_mode | 0o111)
+
+    def _tarball(self, url, check_status, path, ref, access_token, chunk_size):
+        """Stream the tar.gz archive of a repository. See tarball_by_name."""
+        access_token = self.get_token(access_token)
+        url = "{0}/tarball".format(url)
+
+        if ref:
+            url = "{0}/{1}".format(url, ref)
+
+        return self._download(
+            url, access_token, path,
+            lambda response: check_status(response, access_token),
+            chunk_size=chunk_size)
+
+    def _check_status_by_name(self, response, username, repository_name, access_token):
+        """Check status codes of a request made by repository name."""
         self._check_common_status_code(response, access_token)
 
         if response.status_code == requests.codes.not_found:
-            raise RepositoryIdNotFoundError({'repository_id': repository_id})
-
-        return response.json()
+            raise RepositoryNameNotFoundError(
+                {'repository_name': repository_name, 'username': username})
 
-    def _check_common_status_code(self, response, access_token):
-        remaining = int(response.headers['X-RateLimit-Remaining'])
+    def _check_status_by_id(self, response, repository_id, access_token):
+        """Check status codes of a request made by repository ID."""
+        self._check_common_status_code(response, access_token)
 
-        if response.status_code == requests.codes.forbidden and remaining == 0:
-            raise ApiRateLimitError(
-                {'X-RateLimit-Remaining': remaining,
-                 'X-RateLimit-Limit': response.headers['X-RateLimit-Limit']})
-        elif response.status_code == requests.codes.unauthorized:
-            raise InvalidTokenError({'access_token': access_token})
-        elif response.status_code >= 500 and response.status_code <= 509:
-            raise ApiError()
+        if response.status_code == requests.codes.not_found:
+            raise RepositoryIdNotFoundError({'repository_id': repository_id})
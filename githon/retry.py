@@ -0,0 +1,121 @@
+# coding: utf-8
+"""Module with the retry policy of transient request failures."""
+
+import random
+import threading
+
+RETRY_STATUS_CODES = tuple(range(500, 510)) + (429,)
+
+
+class RetryPolicy:
+    """Decide if and when a failed request is sent again.
+
+    Server errors (5xx), 429 Too Many Requests, GitHub secondary rate limit
+    403 responses with a Retry-After header and connection errors or
+    timeouts are retried with exponential backoff and full jitter. The
+    Retry-After header, when present, is honored.
+
+    A retry budget keeps a failing server from being flooded: at most
+    budget_min plus budget_ratio of the requests sent may be retries.
+
+    Args:
+        max_attempts: Maximum number of attempts of a request, the first
+            one included.
+        backoff: Base delay in seconds, doubled at each attempt.
+        max_backoff: Maximum delay in seconds.
+        jitter: Randomize the delay between zero and the backoff.
+        budget_ratio: Fraction of the requests that may be retries.
+        budget_min: Number of retries always allowed.
+    """
+
+    def __init__(self, max_attempts=5, backoff=1.0, max_backoff=60.0, jitter=True, budget_ratio=0.2, budget_min=10):
+        """Constructor."""
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.budget_ratio = budget_ratio
+        self.budget_min = budget_min
+        self.requests = 0
+        self.retries = 0
+        self.exhausted = 0
+        self.reasons = {}
+        self._lock = threading.Lock()
+
+    def delay(self, attempt, response=None, error=None):
+        """Return how long to wait before retrying a request.
+
+        Args:
+            attempt: Number of the attempt that just failed, from 1.
+            response: HTTP Response object of the attempt, if any.
+            error: Connection or timeout exception of the attempt, if any.
+
+        Returns:
+            float: Seconds to wait before the next attempt or None if the
+                request must not be retried.
+
+        """
+        with self._lock:
+            if attempt == 1:
+                self.requests += 1
+
+            reason = self._reason(response, error)
+
+            if reason is None:
+                return None
+
+            budget = self.budget_min + self.budget_ratio * self.requests
+
+            if attempt >= self.max_attempts or self.retries >= budget:
+                self.exhausted += 1
+                return None
+
+            self.retries += 1
+            self.reasons[reason] = self.reasons.get(reason, 0) + 1
+
+        retry_after = self._retry_after(response)
+
+        if retry_after is not None:
+            return retry_after
+
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def _reason(self, response, error):
+        """Return why a request should be retried or None."""
+        if error is not None:
+            return 'connection'
+
+        if response is None:
+            return None
+
+        if response.status_code in RETRY_STATUS_CODES:
+            return str(response.status_code)
+
+        if response.status_code == 403 and 'Retry-After' in response.headers:
+            return 'secondary_rate_limit'
+
+        return None
+
+    def _retry_after(self, response):
+        """Return the Retry-After header in seconds, if any."""
+        if response is None:
+            return None
+
+        value = response.headers.get('Retry-After', '')
+
+        return float(value) if value.isdigit() else None
+
+    def stats(self):
+        """Return the retry counters, for monitoring.
+
+        Returns:
+            dict: Number of requests, retries, requests that ran out of
+                attempts or budget and retries by reason.
+
+        """
+        with self._lock:
+            return {'requests': self.requests, 'retries': self.retries,
+                    'exhausted': self.exhausted,
+                    'reasons': dict(self.reasons)}
@@ -0,0 +1,185 @@
+# coding: utf-8
+"""Module with a search crawler that bypasses the 1000 results cap."""
+
+import datetime
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+class SearchCrawler:
+    """Crawl every user that matches a query with GithubApi.search_users.
+
+    GitHub returns at most 1000 results per search, so the query is split
+    into disjoint ranges of a qualifier (e.g. created:2015-01-01..2015-06-30)
+    and every range with more than 1000 results is bisected again. The
+    ranges are requested concurrently within the search rate limit.
+    'created' ranges of a single day are bisected by time of day.
+    See more in https://developer.github.com/v3/search/.
+
+    Ranges that still have more than 1000 results once they cannot be
+    split, and searches answered with incomplete_results (GitHub timed
+    out), only yield part of their users. They are listed in incomplete
+    after each crawl.
+
+    Args:
+        api: A GithubApi object.
+        access_token: GitHub OAuth2 access token.
+        max_workers: Maximum number of concurrent searches.
+        requests_per_minute: Search rate limit of the token (30 for
+            authenticated requests, 10 for anonymous ones).
+
+    Attributes:
+        incomplete: List of (query, total_count) of the ranges of the last
+            crawl whose users were not all returned.
+    """
+
+    MAX_RESULTS = 1000
+    PER_PAGE = 100
+
+    # Default bounds of each supported qualifier
+    RANGES = {
+        'created': (datetime.date(2007, 10, 1), None),
+        'followers': (0, 10 ** 7),
+        'repos': (0, 10 ** 6),
+    }
+
+    def __init__(self, api, access_token=None, max_workers=4, requests_per_minute=30):
+        """Constructor."""
+        self.api = api
+        self.access_token = access_token
+        self.max_workers = max_workers
+        self.interval = 60.0 / requests_per_minute
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+        self.incomplete = []
+
+    def crawl(self, query, field='created', start=None, end=None):
+        """Lazily yield every user that matches a query.
+
+        Args:
+            query: A Github users query, e.g. 'location:brazil'.
+            field: The qualifier used to shard the query: 'created',
+                'followers' or 'repos'.
+            start: First value of the range. Defaults to RANGES.
+            end: Last value of the range. Defaults to RANGES (today for
+                'created').
+
+        Yields:
+            dict: Each matching user, only once.
+
+        """
+        default_start, default_end = self.RANGES[field]
+        start = default_start if start is None else start
+        end = default_end if end is None else end
+
+        if end is None:
+            end = datetime.date.today()
+
+        seen = set()
+        pending = set()
+        self.incomplete = []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending.add(executor.submit(
+                self._crawl_range, query, field, start, end))
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    ranges, users = future.result()
+
+                    for low, high in ranges:
+                        pending.add(executor.submit(
+                            self._crawl_range, query, field, low, high))
+
+                    for user in users:
+                        if user['id'] not in seen:
+                            seen.add(user['id'])
+                            yield user
+
+    def _crawl_range(self, query, field, low, high):
+        """Request all users of a range or split it.
+
+        Args:
+            query: A Github users query.
+            field: The qualifier used to shard the query.
+            low: First value of the range.
+            high: Last value of the range.
+
+        Returns:
+            tuple: The list of sub-ranges to be crawled and the list of
+                users of the range.
+
+        """
+        range_query = '{0} {1}:{2}..{3}'.format(
+            query, field, self._format(low), self._format(high))
+        data = self._search(range_query, 1)
+        total = data['total_count']
+
+        if total > self.MAX_RESULTS:
+            # A single day is split again by time of day
+            if low == high and type(low) is datetime.date:
+                low = datetime.datetime(low.year, low.month, low.day)
+                high = low + datetime.timedelta(days=1, seconds=-1)
+
+            if low < high:
+                middle = self._middle(low, high)
+                return [(low, middle), (self._next(middle), high)], []
+
+        users = list(data['items'])
+        pages = -(-min(total, self.MAX_RESULTS) // self.PER_PAGE)
+        incomplete = total > self.MAX_RESULTS or data['incomplete_results']
+
+        for page in range(2, pages + 1):
+            data = self._search(range_query, page)
+            users.extend(data['items'])
+            incomplete = incomplete or data['incomplete_results']
+
+        if incomplete:
+            self.incomplete.append((range_query, total))
+
+        return [], users
+
+    def _search(self, query, page):
+        """Request a search results page within the rate limit."""
+        with self._lock:
+            now = time.time()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+
+        if slot > now:
+            time.sleep(slot - now)
+
+        return self.api.search_users(
+            'q={0}&page={1}&per_page={2}'.format(query, page, self.PER_PAGE),
+            self.access_token)
+
+    def _middle(self, low, high):
+        """Return the middle value of a range."""
+        if isinstance(low, datetime.datetime):
+            return low + datetime.timedelta(
+                seconds=int((high - low).total_seconds()) // 2)
+
+        if isinstance(low, datetime.date):
+            return low + datetime.timedelta(days=(high - low).days // 2)
+
+        return (low + high) // 2
+
+    def _next(self, value):
+        """Return the value that follows another one."""
+        if isinstance(value, datetime.datetime):
+            return value + datetime.timedelta(seconds=1)
+
+        if isinstance(value, datetime.date):
+            return value + datetime.timedelta(days=1)
+
+        return value + 1
+
+    def _format(self, value):
+        """Return a range bound as a search qualifier value."""
+        if isinstance(value, datetime.datetime):
+            return value.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+        return value
@@ -0,0 +1,132 @@
+# coding: utf-8
+"""Module with the access token pool used to spread requests over tokens."""
+
+import threading
+import time
+from .exceptions import ApiRateLimitError, InvalidTokenError
+
+# GitHub REST API v3 limit for authenticated requests
+DEFAULT_RATE_LIMIT = 5000
+
+
+class TokenState:
+    """Known rate limit state of a single access token."""
+
+    __slots__ = ('token', 'remaining', 'limit', 'reset', 'dead')
+
+    def __init__(self, token):
+        """Constructor."""
+        self.token = token
+        self.remaining = DEFAULT_RATE_LIMIT
+        self.limit = DEFAULT_RATE_LIMIT
+        self.reset = 0
+        self.dead = False
+
+
+class TokenPool:
+    """Thread-safe pool of access tokens with rate-limit-aware rotation.
+
+    Each request is routed to the live token with the most remaining
+    requests. A token that reaches its rate limit is taken out of rotation
+    until its X-RateLimit-Reset time and a token rejected with 401
+    Unauthorized is discarded. The pool tracks the core budget of the
+    tokens, the search and GraphQL budgets do not change it.
+
+    Args:
+        tokens: Iterable of GitHub OAuth2 access tokens.
+    """
+
+    def __init__(self, tokens):
+        """Constructor."""
+        self._states = {token: TokenState(token) for token in tokens}
+        self._lock = threading.Lock()
+
+    def __contains__(self, token):
+        return token in self._states
+
+    def __len__(self):
+        return len(self._states)
+
+    def acquire(self):
+        """Choose the token to be used by the next request.
+
+        Returns:
+            str: The live token with the most remaining requests.
+
+        Raises:
+            ApiRateLimitError: All live tokens have reached their rate limit.
+            InvalidTokenError: All tokens are invalid or expired.
+
+        """
+        now = time.time()
+
+        with self._lock:
+            live = [state for state in self._states.values() if not state.dead]
+
+            if not live:
+                raise InvalidTokenError({'access_token': None})
+
+            for state in live:
+                if state.remaining <= 0 and state.reset <= now:
+                    state.remaining = state.limit
+
+            available = [state for state in live if state.remaining > 0]
+
+            if not available:
+                raise ApiRateLimitError(
+                    {'X-RateLimit-Remaining': 0,
+                     'X-RateLimit-Limit': sum(s.limit for s in live),
+                     'X-RateLimit-Reset': min(s.reset for s in live)})
+
+            state = max(available, key=lambda state: state.remaining)
+            # Reserve the request, so concurrent callers spread over tokens
+            state.remaining -= 1
+
+            return state.token
+
+    def update(self, token, response, resource='core'):
+        """Update the state of a token from the response of its request.
+
+        Args:
+            token: The access token used by the request.
+            response: HTTP Response object.
+            resource: The resource the request was charged against. The
+                X-RateLimit-Resource header has priority over it.
+        """
+        state = self._states.get(token)
+
+        if state is None:
+            return
+
+        headers = response.headers
+        resource = headers.get('X-RateLimit-Resource', resource)
+
+        with self._lock:
+            if response.status_code == 401:
+                state.dead = True
+                return
+
+            # A search or GraphQL budget must not replace the core one
+            if resource != 'core':
+                return
+
+            if 'X-RateLimit-Remaining' in headers:
+                state.remaining = int(headers['X-RateLimit-Remaining'])
+            if 'X-RateLimit-Limit' in headers:
+                state.limit = int(headers['X-RateLimit-Limit'])
+            # A token with no remaining requests stays out of rotation
+            # until its reset time, see acquire
+            if 'X-RateLimit-Reset' in headers:
+                state.reset = int(headers['X-RateLimit-Reset'])
+
+    def states(self):
+        """Return a snapshot of the known state of every token.
+
+        Returns:
+            list: Dicts with remaining, limit, reset and dead of each token.
+
+        """
+        with self._lock:
+            return [{'remaining': state.remaining, 'limit': state.limit,
+                     'reset': state.reset, 'dead': state.dead}
+                    for state in self._states.values()]
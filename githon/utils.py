@@ -1,10 +1,212 @@
 # coding: utf-8
 """Module with connection utilities."""
 
+import datetime
+import json
+import os
+import re
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
 from urllib.parse import quote_plus
-from dateutil.parser import parse
-from .exceptions import InvalidDateTimeFormat
+from urllib.request import getproxies
+from .records import project
+from .metrics import RequestEvent, endpoint_template
+from .ratelimit import RateLimitTracker, resource_of
+from .cache import CachedResponse, make_cache_key, SKIPPED_HEADERS
+from .exceptions import (InvalidDateTimeFormat, InvalidTokenError, ApiError,
+                         ApiRateLimitError)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def decode_json(content):
+    """Decode a JSON response body with the fastest decoder installed.
+
+    orjson is used when installed (pip install githon[fast]), decoding
+    straight from the raw bytes. Otherwise the standard json module is used.
+
+    Args:
+        content: The response body, as bytes.
+
+    Returns:
+        The decoded data.
+
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+
+    return json.loads(content)
+
+
+def create_session(pool_connections=10, pool_maxsize=20, keep_alive=True, gzip=True, trust_env=None, http2=False):
+    """Create a pooled HTTP session to be shared by API objects.
+
+    Args:
+        pool_connections: Number of connection pools (one per host) to cache.
+        pool_maxsize: Maximum number of connections kept alive per host.
+        keep_alive: Reuse TCP/TLS connections between requests.
+        gzip: Ask GitHub for compressed response bodies.
+        trust_env: Read proxies, CA bundles and .netrc credentials from the
+            environment at every request, as requests does by default. It
+            scans the whole os.environ and takes most of the client time of
+            a request, so None reads the CA bundle once and only enables it
+            when the environment sets proxies or a .netrc file.
+        http2: Send the requests with githon.http2.HTTP2Adapter, which
+            multiplexes concurrent requests over few HTTP/2 connections.
+            Requires httpx and h2.
+
+    Returns:
+        requests.Session: The configured session.
+
+    """
+    session = requests.Session()
+
+    if trust_env is None:
+        bundle = os.environ.get('REQUESTS_CA_BUNDLE') or os.environ.get(
+            'CURL_CA_BUNDLE')
+
+        if bundle:
+            session.verify = bundle
+
+        trust_env = _environment_settings_present()
+
+    session.trust_env = trust_env
+
+    if http2:
+        # Imported only when needed, httpx is an optional dependency
+        from .http2 import HTTP2Adapter
+        adapter = HTTP2Adapter(
+            max_connections=pool_maxsize,
+            max_keepalive_connections=pool_maxsize if keep_alive else 0)
+    else:
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['Accept-Encoding'] = 'gzip, deflate' if gzip else 'identity'
+    session.headers['Connection'] = 'keep-alive' if keep_alive else 'close'
+
+    return session
+
+
+ISO_8601 = re.compile(
+    r'(\d{4})-(\d{2})-(\d{2})(?:[T ](\d{2}):(\d{2})(?::(\d{2})(?:\.\d+)?)?)?'
+    r'(Z|[+-]\d{2}:?\d{2})?$')
+
+# English names, whatever the locale (strftime %a and %b are localized)
+WEEKDAYS = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+MONTHS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep',
+          'Oct', 'Nov', 'Dec')
+
+
+def to_datetime(value):
+    """Convert an ISO 8601 or other datetime string to a datetime.
+
+    Args:
+        value: The string to be converted, or a datetime.
+
+    Returns:
+        datetime.datetime: The datetime, in UTC if the value has a
+            timezone.
+
+    Raises:
+        ValueError: The value is not a valid datetime.
+
+    """
+    if not isinstance(value, datetime.datetime):
+        match = ISO_8601.match(value)
+
+        if match is None:
+            # Only unusual formats pay for importing and running dateutil
+            from dateutil.parser import parse
+            value = parse(value)
+        else:
+            *fields, offset = match.groups()
+            value = datetime.datetime(*(int(field or 0) for field in fields))
+
+            if offset and offset != 'Z':
+                sign = -1 if offset[0] == '-' else 1
+                offset = offset[1:].replace(':', '')
+                value -= sign * datetime.timedelta(
+                    hours=int(offset[:2]), minutes=int(offset[2:]))
+
+            return value
+
+    if value.tzinfo is not None:
+        value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+
+    return value
+
+
+def format_rfc1123(value):
+    """Format a UTC datetime as RFC 1123, independently of the locale.
+
+    Args:
+        value: A naive UTC datetime.
+
+    Returns:
+        str: The datetime, e.g. 'Fri, 13 Oct 2017 03:03:57 GMT'.
+
+    """
+    return '{0}, {1:02d} {2} {3:04d} {4:02d}:{5:02d}:{6:02d} GMT'.format(
+        WEEKDAYS[value.weekday()], value.day, MONTHS[value.month - 1],
+        value.year, value.hour, value.minute, value.second)
+
+
+def format_iso8601(value):
+    """Format a datetime or an ISO 8601 string as GitHub timestamps.
+
+    Args:
+        value: A datetime, a date or a datetime string.
+
+    Returns:
+        str: The UTC datetime, e.g. '2017-10-13T03:03:57Z'.
+
+    """
+    if not isinstance(value, datetime.datetime):
+        if isinstance(value, datetime.date):
+            value = datetime.datetime(value.year, value.month, value.day)
+        else:
+            value = to_datetime(value)
+    elif value.tzinfo is not None:
+        value = to_datetime(value)
+
+    return value.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def remove_file(path):
+    """Remove a file, if it exists.
+
+    Args:
+        path: The file path.
+    """
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _environment_settings_present():
+    """Return True if the environment sets proxies or a .netrc file.
+
+    Unlike CA bundles, both depend on the requested URL.
+    """
+    if getproxies():
+        return True
+
+    netrc_files = [os.environ.get('NETRC', '')]
+    netrc_files.extend(
+        os.path.expanduser(name) for name in ('~/.netrc', '~/_netrc'))
+
+    return any(os.path.isfile(name) for name in netrc_files if name)
 
 
 class BaseRequest:
@@ -12,6 +214,536 @@ class BaseRequest:
 
     ROOT_API_URL = 'https://api.github.com'
 
+    _shared_session = None
+    _shared_session_lock = threading.Lock()
+
+    def __init__(self, default_access_token=None, session=None, cache=None, token_pool=None, rate_limit=None, memo=None, retry=None, timeout=None, hooks=None, json_decoder=None):
+        """Constructor.
+
+        Args:
+            default_access_token: The default GitHub access_token.
+            session: Optional requests.Session used for every request. When
+                not provided, a pooled session shared by all API objects is
+                used. See create_session.
+            cache: Optional response cache, such as githon.cache.MemoryCache.
+                When provided, every request is sent with the ETag and
+                Last-Modified of its cached response and a 304 Not Modified
+                is answered with the cached body.
+            token_pool: Optional githon.tokens.TokenPool. When provided,
+                requests without an explicit access_token are spread over
+                its tokens instead of using default_access_token.
+            rate_limit: Optional githon.ratelimit.RateLimitTracker, which
+                records the X-RateLimit-* headers of every response and may
+                throttle the requests. A tracking-only one is created when
+                not provided. It can be shared by many API objects.
+            memo: Optional githon.cache.RequestMemo, which reuses recent
+                responses and lets concurrent identical requests share a
+                single HTTP call.
+            retry: Optional githon.retry.RetryPolicy applied to server
+                errors, connection errors, timeouts and secondary rate
+                limits. Requests are not retried when not provided.
+            timeout: Seconds to wait for the server before giving up, as a
+                number or a (connect, read) tuple. None waits forever.
+            hooks: Optional list of callables that receive a
+                githon.metrics.RequestEvent after every request, such as
+                githon.metrics.MetricsCollector.
+            json_decoder: Optional callable that decodes a response body
+                from bytes. Defaults to githon.utils.decode_json.
+        """
+        self.default_access_token = default_access_token
+        self.session = session
+        self.cache = cache
+        self.token_pool = token_pool
+        self.rate_limit = rate_limit
+
+        if self.rate_limit is None:
+            self.rate_limit = RateLimitTracker()
+
+        self.memo = memo
+        self.retry = retry
+        self.timeout = timeout
+        self.hooks = list(hooks) if hooks else []
+        self.json_decoder = json_decoder or decode_json
+
+    def get_session(self):
+        """Return the HTTP session used by this object.
+
+        Returns:
+            requests.Session: The injected session or the shared pooled one.
+
+        """
+        if self.session is not None:
+            return self.session
+
+        if BaseRequest._shared_session is None:
+            with BaseRequest._shared_session_lock:
+                if BaseRequest._shared_session is None:
+                    BaseRequest._shared_session = create_session()
+
+        return BaseRequest._shared_session
+
+    def _get(self, url, access_token='', headers=None, params=None):
+        """Perform a GET request through the pooled session.
+
+        Args:
+            url: The full URL to be requested.
+            access_token: GitHub OAuth2 access token, if any.
+            headers: Optional dict of extra request headers.
+            params: Optional dict of query string parameters.
+
+        Returns:
+            requests.Response: The HTTP response.
+
+        """
+        params = self._build_params(url, access_token, params)
+
+        # Requests with their own headers (e.g. If-Modified-Since) may
+        # have other answers, so they are never shared
+        if self.memo is None or headers:
+            return self._send(url, access_token, headers, params)
+
+        return self.memo.call(
+            make_cache_key(url, params),
+            lambda: self._send(url, access_token, headers, params))
+
+    def _send(self, url, access_token, headers, params):
+        """Send a GET request through the cache, throttle and session.
+
+        Args:
+            url: The full URL to be requested.
+            access_token: GitHub OAuth2 access token, if any.
+            headers: Dict of extra request headers or None.
+            params: Dict of query string parameters.
+
+        Returns:
+            requests.Response: The HTTP response.
+
+        """
+        start = time.perf_counter()
+        key, entry, headers = self._prepare_conditional_request(
+            url, params, headers)
+
+        if entry is not None and self.cache.is_fresh(key, entry):
+            response = self._cached_response(entry)
+            self._notify(url, start, response, 'fresh', 0)
+            return response
+
+        response, retries = self._transmit(
+            url, access_token, start, lambda: self.get_session().get(
+                url, headers=headers, params=params, timeout=self.timeout))
+        response = self._handle_conditional_response(key, entry, response)
+        self._notify(
+            url, start, response, self._cache_result(key, response), retries)
+
+        return response
+
+    def _post(self, url, access_token, body):
+        """Send a JSON POST request, such as a GraphQL query.
+
+        POST requests are throttled and retried like GET requests, but
+        never cached nor memoized. The access_token is sent in the
+        Authorization header.
+
+        Args:
+            url: The full URL to be requested.
+            access_token: GitHub OAuth2 access token, if any.
+            body: The data to be sent as JSON.
+
+        Returns:
+            requests.Response: The HTTP response.
+
+        """
+        start = time.perf_counter()
+        headers = {}
+
+        if access_token:
+            headers['Authorization'] = 'bearer {}'.format(access_token)
+
+        response, retries = self._transmit(
+            url, access_token, start, lambda: self.get_session().post(
+                url, json=body, headers=headers, timeout=self.timeout))
+        self._notify(url, start, response, None, retries)
+
+        return response
+
+    def _download(self, url, access_token, path, check_status, headers=None, chunk_size=65536):
+        """Stream a response body to a file, never holding it in memory.
+
+        The body is written to path + '.part', which replaces path once
+        complete, so an interrupted download never leaves a partial file.
+
+        Args:
+            url: The full URL to be requested.
+            access_token: GitHub OAuth2 access token, if any.
+            path: The file path to be written.
+            check_status: Callable that receives the response and raises
+                the proper exception for error status codes.
+            headers: Optional dict of extra request headers.
+            chunk_size: Number of bytes read and written at a time.
+
+        Returns:
+            int: The number of bytes written.
+
+        """
+        start = time.perf_counter()
+        params = self._build_params(url, access_token, None)
+        response, retries = self._transmit(
+            url, access_token, start, lambda: self.get_session().get(
+                url, headers=headers, params=params, timeout=self.timeout,
+                stream=True))
+        size = 0
+        temporary_path = path + '.part'
+
+        try:
+            check_status(response)
+
+            with open(temporary_path, 'wb') as output_file:
+                for chunk in response.iter_content(chunk_size):
+                    output_file.write(chunk)
+                    size += len(chunk)
+
+            os.replace(temporary_path, path)
+        except BaseException:
+            remove_file(temporary_path)
+            raise
+        finally:
+            response.close()
+            self._notify(url, start, response, None, retries, size=size)
+
+        return size
+
+    def _transmit(self, url, access_token, start, request):
+        """Send a request through the throttle and the retry policy.
+
+        Args:
+            url: The full URL to be requested.
+            access_token: GitHub OAuth2 access token, if any.
+            start: time.perf_counter() value when the request started.
+            request: Callable that sends the request once.
+
+        Returns:
+            tuple: The HTTP response and the number of retried attempts.
+
+        """
+        attempt = 0
+
+        while True:
+            attempt += 1
+            delay = self._before_request(url, access_token)
+
+            if delay > 0:
+                time.sleep(delay)
+
+            try:
+                response = request()
+            except (requests.ConnectionError, requests.Timeout) as error:
+                delay = self._retry_delay(attempt, error=error)
+
+                if delay is None:
+                    self._notify(url, start, None, None, attempt - 1, error)
+                    raise
+
+                time.sleep(delay)
+                continue
+
+            self._after_response(url, access_token, response)
+            delay = self._retry_delay(attempt, response=response)
+
+            if delay is None:
+                return response, attempt - 1
+
+            # Release the connection of a streamed response before retrying
+            response.close()
+            time.sleep(delay)
+
+    def _json(self, response):
+        """Decode the JSON body of a response with the configured decoder.
+
+        Args:
+            response: HTTP Response object.
+
+        Returns:
+            The decoded data.
+
+        """
+        return self.json_decoder(response.content)
+
+    def _page_items(self, response):
+        """Decode the items of a page of a paginated endpoint.
+
+        Args:
+            response: HTTP Response object, already checked by check_status.
+
+        Returns:
+            list: The items of the page.
+
+        Raises:
+            ApiError: The response is not a successful list, e.g. a 409 of
+                an empty repository or a 422 validation error.
+
+        """
+        data = None
+
+        if 200 <= response.status_code < 300:
+            data = self._json(response)
+
+        if not isinstance(data, list):
+            raise ApiError(response.status_code, response.content[:200])
+
+        return data
+
+    def add_hook(self, hook):
+        """Register a callable that receives a RequestEvent per request.
+
+        Args:
+            hook: Callable receiving a githon.metrics.RequestEvent.
+        """
+        self.hooks.append(hook)
+
+    def _notify(self, url, start, response, cache, retries, error=None, size=None):
+        """Send the RequestEvent of a finished request to every hook.
+
+        Args:
+            url: The requested URL.
+            start: time.perf_counter() value when the request started.
+            response: HTTP Response object or None if the request failed.
+            cache: The cache result. See RequestEvent.
+            retries: Number of retried attempts.
+            error: The exception raised by the transport, if any.
+            size: Body size of a streamed response, which has no content.
+        """
+        if not self.hooks:
+            return
+
+        status = None
+        remaining = None
+
+        if response is not None:
+            status = response.status_code
+            size = len(response.content) if size is None else size
+            remaining = response.headers.get('X-RateLimit-Remaining')
+
+        event = RequestEvent(
+            endpoint_template(url), status, time.perf_counter() - start,
+            size or 0,
+            cache, retries, None if remaining is None else int(remaining),
+            error)
+
+        for hook in self.hooks:
+            hook(event)
+
+    def _cache_result(self, key, response):
+        """Return the cache result of a sent request. See RequestEvent."""
+        if key is None:
+            return None
+
+        if getattr(response, 'from_cache', False):
+            return 'revalidated'
+
+        return 'miss'
+
+    def _retry_delay(self, attempt, response=None, error=None):
+        """Ask the retry policy how long to wait before a new attempt.
+
+        Args:
+            attempt: Number of the attempt that just finished, from 1.
+            response: HTTP Response object of the attempt, if any.
+            error: Connection or timeout exception of the attempt, if any.
+
+        Returns:
+            float: Seconds to wait or None if the request is done.
+
+        """
+        if self.retry is None:
+            return None
+
+        return self.retry.delay(attempt, response, error)
+
+    def _before_request(self, url, access_token):
+        """Reserve a request in the rate limit tracker.
+
+        Args:
+            url: The full URL to be requested.
+            access_token: GitHub OAuth2 access token used by the request.
+
+        Returns:
+            float: Seconds to wait before sending the request.
+
+        """
+        return self.rate_limit.reserve(access_token, resource_of(url))
+
+    def _after_response(self, url, access_token, response):
+        """Record the state carried by a response, before it is handled.
+
+        Args:
+            url: The requested URL.
+            access_token: GitHub OAuth2 access token used by the request.
+            response: HTTP Response object.
+        """
+        resource = resource_of(url)
+        self.rate_limit.update(access_token, response.headers, resource)
+
+        if self.token_pool is not None and access_token in self.token_pool:
+            self.token_pool.update(access_token, response, resource)
+
+    def _prepare_conditional_request(self, url, params, headers):
+        """Look up the cached response of a request.
+
+        Requests that already carry their own conditional headers (e.g.
+        last_modified_date) bypass the cache.
+
+        Args:
+            url: The full URL to be requested.
+            params: Dict of query string parameters.
+            headers: Dict of request headers or None.
+
+        Returns:
+            tuple: The cache key, the cached entry and the request headers
+                with the validators of the cached entry.
+
+        """
+        if self.cache is None or (headers and (
+                'If-None-Match' in headers or 'If-Modified-Since' in headers)):
+            return None, None, headers
+
+        key = make_cache_key(url, params)
+        entry = self.cache.get(key)
+
+        if entry is not None:
+            headers = dict(headers) if headers else {}
+            headers.update(entry.conditional_headers())
+
+        return key, entry, headers
+
+    def _handle_conditional_response(self, key, entry, response):
+        """Store a fresh response or replace a 304 by the cached one.
+
+        Args:
+            key: The cache key or None if the cache was bypassed.
+            entry: The cached entry sent for revalidation, if any.
+            response: HTTP Response object.
+
+        Returns:
+            The response to be handled by the caller.
+
+        """
+        if key is None:
+            return response
+
+        if response.status_code == requests.codes.not_modified and entry:
+            entry.stored_at = time.time()
+            self.cache.set(key, entry)
+            return self._cached_response(entry, response)
+
+        if response.status_code == requests.codes.ok:
+            entry = CachedResponse.from_response(response)
+
+            if entry is not None:
+                self.cache.set(key, entry)
+
+        return response
+
+    def _cached_response(self, entry, not_modified=None):
+        """Build a 200 OK response from a cached entry.
+
+        Args:
+            entry: The fresh or revalidated CachedResponse.
+            not_modified: The 304 Not Modified response, if revalidated.
+
+        Returns:
+            requests.Response: The cached response, with the fresh headers
+                (e.g. X-RateLimit-*) of the 304 response.
+
+        """
+        response = requests.models.Response()
+        response.status_code = requests.codes.ok
+        response.reason = 'OK'
+        response._content = entry.content
+        response.headers = CaseInsensitiveDict(entry.headers)
+        response.from_cache = True
+
+        if not_modified is not None:
+            response.headers.update(
+                (key, value) for key, value in not_modified.headers.items()
+                if key.lower() not in SKIPPED_HEADERS)
+            response.url = not_modified.url
+            response.request = not_modified.request
+
+        response.encoding = get_encoding_from_headers(response.headers)
+
+        return response
+
+    def _build_params(self, url, access_token, params):
+        """Return the query string parameters of a request.
+
+        Args:
+            url: The full URL to be requested.
+            access_token: GitHub OAuth2 access token, if any.
+            params: Optional dict of query string parameters.
+
+        Returns:
+            dict: The parameters plus the access_token, unless the URL
+                already carries it (e.g. pagination links).
+
+        """
+        params = dict(params) if params else {}
+
+        if access_token and 'access_token=' not in url:
+            params['access_token'] = access_token
+
+        return params
+
+    def _paginate(self, url, access_token, check_status, limit=None, per_page=100, fields=None, params=None):
+        """Lazily yield the items of a paginated endpoint.
+
+        The next pages are requested only when needed, following the
+        rel="next" URL of the Link header until there are no more pages or
+        the limit is reached.
+        See more in https://developer.github.com/v3/#pagination.
+
+        Args:
+            url: The full URL of the first page.
+            access_token: GitHub OAuth2 access token.
+            check_status: Callable that receives each response and raises
+                the proper exception for error status codes.
+            limit: Maximum number of items to be yielded. None means all.
+            per_page: Number of items requested per page (GitHub max is 100).
+            fields: Keys or a githon.records class to keep of each item.
+                None keeps everything.
+            params: Optional dict of filters added to the first page query
+                string.
+
+        Yields:
+            dict: Each item of each page.
+
+        Raises:
+            ApiError: A page is not a successful list.
+
+        """
+        params = dict(params or (), per_page=per_page)
+        count = 0
+
+        if fields is not None and not isinstance(fields, type):
+            fields = tuple(fields)
+
+        while url:
+            response = self._get(url, access_token, params=params)
+            check_status(response)
+
+            for item in self._page_items(response):
+                if limit is not None and count >= limit:
+                    return
+
+                yield project(item, fields)
+                count += 1
+
+            if limit is not None and count >= limit:
+                return
+
+            url = response.links.get('next', {}).get('url')
+            # The next page URL already carries the query string
+            params = None
+
     def get_request_limit(self, access_token):
         """Request Github remaining requests without spend the amount remaining.
 
@@ -21,11 +753,35 @@ class BaseRequest:
             int: The amount of remaining requests for a given access_token.
 
         """
-        url = "{0}/rate_limit?access_token={1}"
-        response = requests.get(url.format(self.ROOT_API_URL, access_token))
-        data = response.json()
+        url = "{0}/rate_limit"
+        response = self._get(url.format(self.ROOT_API_URL), access_token)
+        data = self._json(response)
         return data['resources']['core'].get("remaining")
 
+    def _check_common_status_code(self, response, access_token):
+        """Check status codes shared by all endpoints and raise Exceptions.
+
+        Args:
+            response: HTTP Response object.
+            access_token: GitHub OAuth2 access token.
+        """
+        # Redirected downloads (e.g. codeload.github.com) have no rate
+        # limit headers
+        remaining = response.headers.get('X-RateLimit-Remaining')
+
+        if response.status_code == requests.codes.forbidden and (
+                remaining is not None and int(remaining) == 0):
+            raise ApiRateLimitError(
+                {'X-RateLimit-Remaining': 0,
+                 'X-RateLimit-Limit': response.headers.get(
+                     'X-RateLimit-Limit'),
+                 'X-RateLimit-Reset': response.headers.get(
+                     'X-RateLimit-Reset')})
+        elif response.status_code == requests.codes.unauthorized:
+            raise InvalidTokenError({'access_token': access_token})
+        elif response.status_code >= 500 and response.status_code <= 509:
+            raise ApiError()
+
     def get_default_access_token(self):
         """Return the default access token passed by constructor."""
         return self.default_access_token
@@ -47,23 +803,26 @@ class BaseRequest:
     def _convert_to_rfc1123(self, datetime):
         """Convert an datetime string to RFC1123 format.
 
+        ISO 8601 strings, as returned by GitHub, are converted directly.
+        Other formats are parsed with dateutil. Datetimes with a timezone
+        are converted to GMT.
+
         Example
             Input: 2017-10-13T03:03:57Z
             Output: Fri, 13 Oct 2017 03:03:57 GMT
 
         Args:
-            datetime: The string datetime to be converted.
+            datetime: The string datetime to be converted, or a datetime.
         Returns:
             str: Datetime in RFC1123 format.
 
         """
         try:
-            new_date_format = parse(datetime).strftime(
-                '%a, %d %b %Y %H:%M:%S GMT')
-        except Exception as ex:
+            value = to_datetime(datetime)
+        except Exception:
             raise InvalidDateTimeFormat({'datetime': datetime})
 
-        return new_date_format
+        return format_rfc1123(value)
 
     def get_token(self, access_token):
         """Choose an access_token to be used for each request.
@@ -71,11 +830,14 @@ class BaseRequest:
         Args:
             access_token: The priority access_token to be used.
         Returns:
-            str: The access_token if exists or None.
+            str: The access_token, a token from the token pool, the default
+                access_token or an empty string.
 
         """
         if access_token:
             return access_token
+        elif self.token_pool is not None:
+            return self.token_pool.acquire()
         elif self.default_access_token:
             return self.default_access_token
         else:
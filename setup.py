@@ -26,14 +26,24 @@ kw = dict(
         'License :: OSI Approved :: Apache Software License',
         'Natural Language :: English',
         'Operating System :: OS Independent',
-        'Programming Language :: Python :: 3.4',
-        'Programming Language :: Python :: 3.5',
+        'Programming Language :: Python :: 3',
+        'Programming Language :: Python :: 3 :: Only',
+        'Programming Language :: Python :: 3.7',
+        'Programming Language :: Python :: 3.8',
+        'Programming Language :: Python :: 3.9',
+        'Programming Language :: Python :: 3.10',
+        'Programming Language :: Python :: 3.11',
         'Topic :: Internet',
         'Topic :: Software Development :: Libraries :: Python Modules',
     ],
     keywords='data github scraping api',
     install_requires=requirements,
-    python_requires='~=3.3',
+    extras_require={
+        'async': ['httpx'],
+        'fast': ['orjson'],
+        'http2': ['httpx[http2]'],
+    },
+    python_requires='>=3.7',
 )
 
 setup(**kw)